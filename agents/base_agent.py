@@ -1,9 +1,11 @@
-import json
 import os
 from abc import abstractmethod
 from datetime import datetime, timezone
 
 from core.api_client import api_client
+from core.budget import BudgetLevel, current_budget, heuristic_response, lean_model
+from core.call_context import call_tags
+from core.log_writer import log_writer
 
 
 class BaseAgent:
@@ -60,6 +62,10 @@ class BaseAgent:
     @abstractmethod
     def _system_prompt(self, gameBoard):
         raise NotImplementedError("Subclasses must implement _system_prompt!")
+
+    def _prompt_prefix(self, gameBoard):
+        """The PromptPrefix of _system_prompt worth caching provider-side, if any."""
+        return None
     
     def is_human(self):
         return False
@@ -120,34 +126,87 @@ class BaseAgent:
             "response": response_dict,
         }
 
-        with open(self._log_path, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        log_writer.write(self._log_path, entry)
 
     # ------------------------------------------------------------------
     # Core API call
     # ------------------------------------------------------------------
-    def get_response(self, user_content: str, response_model, gameBoard, system_content: str = None):
+    def get_response(self, user_content: str, response_model, gameBoard, system_content: str = None,
+                     stream_public: bool = False):
+        """stream_public: the reply's public_response will be broadcast, so the sink may show it as it's written."""
+        with call_tags(agent=self.name, turn=response_model.__name__):
+            return self._get_response(user_content, response_model, gameBoard, system_content, stream_public)
+
+    def _get_response(self, user_content: str, response_model, gameBoard, system_content: str = None,
+                      stream_public: bool = False):
+
+        budget = current_budget()
+        level = budget.level if budget is not None else BudgetLevel.NORMAL
+        if level >= BudgetLevel.HEURISTIC:
+            self.use_higher_model = False
+            budget.record_heuristic()
+            return heuristic_response(response_model)
 
+        # Only the agent's own system prompt has a cacheable head; custom prompts go out whole.
+        prefix = None
         if system_content is None:
             system_content = self._system_prompt(gameBoard)
+            prefix = self._prompt_prefix(gameBoard)
 
         messages = [
             {"role": "system", "content": system_content},
             {"role": "user",   "content": user_content},
         ]
 
-        if self.use_higher_model:
+        client = self.client or api_client
+        estimator = getattr(client, "token_estimator", None)
+        if estimator is not None:
+            estimated = estimator.estimate_messages(messages, self.model_name)
+            estimator.check_context(self.name, estimated)
+            if budget is not None:
+                # Judge the call by where it would leave the budget, not just where the budget stands.
+                level = budget.projected_level(estimated)
+                if level >= BudgetLevel.HEURISTIC:
+                    self.use_higher_model = False
+                    budget.record_heuristic()
+                    return heuristic_response(response_model)
+        if level >= BudgetLevel.LEAN:
+            response_model = lean_model(response_model)
+
+        if self.use_higher_model and level < BudgetLevel.NO_UPGRADES:
             api_model = self.higher_model_name
-            self.use_higher_model = False
         else:
             api_model = self.model_name
+        self.use_higher_model = False
 
-        client = self.client or api_client
-        response = client.create(
-            model=api_model,
-            response_model=response_model,
-            messages=messages,
-        )
+        extra = {"prefix": prefix} if prefix is not None else {}
+        sink = getattr(gameBoard, "game_sink", None)
+        if stream_public and sink is not None and sink.streams_public_deltas \
+                and "public_response" in response_model.model_fields:
+            # Let the frontend show the message as it's written rather than after the full response.
+            def on_public_delta(delta):
+                if delta is None:  # the attempt failed and will be retried; clear its draft
+                    sink.on_public_action_stream_end(self)
+                else:
+                    sink.on_public_action_delta(self, delta)
+
+            try:
+                response = client.create(
+                    model=api_model,
+                    response_model=response_model,
+                    messages=messages,
+                    on_public_delta=on_public_delta,
+                    **extra,
+                )
+            finally:
+                sink.on_public_action_stream_end(self)
+        else:
+            response = client.create(
+                model=api_model,
+                response_model=response_model,
+                messages=messages,
+                **extra,
+            )
 
         if self.debug_log:
             self._log_call_index += 1
@@ -1,5 +1,5 @@
 import random
-from concurrent.futures import ThreadPoolExecutor
+from core.call_context import TaggedThreadPoolExecutor
 from functools import partial
 from typing import List, Optional
 from pydantic import BaseModel, Field
@@ -41,7 +41,7 @@ class CharacterGenerator:
     
     def generate_agents_from_names(self, names, allow_rename = True):
         fn = partial(self.generate_debater, allow_rename=allow_rename)
-        with ThreadPoolExecutor(max_workers=min(32, len(names))) as executor:
+        with api_client.batch(), TaggedThreadPoolExecutor(max_workers=min(32, len(names))) as executor:
             return list(executor.map(fn, names))
         
     def generate_balanced_cast(self, count) -> 'Debater':
@@ -98,6 +98,7 @@ class CharacterGenerator:
         if api_client._mock_output:
             allow_rename = False
         profile = api_client.create(
+            model=self.model_name,  # cast generation runs before the game's session exists
             response_model=CharacterProfile,
             messages=[
                 {"role": "system", "content": "You are generating a starting profile for an AI debate simulation player."},
@@ -1,24 +1,41 @@
+import threading
 from collections import deque
 from typing import Literal
 
-from pydantic import BaseModel, Field, create_model
+from pydantic import BaseModel, Field
+from models.schema_registry import cached_model
 from agents.base_agent import BaseAgent
 from core.api_client import api_client
+from core.call_context import TaggedThreadPoolExecutor
 from models.game_models import DynamicGameModelFactory, SummariseRoundComplex
 from models.player_models import BaseResponse
 from prompts.prompts import PromptLibrary
 
+# The round-summary worker's thread name prefix.
+_SUMMARY_THREAD = "round-summary"
+
+
+def _refuse_on_summary_thread(what):
+    # The worker is single-threaded: waiting on it from itself never returns.
+    if threading.current_thread().name.startswith(_SUMMARY_THREAD):
+        raise RuntimeError(f"{what} called on the {_SUMMARY_THREAD} worker would wait on itself")
+
+
 class GameMaster(BaseAgent):
     def __init__(self, model_name: str, higher_model_name: str = None, name ="Summariser"):
         super().__init__(name, model_name, higher_model_name=higher_model_name)
         self.color = "YELLOW"
         self.round_summaries = deque(maxlen=50)
         self.name = "Host"
+        # Round summaries run one at a time in the background, in order — each builds on round_summaries so far.
+        self._summary_executor: TaggedThreadPoolExecutor | None = None
+        self._summary_lock = threading.Lock()
     
     
     def _system_prompt(self, gameBoard):
         #TODO spruce up with the other one
         #Used in the wildcard selection
+        self.await_round_summaries()
         return ( f"You oversee this game. You help to make the information manageable for the LLMs playing."
                 f"PAST SUMARRIES: {"\n".join(self.round_summaries)} "
                  f"#########################"
@@ -35,12 +52,51 @@ class GameMaster(BaseAgent):
         choice_definition = (Literal[*allowed_names], Field(description=parameter))
         public_reason = (str, Field(description="The public announcement as to why this player was chosen. Give answer in the third person passive voice."))
         fields = {"target_name" : choice_definition, "public_reason" : public_reason}
-        response_model = create_model("choose_agent_based_on_parameter", __base__=BaseResponse, **fields)
+        response_model = cached_model("choose_agent_based_on_parameter", __base__=BaseResponse, **fields)
         user_content = (f"You need to choose a single player that best represents this parameter: '{parameter}'.")
         return self.get_response(user_content, response_model, gameBoard, system_content = None)
         #---------------
     
-    def summariseRound(self, gameBoard):
+    def summariseRound(self, gameBoard, wait: bool = True):
+        """
+        Summarise the current round. With wait=False the transcript is taken
+        now and the summary written in the background: returns a Future of
+        the SummariseRoundComplex, appended to round_summaries when it lands.
+        """
+        transcript = gameBoard.context_builder.current_round_formatted(self)
+        scores = dict(gameBoard.agent_scores)
+        with self._summary_lock:
+            if self._summary_executor is None:
+                self._summary_executor = TaggedThreadPoolExecutor(max_workers=1, thread_name_prefix=_SUMMARY_THREAD)
+            future = self._summary_executor.submit(self._summarise_round, transcript, scores)
+        if wait:
+            _refuse_on_summary_thread("summariseRound(wait=True)")
+            return future.result()
+        return future
+
+    def await_round_summaries(self):
+        """
+        Block until every round summary submitted so far is in round_summaries
+        (or has failed), done-callbacks included: the single worker runs a
+        task's callbacks before it picks up the next, so a no-op is a barrier.
+        Not from a summary's own done-callbacks: they run on that single
+        worker, which would then wait on itself.
+        """
+        _refuse_on_summary_thread("await_round_summaries")
+        with self._summary_lock:
+            executor = self._summary_executor
+        if executor is not None:
+            executor.submit(lambda: None).result()
+
+    def close(self):
+        """Finish outstanding round summaries and stop the background worker."""
+        self.await_round_summaries()
+        with self._summary_lock:
+            executor, self._summary_executor = self._summary_executor, None
+        if executor is not None:
+            executor.shutdown()
+
+    def _summarise_round(self, transcript, scores):
         turn = api_client.create(
             response_model=SummariseRoundComplex,
             messages=[
@@ -48,13 +104,13 @@ class GameMaster(BaseAgent):
                 {"role": "user", "content": f"PAST SUMARRIES: {"\n".join(self.round_summaries)} "
                  f"#########################"
                  f"#########################"
-                 f"Summarise the following round: {gameBoard.context_builder.current_round_formatted(self)} Scores:  {gameBoard.agent_scores}"}
+                 f"Summarise the following round: {transcript} Scores:  {scores}"}
             ]
         )
         self.round_summaries.append(turn.round_summary)
         return turn
     
-    def summarise_game_text(self, context, game_text):
+    def summarise_game_text(self, context, game_text, verbose=True):
         model = DynamicGameModelFactory.cycle_game_compression_model()
         turn = api_client.create(
             response_model=model,
@@ -66,9 +122,10 @@ class GameMaster(BaseAgent):
                  f"Summarise the following segment: {game_text}"} 
             ]
         )
-        print("\n\nContext: \n" + context )
-        print("\n\nGame text: \n" + game_text)
-        print("\n\nSummary: \n" + turn.summary )
+        if verbose:
+            print("\n\nContext: \n" + context )
+            print("\n\nGame text: \n" + game_text)
+            print("\n\nSummary: \n" + turn.summary )
         
         return turn.summary
     
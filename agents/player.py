@@ -1,6 +1,8 @@
 from collections import deque
 from pydantic import Field
-from core.game_context.system_prompt import SystemPrompt
+from core.call_context import current_tags
+from core.game_context.system_prompt import CLASSIC, STABLE_FIRST, SystemPrompt
+from core.prompt_cache import PromptPrefix
 from core.game_context.user_content import UserContent
 from models.player_models import DynamicModelFactory
 from prompts.gamePrompts import GamePromptLibrary
@@ -35,6 +37,10 @@ class Debater(BaseAgent):
         self.game_over = False
         self.initialising = False
         self.optional_response_buffer = 0
+        # Bumped when the turn fields change the agent; profile_version only for persona, style and lessons.
+        # Rendered prompts are memoised against them (core/game_context/render_memo.py).
+        self.state_version = 0
+        self.profile_version = 0
         #todo : implement temperature
     
     # --- 1. CONFIGURATION (The Map) ---
@@ -71,7 +77,20 @@ class Debater(BaseAgent):
         return {**self.logic_fields(), **self.internal_thinking_fields()}
     
     def _system_prompt(self, gameBoard):
-        return SystemPrompt.render(self)
+        layout = gameBoard.prompt_layout if gameBoard is not None else CLASSIC
+        return SystemPrompt.render(self, layout)
+
+    def _prompt_prefix(self, gameBoard):
+        # Caching lifts the phase summaries ahead of the rest of the prompt — the classic layout keeps its own order.
+        if gameBoard is None or gameBoard.prompt_layout != STABLE_FIRST:
+            return None
+        # One handle per agent per game; a new phase changes the fingerprint and replaces it.
+        game = current_tags().get("game", "")
+        return PromptPrefix(
+            key=f"{game}/{self.name}",
+            system=SystemPrompt.stable_prefix(self),
+            context=UserContent.phase_summaries_block(self),
+        )
         
         
     
@@ -87,8 +106,11 @@ class Debater(BaseAgent):
         "These become your permanent memory. ")
 
       
+    PROFILE_ATTRS = frozenset({"persona", "speaking_style", "life_lessons"})
+
     def process_turn_cognitive_fields(self, turn):
 
+        changed = set()
         simple_personality_fields = self.cognitive_fields()
         for field_name in simple_personality_fields:
             value = getattr(turn, field_name, None)
@@ -107,20 +129,30 @@ class Debater(BaseAgent):
                 is_duplicate = any(clean_val.lower() == existing.lower() for existing in current_attr_value)
                 if not is_duplicate:
                     current_attr_value.append(clean_val)
-            else:
+                    changed.add(target_attr_name)
+            elif value != current_attr_value:
                 setattr(self, target_attr_name, value)
+                changed.add(target_attr_name)
+        self._bump_versions(changed)
+
+    def _bump_versions(self, changed_attrs):
+        if changed_attrs:
+            self.state_version += 1
+            if changed_attrs & self.PROFILE_ATTRS:
+                self.profile_version += 1
 
     def _get_full_user_content(self, gameBoard, user_content, instruction_override=None) :
         return UserContent.render(self, gameBoard, user_content, instruction_override)
 
-    def take_turn_standard(self, user_content, gameBoard, model, system_content = None, instruction_override=None):
+    def take_turn_standard(self, user_content, gameBoard, model, system_content = None, instruction_override=None,
+                           stream_public = False):
                            #, context_model = StandardContext):
         #TODO instruction_override is redudundant now
         #user_content = context_model._get_full_user_content(gameBoard, user_content, instruction_override)
         #TODO - system conent should also be generated here?
         
         user_content = self._get_full_user_content(gameBoard, user_content, instruction_override) 
-        turn = self.get_response(user_content, model, gameBoard, system_content) #TODO temperature
+        turn = self.get_response(user_content, model, gameBoard, system_content, stream_public) #TODO temperature
         self.process_turn_cognitive_fields(turn)
         return turn
     
@@ -133,26 +165,32 @@ class Debater(BaseAgent):
         return string 
     
     def phase_summaries_string(self):
+        return "".join(self.phase_summary_blocks())
+
+    def phase_summary_blocks(self, detailed_count=None):
+        # One block per phase, oldest first: brief for older phases, detailed for the last detailed_count.
+        if detailed_count is None:
+            detailed_count = self.detailed_summary_count
         all_keys = set(self.phase_summaries_detailed.keys()).union(
             set(self.phase_summaries_brief.keys())
         )
         if not all_keys:
-            return ""
+            return []
             
         sorted_keys = sorted(list(all_keys))
         total_summaries = len(sorted_keys)
-        detailed_start_index = max(0, total_summaries - self.detailed_summary_count)
+        detailed_start_index = max(0, total_summaries - detailed_count)
         
-        string = ""
+        blocks = []
         
         for i, key in enumerate(sorted_keys):
             if i < detailed_start_index:
                 summary = self.phase_summaries_brief.get(key) or self.phase_summaries_detailed.get(key, "Summary missing.")
-                string += f"Phase {key}:\n{summary}\n\n"
+                blocks.append(f"Phase {key}:\n{summary}\n\n")
             else:
                 summary = self.phase_summaries_detailed.get(key) or self.phase_summaries_brief.get(key, "Summary missing.")
-                string += f"Phase {key}:\n{summary}\n\n"
-        return string 
+                blocks.append(f"Phase {key}:\n{summary}\n\n")
+        return blocks
     
     def _summarise_phase_context_string(self, game_board):
         phase_rounds_formatted = game_board.context_builder.phase_rounds_string(self)
@@ -235,3 +273,4 @@ class Debater(BaseAgent):
         if hasattr(response, "compressed_life_lessons") and response.compressed_life_lessons:
             self.life_lessons.clear()
             self.life_lessons.extend(response.compressed_life_lessons)
+            self._bump_versions({"life_lessons"})
@@ -1,17 +1,39 @@
 from __future__ import annotations
 
-import inspect
+import asyncio
+import concurrent.futures
+import contextlib
+import contextvars
 import json
 import os
 import random
+import sys
 import threading
 import time
-from dataclasses import asdict, dataclass
+from collections import deque
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
+from types import SimpleNamespace
 from typing import Literal, get_args, get_origin
-from pydantic import BaseModel
+from pydantic import BaseModel, ValidationError
 import google.genai.types as types
 
+from core.audio_chunks import WAV_MIME_TYPES, split_on_silence
+from core.batch_service import BatchRequest
+from core.budget import LeanSchema, current_budget
+from core.call_context import current_tags
+from core.call_stats import CallLedger, ConcurrencyTracker
+from core.game_context.render_memo import render_memo_stats
+from core.log_writer import log_writer
+from core.prompt_cache import PromptCacheManager, PromptPrefix
+from core.response_cache import CacheMiss, ResponseCache
+from core.response_repair import followup_messages, followup_model, repair_response
+from core.stream_parser import FieldStreamParser
+from core.thinking_policy import ThinkingProfile
+from core.thinking_policy import resolve as resolve_thinking
+from core.token_estimator import TokenEstimator, prompt_chars
+from models.schema_registry import schema_registry
+
 
 @dataclass(frozen=True)
 class CallRecord:
@@ -24,142 +46,806 @@ class CallRecord:
     completion_tokens: int | None
     total_tokens: int | None
     duration_ms: int
+    tags: dict = field(default_factory=dict)
+    retries: int = 0
+    request_ms: int | None = None  # the successful request alone, without queueing or retries
+    repair: str = ""               # "normalised" / "refetched" when the raw response failed validation
+    cached_tokens: int | None = None  # prompt tokens served from a cached prefix
+    category: str = ""             # thinking-policy category (choice, vote, speech, summary, default)
+    prompt_chars: int | None = None             # system + user characters sent
+    estimated_prompt_tokens: int | None = None  # the TokenEstimator's guess before sending
+
+
+@dataclass
+class _CallResult:
+    text: str
+    usage: tuple[int | None, int | None, int | None]
+    retries: int
+    request_ms: int
+    cached_tokens: int | None = None
+    result: BaseModel | None = None
+    repair: str = ""
+
+@dataclass
+class _Bucket:
+    rpm: int
+    tpm: int
+    requests: float
+    tokens: float
+    updated: float
+    blocked_until: float = 0.0
+    waiters: deque = field(default_factory=deque)
+    # stats
+    waited_calls: int = 0
+    total_wait_s: float = 0.0
+    max_wait_s: float = 0.0
+    max_queue_depth: int = 0
+
+    def refill(self, now: float) -> None:
+        elapsed = now - self.updated
+        self.updated = now
+        self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60)
+        self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+
+    def delay_for(self, tokens: int, now: float) -> float:
+        self.refill(now)
+        delay = max(0.0, self.blocked_until - now)
+        if self.requests < 1:
+            delay = max(delay, (1 - self.requests) * 60 / self.rpm)
+        # A single call bigger than the whole bucket only waits for a full bucket.
+        needed = min(tokens, self.tpm)
+        if self.tokens < needed:
+            delay = max(delay, (needed - self.tokens) * 60 / self.tpm)
+        return delay
+
+
+class RateLimiter:
+    """
+    Proactive requests-per-minute / tokens-per-minute limiter, one token bucket
+    per model name, shared by every game in the process.
+
+    Callers queue FIFO per model: only the head of the queue waits on the bucket,
+    so a burst of votes drains in order instead of all hitting a 429 together.
+    Token cost is estimated up front and reconciled once usage comes back.
+    Lives entirely on the APIClient loop, so it needs no locking.
+    """
+
+    DEFAULT_RPM = 1000
+    DEFAULT_TPM = 1_000_000
+
+    def __init__(self) -> None:
+        self._limits: dict[str, tuple[int, int]] = {}
+        self._buckets: dict[str, _Bucket] = {}
+
+    def configure(self, model: str, rpm: int | None = None, tpm: int | None = None) -> None:
+        self._limits[model] = (rpm or self.DEFAULT_RPM, tpm or self.DEFAULT_TPM)
+        self._buckets.pop(model, None)
+
+    def _bucket(self, model: str) -> _Bucket:
+        bucket = self._buckets.get(model)
+        if bucket is None:
+            rpm, tpm = self._limits.get(model, (self.DEFAULT_RPM, self.DEFAULT_TPM))
+            bucket = _Bucket(rpm=rpm, tpm=tpm, requests=rpm, tokens=tpm, updated=time.monotonic())
+            self._buckets[model] = bucket
+        return bucket
+
+    async def acquire(self, model: str, tokens: int) -> float:
+        bucket = self._bucket(model)
+        waiter = asyncio.get_running_loop().create_future()
+        bucket.waiters.append(waiter)
+        bucket.max_queue_depth = max(bucket.max_queue_depth, len(bucket.waiters))
+        if bucket.waiters[0] is waiter:
+            waiter.set_result(None)
+        start = time.monotonic()
+        try:
+            await waiter  # wait our turn
+            while (delay := bucket.delay_for(tokens, time.monotonic())) > 0:
+                await asyncio.sleep(delay)
+            bucket.requests -= 1
+            bucket.tokens -= tokens
+        finally:
+            if bucket.waiters and bucket.waiters[0] is waiter:
+                bucket.waiters.popleft()
+                if bucket.waiters and not bucket.waiters[0].done():
+                    bucket.waiters[0].set_result(None)
+            else:
+                bucket.waiters.remove(waiter)
+        waited = time.monotonic() - start
+        if waited > 0.001:
+            bucket.waited_calls += 1
+            bucket.total_wait_s += waited
+            bucket.max_wait_s = max(bucket.max_wait_s, waited)
+        return waited
+
+    def reconcile(self, model: str, estimated: int, actual: int | None) -> None:
+        if actual is None:
+            return
+        # May go negative — the debt simply delays the next caller.
+        self._bucket(model).tokens -= actual - estimated
+
+    def penalise(self, model: str, seconds: float) -> None:
+        """The provider said 429 anyway — hold the whole queue for this model."""
+        bucket = self._bucket(model)
+        bucket.blocked_until = max(bucket.blocked_until, time.monotonic() + seconds)
+
+    def stats(self) -> dict:
+        return {
+            model: {
+                "rpm": b.rpm,
+                "tpm": b.tpm,
+                "queue_depth": len(b.waiters),
+                "max_queue_depth": b.max_queue_depth,
+                "waited_calls": b.waited_calls,
+                "total_wait_ms": int(b.total_wait_s * 1000),
+                "max_wait_ms": int(b.max_wait_s * 1000),
+            }
+            for model, b in list(self._buckets.items())
+        }
+
+
+class BatchSubmitter:
+    """
+    Collects non-interactive requests — end-of-phase summaries, character
+    generation, the reunion wake-up — into one batch job per model instead of
+    a request each. A job goes out linger_s after its first request arrives
+    (or as soon as it holds max_batch), and each request resolves as soon as
+    the service reports its result. Whatever has no result by deadline_s is
+    sent as an ordinary call, so a slow batch queue costs at most the
+    deadline, never the game. Callers wait on the deadline (a phase boundary
+    blocks on its summaries), so it's kept short — APIClient.batch_deadline_s —
+    and services that can't answer within it aren't used at all.
+
+    submit() hands back a future; inside `with api_client.batch():`, plain
+    create() calls — from any TaggedThreadPoolExecutor thread — join in too.
+    Lives on the APIClient loop apart from submit().
+    """
+
+    def __init__(self, client: "APIClient", service, linger_s: float = 0.2, poll_s: float = 2.0,
+                 deadline_s: float = 10.0, max_batch: int = 500):
+        self.client = client
+        self.service = service
+        self.linger_s = linger_s
+        self.poll_s = poll_s
+        self.deadline_s = deadline_s
+        self.max_batch = max_batch
+        self._pending: dict[str, list[tuple[BatchRequest, asyncio.Future]]] = {}
+        self._timers: dict[str, asyncio.TimerHandle] = {}
+        self._jobs: set[asyncio.Task] = set()
+
+    def submit(self, response_model, messages: list, model: str | None = None) -> concurrent.futures.Future:
+        """Queue one request; the future resolves to the validated response model."""
+        return asyncio.run_coroutine_threadsafe(
+            self.client.acreate(response_model, messages, model, caller=_caller(), tags=current_tags(), batch=self),
+            self.client._ensure_loop(),
+        )
+
+    async def request(self, api_model: str, system_content, user_content, response_model,
+                      thinking: ThinkingProfile | None = None):
+        """Wait for this request's response from a batch job. None means it should be sent directly."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.setdefault(api_model, [])
+        pending.append((BatchRequest(system_content, user_content, response_model, thinking), future))
+        if len(pending) >= self.max_batch:
+            self._flush(api_model)
+        elif api_model not in self._timers:
+            self._timers[api_model] = loop.call_later(self.linger_s, self._flush, api_model)
+        return await future
+
+    def _flush(self, api_model: str) -> None:
+        timer = self._timers.pop(api_model, None)
+        if timer is not None:
+            timer.cancel()
+        items = self._pending.pop(api_model, [])
+        if items:
+            task = asyncio.get_running_loop().create_task(self._run_job(api_model, items))
+            self._jobs.add(task)
+            task.add_done_callback(self._jobs.discard)
+
+    async def _run_job(self, api_model: str, items: list) -> None:
+        futures = [future for _, future in items]
+        deadline = time.monotonic() + self.deadline_s
+        try:
+            job = await self.service.create(api_model, [request for request, _ in items])
+        except Exception as e:
+            print(f"[batch] could not create a job for {len(items)} {api_model} requests ({e!r}) — sending them directly")
+            self._fall_back(futures)
+            return
+        self.client._count_batch("jobs")
+
+        wait = min(0.05, self.poll_s)
+        try:
+            while time.monotonic() < deadline:
+                poll = await self.service.poll(job)
+                for index, response in poll.results.items():
+                    if not futures[index].done():
+                        self.client._count_batch("batched" if response is not None else "fallbacks")
+                        futures[index].set_result(response)
+                if poll.done or all(f.done() for f in futures):
+                    break
+                await asyncio.sleep(min(wait, max(0.0, deadline - time.monotonic())))
+                wait = min(wait * 2, self.poll_s)
+        except Exception as e:
+            print(f"[batch] polling {job} failed ({e!r})")
+
+        missing = [f for f in futures if not f.done()]
+        if missing:
+            print(f"[batch] {job} left {len(missing)} of {len(futures)} requests unanswered — sending them directly")
+            with contextlib.suppress(Exception):
+                await self.service.cancel(job)
+            self._fall_back(missing)
+
+    def _fall_back(self, futures: list) -> None:
+        for future in futures:
+            if not future.done():
+                self.client._count_batch("fallbacks")
+                future.set_result(None)
+
+
+_current_batch: contextvars.ContextVar[BatchSubmitter | None] = contextvars.ContextVar("batch_submitter", default=None)
+
+
+class APISession:
+    """
+    One game's handle on the shared APIClient: its own call records, stats
+    and api_calls log, over the process-wide connection, event loop and rate
+    limiter. Calls made inside session_scope(session) — on the game thread or
+    any tagged executor thread — are booked to it as well as to the process.
+    Nothing outlives the game but what the caller keeps a reference to.
+    default_model, if set, stands in for the client's default on this game's calls.
+    """
+
+    RECENT_RECORDS = 200
+
+    def __init__(self, client: "APIClient", name: str, log_path: str | None = None, default_model: str | None = None):
+        self.client = client
+        self.name = name
+        self.log_path = log_path
+        self.default_model = default_model
+        self.ledger = CallLedger(self.RECENT_RECORDS)
+
+    @property
+    def records(self):
+        return self.ledger.records
+
+    def summary(self) -> dict:
+        return self.client.summary(self)
+
+    def print_summary(self) -> None:
+        self.client.print_summary(self)
+
+
+_current_session: contextvars.ContextVar[APISession | None] = contextvars.ContextVar("api_session", default=None)
+
+
+@contextlib.contextmanager
+def session_scope(session: APISession | None):
+    token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(token)
+
 
 class APIClient:
+    # Calls allowed in flight per model, across every game in the process.
+    MAX_CONCURRENT_CALLS_PER_MODEL = 64
+    # Transcriptions are big uploads; cap them separately so a burst can't crowd out game turns.
+    MAX_CONCURRENT_TRANSCRIPTIONS = 4
+    # Recent CallRecords kept in memory process-wide; totals and percentiles live in the ledger's stats.
+    RECENT_RECORDS = 1000
+
     def __init__(self) -> None:
         self._client = None
-        self._records: list[CallRecord] = []
+        self._default_model: str | None = None
+        self._ledger = CallLedger(self.RECENT_RECORDS)
+        self._records: deque[CallRecord] = self._ledger.records
+        self._concurrency: dict[str, ConcurrencyTracker] = {}
         self._lock = threading.Lock()
-        self._index = 0
         self._log_path: str | None = None
         self._mock_output = False
+        # All LLM traffic runs on one background event loop; sync callers hop onto it.
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_lock = threading.Lock()
+        self._model_semaphores: dict[str, asyncio.Semaphore] = {}
+        self._transcriptions: asyncio.Semaphore | None = None
+        self.rate_limiter = RateLimiter()
+        self._completion_estimate: dict[str, int] = {}
+        self.token_estimator = TokenEstimator()
+        self._cache: ResponseCache | None = None
+        self.prompt_cache: PromptCacheManager | None = None
+        self.batch_service = None
+        self.batch_deadline_s = 10.0
+        self._batch_counts = {"jobs": 0, "batched": 0, "fallbacks": 0}
 
-    def init(self, client, model: str) -> None:
+    def init(self, client, model: str, cache: ResponseCache | None = None,
+             prompt_cache: PromptCacheManager | None = None, batch_service=None,
+             token_estimator: TokenEstimator | None = None, batch_deadline_s: float | None = None) -> None:
+        """
+        Configure the shared client. Every create_engine calls this, so it must
+        not disturb games already running: the process log is opened once, and
+        per-game logs and stats belong to each game's session().
+        """
         self._client = client
         self._default_model = model
-        self._log_path = _make_log_path()
+        if self._log_path is None:
+            self._log_path = _make_log_path()
+        if cache is not None:
+            self._cache = cache
+        if prompt_cache is not None:
+            self.prompt_cache = prompt_cache
+        if batch_service is not None:
+            self.batch_service = batch_service
+        if batch_deadline_s is not None:
+            self.batch_deadline_s = batch_deadline_s
+        if token_estimator is not None:
+            self.token_estimator = token_estimator
+
+    @property
+    def client(self):
+        return self._client
+
+    def session(self, name: str, log_path: str | None = None, default_model: str | None = None) -> APISession:
+        """A per-game handle with its own records, stats and log (api_calls_<ts>_<name>.jsonl by default)."""
+        return APISession(self, name, log_path or _make_log_path(name), default_model)
+
+    def _session(self) -> APISession | None:
+        session = _current_session.get()
+        return session if session is not None and session.client is self else None
+
+    def _model_or_default(self, model: str | None) -> str | None:
+        if model:
+            return model
+        session = self._session()
+        return session.default_model if session is not None and session.default_model else self._default_model
+
+    @contextlib.contextmanager
+    def batch(self, **kwargs):
+        """
+        Send the create() calls made inside this block as batch jobs (see
+        BatchSubmitter). deadline_s defaults to batch_deadline_s.
+
+        Does nothing — the calls go out directly, and no job is created — when
+        no batch service is configured, or when the service's typical
+        turnaround is longer than the deadline: nothing would come back in
+        time, so a job would only add the deadline's wait to every call.
+        """
+        kwargs.setdefault("deadline_s", self.batch_deadline_s)
+        if self.batch_service is None or self._mock_output \
+                or getattr(self.batch_service, "turnaround_s", 0.0) > kwargs["deadline_s"]:
+            yield None
+            return
+        token = _current_batch.set(BatchSubmitter(self, self.batch_service, **kwargs))
+        try:
+            yield _current_batch.get()
+        finally:
+            _current_batch.reset(token)
+
+    def _count_batch(self, key: str) -> None:
+        with self._lock:
+            self._batch_counts[key] += 1
+
+    def release_prompt_caches(self, key_prefix: str = "") -> None:
+        """Delete cached prompt prefixes whose key starts with key_prefix (a finished game's id)."""
+        if self.prompt_cache is not None and self._client is not None:
+            self._run_sync(self.prompt_cache.clear(self._client, key_prefix))
+
+    def set_cache(self, cache: ResponseCache | None) -> None:
+        self._cache = cache
+
+    def _check_ready(self) -> None:
+        replay_only = self._cache is not None and self._cache.mode == ResponseCache.REPLAY
+        if self._client is None and not replay_only:
+            raise RuntimeError("APIClient not initialized — call init() first")
         
     def _mock_response(self, response_model):
-        long_text = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.\n Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat. Duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur. Excepteur sint occaecat cupidatat non proident, \n \n sunt in culpa qui officia deserunt mollit anim id est laborum."
-        values = {}
-        for name, field_info in response_model.model_fields.items():
-            annotation = field_info.annotation
-            if get_origin(annotation) is Literal:
-                values[name] = random.choice(get_args(annotation))
-            elif get_origin(annotation) is list:
-                inner = get_args(annotation)[0] if get_args(annotation) else str
-                if get_origin(inner) is Literal:
-                    values[name] = [random.choice(get_args(inner))]
-                else:
-                    values[name] = [f"test [{name}]"]
-            elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
-                values[name] = self._mock_response(annotation)
-            else:
-                values[name] = f"{long_text}  [{name}]"
-        return response_model(**values)
+        return mock_response(response_model)
+
+    # ------------------------------------------------------------------
+    # Event loop plumbing
+    # ------------------------------------------------------------------
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._loop_lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(target=loop.run_forever, name="api-client-loop", daemon=True)
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _in_loop(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _run_sync(self, coro):
+        if self._in_loop():
+            coro.close()
+            raise RuntimeError("APIClient.create() called from the client loop — await acreate() instead")
+        return asyncio.run_coroutine_threadsafe(coro, self._ensure_loop()).result()
+
+    def _semaphore(self, api_model: str) -> asyncio.Semaphore:
+        # Only touched from the client loop, so no lock needed.
+        sem = self._model_semaphores.get(api_model)
+        if sem is None:
+            sem = asyncio.Semaphore(self.MAX_CONCURRENT_CALLS_PER_MODEL)
+            self._model_semaphores[api_model] = sem
+        return sem
 
-    def _make_call(self, messages, api_model, response_model):
-        system_content = next((m["content"] for m in messages if m["role"] == "system"), None)
-        user_content = next((m["content"] for m in messages if m["role"] == "user"), None)
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+    def _estimate_tokens(self, api_model: str, system_content, user_content) -> int:
+        chars = len(system_content or "") + len(user_content or "")
+        return self.token_estimator.estimate(chars, api_model) + self._completion_estimate.get(api_model, 500)
+
+    def _update_completion_estimate(self, api_model: str, completion: int | None) -> None:
+        if completion is None:
+            return
+        previous = self._completion_estimate.get(api_model, completion)
+        self._completion_estimate[api_model] = int(previous * 0.8 + completion * 0.2)
+
+    async def _stream_call(self, api_model, contents, config, on_public_delta):
+        """
+        Stream the response, pushing public_response text out as it's generated.
+        If the attempt fails after text went out, on_public_delta(None) tells the
+        listener to drop that draft — a retry streams the message again from the start.
+        """
+        parser = FieldStreamParser("public_response")
+        parts = []
+        usage = None
+        sent = False
+        try:
+            stream = await self._client.aio.models.generate_content_stream(model=api_model, contents=contents,
+                                                                           config=config)
+            async for chunk in stream:
+                text = chunk.text or ""
+                parts.append(text)
+                usage = getattr(chunk, "usage_metadata", None) or usage
+                delta = parser.feed(text)
+                if delta:
+                    _notify(on_public_delta, delta)
+                    sent = True
+        except Exception:
+            if sent:
+                _notify(on_public_delta, None)
+            raise
+        return SimpleNamespace(text="".join(parts), usage_metadata=usage)
+
+    async def _request(self, messages, api_model, response_model, on_public_delta=None, prefix: PromptPrefix | None = None,
+                       batch: BatchSubmitter | None = None, thinking: ThinkingProfile | None = None):
+        """One logical request, with 429 retries. Returns (response, retries, request_ms)."""
+        system_content, user_content = _split_messages(messages)
+        thinking = thinking or ThinkingProfile()
+        if batch is not None:
+            # Batch jobs have their own quota, so they skip the limiter; nobody is watching, so nothing streams.
+            start = time.monotonic()
+            response = await batch.request(api_model, system_content, user_content, response_model, thinking)
+            if response is not None:
+                self._update_completion_estimate(api_model, _extract_usage(response)[1])
+                return response, 0, int((time.monotonic() - start) * 1000)
+        estimated = self._estimate_tokens(api_model, system_content, user_content)
+
+        cached_content = None
+        remainder = prefix.remainder(system_content, user_content) if prefix is not None and self.prompt_cache else None
+        if remainder is not None:
+            cached_content = await self.prompt_cache.handle(self._client, api_model, prefix)
+
+        def build_config():
+            return types.GenerateContentConfig(
+                # The cached content carries the system prompt's head; the API rejects both together.
+                system_instruction=None if cached_content else system_content,
+                cached_content=cached_content,
+                response_mime_type="application/json",
+                response_schema=response_model,
+                thinking_config=thinking.thinking_config(),
+                temperature=thinking.temperature,
+                #top_p=0.99,
+                #top_k=64
+            )
+
+        config = build_config()
+        contents = remainder if cached_content else user_content
         max_429_retries = 5
         backoff = 2
         for attempt in range(max_429_retries):
-            try: 
-                response = self._client.models.generate_content(
-                    model=api_model,
-                    contents=user_content,  # just the user message string
-                    config=types.GenerateContentConfig(
-                        system_instruction=system_content,
-                        response_mime_type="application/json",
-                        response_schema=response_model,
-                        thinking_config=types.ThinkingConfig(#thinking_budget=512, 
-                                                            include_thoughts=False,),
-                        temperature=1,
-                        #top_p=0.99,
-                        #top_k=64
-                    ),
-                )
+            await self.rate_limiter.acquire(api_model, estimated)
+            try:
+                async with self._semaphore(api_model), self._in_flight(api_model):
+                    request_start = time.monotonic()
+                    if on_public_delta is None:
+                        response = await self._client.aio.models.generate_content(
+                            model=api_model,
+                            contents=contents,  # just the user message string
+                            config=config,
+                        )
+                    else:
+                        response = await self._stream_call(api_model, contents, config, on_public_delta)
                 break
             except Exception as e:
-                if attempt < max_429_retries - 1 and _is_rate_limit(e):
+                if cached_content and not _is_rate_limit(e) and attempt < max_429_retries - 1:
+                    # Most likely the handle expired or was evicted — drop it and send the full prompt.
+                    print(f"[api_client] cached prefix {cached_content} rejected ({e!r}) — retrying uncached")
+                    self.prompt_cache.forget(api_model, prefix)
+                    cached_content = None
+                    config = build_config()
+                    contents = user_content
+                elif attempt < max_429_retries - 1 and _is_rate_limit(e):
                     wait = backoff * (2 ** attempt)
-                    print(f"[api_client] 429 rate limit — waiting {wait}s before retry {attempt + 1}/{max_429_retries - 1}")
-                    time.sleep(wait)
+                    print(f"[api_client] 429 rate limit on {api_model} — pausing queue {wait}s before retry {attempt + 1}/{max_429_retries - 1}")
+                    self.rate_limiter.penalise(api_model, wait)
                 else:
                     raise
-        result = response_model(**json.loads(response.text))
-        return response, result
-    
-    def create(self, response_model, messages: list, model: str | None = None):
-        if self._client is None:
-            raise RuntimeError("APIClient not initialized — call init() first")
+        request_ms = int((time.monotonic() - request_start) * 1000)
+        _prompt, completion, total = _extract_usage(response)
+        self.rate_limiter.reconcile(api_model, estimated, total)
+        self._update_completion_estimate(api_model, completion)
+        return response, attempt, request_ms
+
+    async def _make_call(self, messages, api_model, response_model, on_public_delta=None, prefix=None,
+                         batch=None, thinking: ThinkingProfile | None = None) -> _CallResult:
+        response, retries, request_ms = await self._request(messages, api_model, response_model, on_public_delta,
+                                                            prefix, batch, thinking)
+        call = _CallResult(response.text, _extract_usage(response), retries, request_ms, _cached_tokens(response))
+        try:
+            call.result = response_model.model_validate_json(response.text)
+            return call
+        except ValidationError as e:
+            data, invalid, normalised = repair_response(response_model, response.text, e)
+        call.repair = "normalised" if normalised else ""
+
+        if invalid:
+            # Ask again for just the broken fields rather than regenerating the whole turn.
+            print(f"[api_client] {response_model.__name__}: re-requesting invalid fields {invalid}")
+            patch_model = followup_model(response_model, invalid)
+            patch_messages = followup_messages(messages, invalid, response.text)
+            patch, patch_retries, patch_ms = await self._request(patch_messages, api_model, patch_model,
+                                                                 thinking=thinking)
+            data.update(patch_model.model_validate_json(patch.text).model_dump())
+            call.usage = tuple(
+                (a or 0) + (b or 0) if a is not None or b is not None else None
+                for a, b in zip(call.usage, _extract_usage(patch))
+            )
+            call.retries += patch_retries
+            call.request_ms += patch_ms
+            call.repair = "refetched"
+
+        call.result = response_model.model_validate(data)
+        call.text = call.result.model_dump_json()
+        for ledger in self._ledgers():
+            ledger.count_repair(call.repair)
+        return call
+
+    def _ledgers(self) -> list[CallLedger]:
+        session = self._session()
+        return [self._ledger] if session is None else [self._ledger, session.ledger]
+
+    @contextlib.asynccontextmanager
+    async def _in_flight(self, api_model: str):
+        trackers = [self._concurrency.setdefault(key, ConcurrencyTracker()) for key in ("all", api_model)]
+        for tracker in trackers:
+            tracker.enter(time.monotonic())
+        try:
+            yield
+        finally:
+            for tracker in trackers:
+                tracker.exit(time.monotonic())
+
+    async def acreate(self, response_model, messages: list, model: str | None = None, caller: str | None = None,
+                      on_public_delta=None, tags: dict | None = None, prefix: PromptPrefix | None = None,
+                      batch: BatchSubmitter | None = None):
+        """
+        on_public_delta, if given, switches to a streamed call and receives
+        public_response text chunks as the model writes them, or None when a
+        failed attempt's draft should be discarded (called on the client loop —
+        keep it non-blocking). prefix marks the stable head of the
+        prompt for provider-side caching when a prompt cache is configured, and
+        batch sends the request as part of that submitter's next batch job.
+        """
+        self._check_ready()
 
         if self._mock_output:
             return self._mock_response(response_model)
-        api_model = model or self._default_model
-        caller = _caller()
+        caller = caller or _caller()
+        tags = current_tags() if tags is None else tags
+        if not self._in_loop():
+            # Awaited from some other loop (e.g. the web server) — run on the shared one.
+            loop = self._ensure_loop()
+            future = asyncio.run_coroutine_threadsafe(
+                self._acreate(response_model, messages, model, caller, on_public_delta, tags, prefix, batch), loop)
+            return await asyncio.wrap_future(future)
+        return await self._acreate(response_model, messages, model, caller, on_public_delta, tags, prefix, batch)
+
+    async def _acreate(self, response_model, messages: list, model: str | None, caller: str,
+                       on_public_delta=None, tags: dict | None = None, prefix: PromptPrefix | None = None,
+                       batch: BatchSubmitter | None = None):
+        api_model = self._model_or_default(model)
+        response_model_name = getattr(response_model, "__name__", str(response_model))
+        cache_key = None
+        if self._cache is not None:
+            cache_key = ResponseCache.key(api_model, *_split_messages(messages), response_model)
+            if self._cache.reads:
+                text = self._cache.get(cache_key)
+                if text is not None:
+                    return response_model.model_validate_json(text)
+                if self._cache.mode == ResponseCache.REPLAY:
+                    raise CacheMiss(f"No recorded response for {caller} ({response_model_name}), key {cache_key[:12]}")
+
+        # The policy contextvar rides along from the game thread, like the budget below.
+        category, thinking = resolve_thinking(response_model_name, tags)
+        chars = prompt_chars(messages)
+        estimated = self.token_estimator.estimate(chars, api_model)
         start = time.monotonic()
-        response, result = self._make_call(messages, api_model, response_model)
-        prompt, completion, total = _extract_usage(response)
-        with self._lock:
-            record = CallRecord(
-                index=self._index,
-                timestamp=datetime.now(timezone.utc).isoformat(),
-                caller=caller,
-                model=api_model,
-                response_model=getattr(response_model, "__name__", str(response_model)),
-                prompt_tokens=prompt,
-                completion_tokens=completion,
-                total_tokens=total,
-                duration_ms=int((time.monotonic() - start) * 1000),
-            )
-            self._index += 1
-            self._records.append(record)
+        call = await self._make_call(messages, api_model, response_model, on_public_delta, prefix, batch, thinking)
+        if cache_key is not None:
+            self._cache.put(cache_key, call.text, api_model, response_model_name)
+        prompt, completion, total = call.usage
+        self.token_estimator.observe(api_model, chars, prompt, estimated)
+        # The session contextvar rides along from the game thread too; its calls are numbered per game.
+        session = self._session()
+        record = CallRecord(
+            index=0,  # numbered by each ledger as it's booked
+            timestamp=datetime.now(timezone.utc).isoformat(),
+            caller=caller,
+            model=api_model,
+            response_model=response_model_name,
+            prompt_tokens=prompt,
+            completion_tokens=completion,
+            total_tokens=total,
+            duration_ms=int((time.monotonic() - start) * 1000),
+            tags=tags or {},
+            retries=call.retries,
+            request_ms=call.request_ms,
+            repair=call.repair,
+            cached_tokens=call.cached_tokens,
+            category=category,
+            prompt_chars=chars,
+            estimated_prompt_tokens=estimated,
+        )
+        for each in self._ledgers():
+            booked = each.add(record)  # the session's numbering, when there is one, goes to its log
 
-        _write(self._log_path, record)
-        return result
+        # The budget contextvar rides along from the game thread — run_coroutine_threadsafe copies the caller's context.
+        budget = current_budget()
+        if budget is not None:
+            budget.charge(total)
+        _write(session.log_path if session is not None else self._log_path, booked)
+        return call.result
+
+    def create(self, response_model, messages: list, model: str | None = None, on_public_delta=None,
+               prefix: PromptPrefix | None = None):
+        """Blocking wrapper around acreate() for the thread-based rounds."""
+        self._check_ready()
+
+        if self._mock_output:
+            return self._mock_response(response_model)
+        # Tags and the batch scope are captured here, on the calling thread — the client loop has its own context.
+        batch = _current_batch.get()
+        if batch is not None and batch.client is not self:
+            batch = None
+        return self._run_sync(self.acreate(response_model, messages, model, caller=_caller(),
+                                           on_public_delta=on_public_delta, tags=current_tags(), prefix=prefix,
+                                           batch=batch))
 
     def transcribe(self, audio_bytes: bytes, mime_type: str = "audio/webm", model: str | None = None, hints: list[str] | None = None) -> str:
+        """Blocking wrapper around atranscribe(); never call it from an event loop."""
+        return self._run_sync(self.atranscribe(audio_bytes, mime_type, model, hints))
+
+    async def atranscribe(self, audio_bytes: bytes, mime_type: str = "audio/webm", model: str | None = None,
+                          hints: list[str] | None = None) -> str:
+        """
+        Transcribe without blocking the caller's loop. A long 16-bit PCM WAV is
+        split on its pauses first (off-loop) and the pieces transcribed in
+        parallel, then stitched back together in order. Compressed formats go
+        up whole — there's no decoder here to find their pauses.
+        """
+        if mime_type in WAV_MIME_TYPES:
+            chunks = await asyncio.to_thread(split_on_silence, audio_bytes)
+        else:
+            chunks = [audio_bytes]
         hint_text = ""
         if hints:
             hint_text = f"\nThe following names and terms may appear: {', '.join(hints)}."
-            
-        api_model = model or self._default_model
-        response = self._client.models.generate_content(
-            model=api_model,
-            contents=[
-                types.Part.from_bytes(data=audio_bytes, mime_type=mime_type),
-                f"Transcribe this audio exactly. Return only the spoken words, nothing else. {hint_text}",
-            ],
-        )
-        return response.text.strip()
+        api_model = self._model_or_default(model)
+
+        async def run():
+            texts = await asyncio.gather(*(self._transcribe_chunk(c, mime_type, api_model, hint_text) for c in chunks))
+            return " ".join(t for t in texts if t)
+
+        if self._in_loop():
+            return await run()
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(run(), self._ensure_loop()))
+
+    async def _transcribe_chunk(self, audio_bytes: bytes, mime_type: str, api_model: str, hint_text: str) -> str:
+        if self._transcriptions is None:
+            self._transcriptions = asyncio.Semaphore(self.MAX_CONCURRENT_TRANSCRIPTIONS)
+        async with self._transcriptions:
+            # Audio runs ~32 tokens a second; 16 kB/s is a fair guess at the bitrate.
+            await self.rate_limiter.acquire(api_model, len(audio_bytes) // 500 + 200)
+            async with self._in_flight(api_model):
+                response = await self._client.aio.models.generate_content(
+                    model=api_model,
+                    contents=[
+                        types.Part.from_bytes(data=audio_bytes, mime_type=mime_type),
+                        f"Transcribe this audio exactly. Return only the spoken words, nothing else. {hint_text}",
+                    ],
+                )
+        return (response.text or "").strip()
         
-    def summary(self) -> dict:
-        with self._lock:
-            records = list(self._records)
-        by_caller: dict[str, dict] = {}
-        for r in records:
-            s = by_caller.setdefault(r.caller, {"calls": 0, "tokens": 0, "ms": 0})
-            s["calls"] += 1
-            s["tokens"] += r.total_tokens or 0
-            s["ms"] += r.duration_ms
+    def summary(self, session: APISession | None = None) -> dict:
+        """Calls booked to session (every call in the process by default), plus the shared components' state."""
+        ledger = session.ledger if session is not None else self._ledger
+        now = time.monotonic()
         return {
-            "total_calls": len(records),
-            "total_tokens": sum(r.total_tokens or 0 for r in records),
-            "by_caller": by_caller,
+            "session": session.name if session is not None else None,
+            **ledger.summary(),
+            "concurrency": {key: t.summary(now) for key, t in list(self._concurrency.items())},
+            "rate_limiter": self.rate_limiter.stats(),
+            "response_cache": self._cache.stats() if self._cache else None,
+            "log_writer": log_writer.stats(),
+            "schema_registry": schema_registry.stats(),
+            "prompt_cache": self.prompt_cache.stats() if self.prompt_cache else None,
+            "batch": dict(self._batch_counts) if self.batch_service else None,
+            "token_estimator": self.token_estimator.stats(),
+            "render_memo": render_memo_stats(),
         }
 
-    def print_summary(self) -> None:
-        s = self.summary()
+    def print_summary(self, session: APISession | None = None) -> None:
+        log_writer.flush()
+        s = self.summary(session)
         w = 60
+        scope = f"game {s['session']} — " if s["session"] else ""
         print(f"\n{'─' * w}")
-        print(f"  API — {s['total_calls']} calls · {s['total_tokens']:,} tokens")
+        print(f"  API — {scope}{s['total_calls']} calls · {s['total_tokens']:,} tokens")
         print(f"{'─' * w}")
         for caller, stats in s["by_caller"].items():
-            print(f"  {caller:<40}  {stats['calls']:3d} calls  {stats['tokens']:>7,} tok  {stats['ms']:>5}ms")
+            cached = f"  {stats['cache_hit_rate']:.0%} cached" if stats["cached_tokens"] else ""
+            print(f"  {caller:<40}  {stats['calls']:3d} calls  {stats['tokens']:>7,} tok  {stats['ms']:>5}ms{cached}")
+        for model, stats in s["by_model"].items():
+            lat, req = stats["latency_ms"], stats["model_ms"]
+            print(f"  {model:<29}  p50/p90/p99 {lat['p50']}/{lat['p90']}/{lat['p99']}ms"
+                  f" (model {req['p50']}/{req['p90']}/{req['p99']}ms)  {stats['completion_tok_per_s']} out tok/s  {stats['retries']} retries")
+        if "all" in s["concurrency"]:
+            c = s["concurrency"]["all"]
+            print(f"  in flight: mean {c['mean_in_flight']} · peak {c['peak']} · busy {c['busy_fraction']:.0%} of {c['wall_s']}s")
+        if s["response_cache"]:
+            c = s["response_cache"]
+            print(f"  response cache ({c['mode']}): {c['hits']} hits · {c['misses']} misses · {c['evictions']} evicted")
+        r = s["schema_registry"]
+        print(f"  schema registry: {r['models']} models · {r['hit_rate']:.0%} model hits · {r['schema_hit_rate']:.0%} schema hits")
+        memos = " · ".join(f"{name} {m['hit_rate']:.0%}" for name, m in s["render_memo"].items() if m["hits"] + m["misses"])
+        if memos:
+            print(f"  render memo hits: {memos}")
+        cached = sum(m["cached_tokens"] for m in s["by_model"].values())
+        prompt = sum(m["prompt_tokens"] for m in s["by_model"].values())
+        share = f"{cached / prompt:.0%}" if prompt else "0%"
+        if s["prompt_cache"]:
+            p = s["prompt_cache"]
+            print(f"  prompt cache: {p['created']} created · {p['reused']} reused · {p['skipped']} too short · {share} of prompt tokens cached")
+        elif cached:
+            # No explicit caches: these are the provider's implicit prefix-cache hits.
+            print(f"  implicit cache: {share} of prompt tokens cached")
+        if s["batch"]:
+            b = s["batch"]
+            print(f"  batch: {b['jobs']} jobs · {b['batched']} requests batched · {b['fallbacks']} sent directly")
+        t = s["token_estimator"]
+        if t["observed"]:
+            ratios = " · ".join(f"{m} {r}" for m, r in t["chars_per_token"].items())
+            err = t["error_pct"]
+            print(f"  prompt estimate: chars/token {ratios} · error p50/p90 {err['p50']}%/{err['p90']}%")
+            if t["over_warning"]:
+                print(f"  prompts over the warning line: {', '.join(t['over_warning'])}")
+        if s["repairs"]:
+            print(f"  repaired responses: " + " · ".join(f"{n} {kind}" for kind, n in s["repairs"].items()))
+        if s["log_writer"]["dropped"]:
+            print(f"  log writer dropped {s['log_writer']['dropped']} entries (queue full)")
+        for model, stats in s["rate_limiter"].items():
+            print(f"  rate limit {model:<29}  {stats['waited_calls']:3d} waited  max queue {stats['max_queue_depth']:>3}  {stats['total_wait_ms']:>5}ms")
         print(f"{'─' * w}\n")
-        if self._log_path:
-            summary_path = self._log_path.replace(".jsonl", "_summary.json")
+        log_path = session.log_path if session is not None else self._log_path
+        if log_path:
+            summary_path = log_path.replace(".jsonl", "_summary.json")
             with open(summary_path, "w", encoding="utf-8") as f:
                 json.dump(s, f, indent=2)
 
@@ -168,8 +854,54 @@ api_client = APIClient()
 
 
 # ── helpers ──────────────────────────────────────────────────────────────────
+LOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "logs", "api_logs")
+LOGS_KEPT = 25
+_pruned_dirs: set[str] = set()
+_prune_lock = threading.Lock()
 
-_SKIP = {"core.api_client", "agents.base_agent"}
+
+_LOREM = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor incididunt ut labore et dolore magna aliqua.\n Ut enim ad minim veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea commodo consequat. Duis aute irure dolor in reprehenderit in voluptate velit esse cillum dolore eu fugiat nulla pariatur. Excepteur sint occaecat cupidatat non proident, \n \n sunt in culpa qui officia deserunt mollit anim id est laborum."
+
+
+def mock_response(response_model, long_text: str = _LOREM, rng=random, optional_fill_rate: float = 1.0):
+    """
+    Fill every field of response_model with plausible filler (random Literal picks, lorem text).
+    Optional fields (default None) are filled with probability optional_fill_rate, else left out;
+    a lean model's optional fields aren't in its schema, so they're always left out.
+    """
+    lean = isinstance(response_model, type) and issubclass(response_model, LeanSchema)
+    values = {}
+    for name, field_info in response_model.model_fields.items():
+        annotation = field_info.annotation
+        if lean and not field_info.is_required():
+            continue
+        if optional_fill_rate < 1.0 and not field_info.is_required() and field_info.default is None \
+                and rng.random() >= optional_fill_rate:
+            continue
+        if get_origin(annotation) is Literal:
+            values[name] = rng.choice(get_args(annotation))
+        elif get_origin(annotation) is list:
+            inner = get_args(annotation)[0] if get_args(annotation) else str
+            count = max([1] + [getattr(m, "min_length", 0) for m in field_info.metadata])
+            if get_origin(inner) is Literal:
+                values[name] = [rng.choice(get_args(inner)) for _ in range(count)]
+            else:
+                values[name] = [f"test [{name}] {i + 1}" for i in range(count)]
+        elif isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            values[name] = mock_response(annotation, long_text, rng, optional_fill_rate)
+        else:
+            values[name] = f"{long_text}  [{name}]"
+    return response_model(**values)
+
+
+_SKIP = ("core.api_client", "core.call_context", "agents.base_agent")
+
+
+def _notify(on_public_delta, delta: str | None) -> None:
+    try:
+        on_public_delta(delta)
+    except Exception as e:  # a broken UI must never fail the turn
+        print(f"[api_client] public delta callback failed: {e!r}")
 
 
 def _is_rate_limit(exc: Exception) -> bool:
@@ -177,14 +909,22 @@ def _is_rate_limit(exc: Exception) -> bool:
     return "429" in msg or "RESOURCE_EXHAUSTED" in msg
 
 
+def _split_messages(messages) -> tuple[str | None, str | None]:
+    system_content = next((m["content"] for m in messages if m["role"] == "system"), None)
+    user_content = next((m["content"] for m in messages if m["role"] == "user"), None)
+    return system_content, user_content
+
+
 def _caller() -> str:
-    for frame in inspect.stack():
-        module = frame.frame.f_globals.get("__name__", "")
-        if any(module.startswith(s) for s in _SKIP):
-            continue
-        cls = frame.frame.f_locals.get("self")
-        cls_name = type(cls).__name__ if cls else ""
-        return f"{cls_name}.{frame.function}" if cls_name else frame.function
+    # Walks raw frames rather than inspect.stack(), which reads source context for every frame.
+    frame = sys._getframe(1)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(_SKIP):
+            cls = frame.f_locals.get("self")
+            name = frame.f_code.co_name
+            return f"{type(cls).__name__}.{name}" if cls is not None else name
+        frame = frame.f_back
     return "unknown"
 
 
@@ -200,23 +940,32 @@ def _extract_usage(response) -> tuple[int | None, int | None, int | None]:
     return prompt, completion, total
 
 
+def _cached_tokens(response) -> int | None:
+    usage = getattr(response, "usage_metadata", None)
+    return getattr(usage, "cached_content_token_count", None) if usage is not None else None
+
+
 def _write(path: str | None, record: CallRecord) -> None:
     if path is None:
         return
-    line = json.dumps(asdict(record)) + "\n"
-    with open(path, "a", encoding="utf-8") as f:
-        f.write(line)
+    log_writer.write(path, asdict(record))
 
 
-def _make_log_path() -> str:
-    log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "logs", "api_logs")
-    os.makedirs(log_dir, exist_ok=True)
-    _prune_logs(log_dir, keep=25)
+def _make_log_path(name: str | None = None) -> str:
+    os.makedirs(LOG_DIR, exist_ok=True)
+    with _prune_lock:
+        # Once per process and directory: every later path belongs to this process's log or a live game's.
+        if LOG_DIR not in _pruned_dirs:
+            _pruned_dirs.add(LOG_DIR)
+            _prune_logs(LOG_DIR, keep=LOGS_KEPT)
     ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-    return os.path.join(log_dir, f"api_calls_{ts}.jsonl")
+    suffix = f"_{name}" if name else ""
+    return os.path.join(LOG_DIR, f"api_calls_{ts}{suffix}.jsonl")
 
 
 def _prune_logs(log_dir: str, keep: int) -> None:
-    logs = sorted(os.path.join(log_dir, f) for f in os.listdir(log_dir) if f.endswith(".jsonl"))
-    for old in logs[:-keep]:
-        os.remove(old)
+    """Keep the newest `keep` call logs and the newest `keep` end-of-game summaries."""
+    for suffix in (".jsonl", "_summary.json"):
+        logs = sorted(os.path.join(log_dir, f) for f in os.listdir(log_dir) if f.endswith(suffix))
+        for old in logs[:-keep]:
+            os.remove(old)
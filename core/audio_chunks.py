@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import io
+import math
+import sys
+import wave
+from array import array
+
+WAV_MIME_TYPES = {"audio/wav", "audio/x-wav", "audio/wave", "audio/vnd.wave"}
+
+_sumprod = getattr(math, "sumprod", None)  # 3.12+; a plain sum elsewhere
+
+
+def split_on_silence(
+    wav_bytes: bytes,
+    max_chunk_s: float = 30.0,
+    min_chunk_s: float = 5.0,
+    silence_db: float = -40.0,
+    window_ms: int = 30,
+    min_silence_ms: int = 300,
+) -> list[bytes]:
+    """
+    Split a 16-bit PCM WAV into clips of at most max_chunk_s, cutting in the
+    middle of pauses where there are any (a hard cut where there aren't).
+    Each clip is a complete WAV. Anything that isn't 16-bit PCM WAV, or is
+    already short enough, comes back as the one original clip.
+    """
+    try:
+        with wave.open(io.BytesIO(wav_bytes)) as wav:
+            params = wav.getparams()
+            frames = wav.readframes(params.nframes)
+    except (wave.Error, EOFError):
+        return [wav_bytes]
+    rate, channels = params.framerate, params.nchannels
+    if params.sampwidth != 2 or params.nframes <= max_chunk_s * rate:
+        return [wav_bytes]
+
+    samples = array("h", frames)
+    if sys.byteorder == "big":
+        samples.byteswap()
+
+    window = max(1, rate * window_ms // 1000)  # frames per window
+    threshold = 32768 * 10 ** (silence_db / 20)
+    silent = []
+    for start in range(0, params.nframes, window):
+        chunk = samples[start * channels:(start + window) * channels]
+        energy = _sumprod(chunk, chunk) if _sumprod else sum(s * s for s in chunk)
+        silent.append(math.sqrt(energy / max(1, len(chunk))) < threshold)
+
+    cuts = _cut_points(silent, window, rate, max_chunk_s, min_chunk_s, min_silence_ms, params.nframes)
+    bounds = [0, *cuts, params.nframes]
+    return [_wav(params, frames[a * channels * 2:b * channels * 2]) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _cut_points(silent, window, rate, max_chunk_s, min_chunk_s, min_silence_ms, nframes) -> list[int]:
+    # Midpoints (in frames) of every run of silence long enough to count as a pause.
+    min_run = max(1, math.ceil(min_silence_ms / (window * 1000 / rate)))
+    pauses, run_start = [], None
+    for i, quiet in enumerate([*silent, False]):
+        if quiet and run_start is None:
+            run_start = i
+        elif not quiet and run_start is not None:
+            if i - run_start >= min_run:
+                pauses.append((run_start + i) * window // 2)
+            run_start = None
+
+    cuts, start = [], 0
+    max_len, min_len = int(max_chunk_s * rate), int(min_chunk_s * rate)
+    while nframes - start > max_len:
+        candidates = [p for p in pauses if start + min_len <= p <= start + max_len]
+        cut = candidates[-1] if candidates else start + max_len
+        cuts.append(cut)
+        start = cut
+    return cuts
+
+
+def _wav(params, frames: bytes) -> bytes:
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(params.nchannels)
+        wav.setsampwidth(params.sampwidth)
+        wav.setframerate(params.framerate)
+        wav.writeframes(frames)
+    return out.getvalue()
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import tempfile
+import uuid
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+
+import google.genai.types as types
+
+from core.thinking_policy import ThinkingProfile
+
+
+@dataclass(frozen=True)
+class BatchRequest:
+    system_content: str | None
+    user_content: str
+    response_model: type
+    thinking: ThinkingProfile = field(default_factory=ThinkingProfile)
+
+
+@dataclass
+class BatchPoll:
+    # index into the job's requests -> response (with .text and .usage_metadata), or None if that request failed
+    results: dict[int, object] = field(default_factory=dict)
+    done: bool = False
+
+
+def _config(request: BatchRequest) -> types.GenerateContentConfig:
+    return types.GenerateContentConfig(
+        system_instruction=request.system_content,
+        response_mime_type="application/json",
+        response_schema=request.response_model,
+        thinking_config=request.thinking.thinking_config(),
+        temperature=request.thinking.temperature,
+    )
+
+
+class GenaiBatchService:
+    """
+    The provider's batch API with inlined requests. Results only come back
+    once the whole job has finished — usually minutes — so poll() reports
+    nothing until then. turnaround_s is that typical wait: a batch() scope
+    whose deadline is shorter doesn't create a job at all (see APIClient.batch).
+    Inlined requests need the Gemini Developer API; Vertex wants GCS sources.
+    """
+
+    turnaround_s = 300.0
+
+    _DONE = {
+        types.JobState.JOB_STATE_SUCCEEDED,
+        types.JobState.JOB_STATE_PARTIALLY_SUCCEEDED,
+        types.JobState.JOB_STATE_FAILED,
+        types.JobState.JOB_STATE_CANCELLED,
+        types.JobState.JOB_STATE_EXPIRED,
+    }
+
+    def __init__(self, client):
+        if getattr(client, "vertexai", False):
+            raise ValueError("LLM_BATCH=genai sends inlined requests, which need a Gemini Developer API client, "
+                             "not Vertex AI — use LLM_BATCH=local or leave batching off")
+        self.client = client
+
+    async def create(self, model: str, requests: list[BatchRequest]) -> str:
+        job = await self.client.aio.batches.create(
+            model=model,
+            src=[types.InlinedRequest(contents=r.user_content, config=_config(r)) for r in requests],
+            config=types.CreateBatchJobConfig(display_name=f"llmchatgame-{len(requests)}"),
+        )
+        return job.name
+
+    async def poll(self, job: str) -> BatchPoll:
+        batch = await self.client.aio.batches.get(name=job)
+        if batch.state not in self._DONE:
+            return BatchPoll()
+        responses = (batch.dest.inlined_responses if batch.dest else None) or []
+        return BatchPoll(
+            results={i: (r.response if r.error is None else None) for i, r in enumerate(responses)},
+            done=True,
+        )
+
+    async def cancel(self, job: str) -> None:
+        await self.client.aio.batches.cancel(name=job)
+
+
+@dataclass
+class _LocalJob:
+    path: str
+    requests: list[BatchRequest]
+    task: asyncio.Task | None = None
+    offset: int = 0
+
+
+class LocalBatchService:
+    """
+    File-based stand-in for the provider's batch API, for tests and offline
+    load runs. Each job is a directory under root: requests.jsonl goes in,
+    results.jsonl grows a line per finished request in completion order, and
+    poll() reads whatever has landed since the last poll. Requests run
+    against backend (anything with aio.models.generate_content — usually the
+    SyntheticBackend), at most `concurrency` at a time. The file work runs in
+    worker threads, off the client's event loop.
+    """
+
+    turnaround_s = 0.0
+
+    def __init__(self, backend, root: str | None = None, concurrency: int = 8):
+        self.backend = backend
+        self.root = root or tempfile.mkdtemp(prefix="llm_batches_")
+        self.concurrency = concurrency
+        self._jobs: dict[str, _LocalJob] = {}
+
+    async def create(self, model: str, requests: list[BatchRequest]) -> str:
+        job = f"batches/local-{uuid.uuid4().hex[:12]}"
+        path = os.path.join(self.root, job.split("/")[-1])
+        await asyncio.to_thread(_write_requests, path, model, requests)
+        entry = _LocalJob(path, requests)
+        entry.task = asyncio.get_running_loop().create_task(self._process(model, entry))
+        self._jobs[job] = entry
+        return job
+
+    async def _process(self, model: str, job: _LocalJob) -> None:
+        sem = asyncio.Semaphore(self.concurrency)
+        results_path = os.path.join(job.path, "results.jsonl")
+        write_lock = asyncio.Lock()  # one appender at a time, so lines never interleave
+
+        async def run(index: int, request: BatchRequest):
+            async with sem:
+                try:
+                    response = await self.backend.aio.models.generate_content(
+                        model=model, contents=request.user_content, config=_config(request))
+                    usage = response.usage_metadata
+                    line = {"index": index, "text": response.text, "usage": {
+                        "prompt_token_count": getattr(usage, "prompt_token_count", None),
+                        "candidates_token_count": getattr(usage, "candidates_token_count", None),
+                        "total_token_count": getattr(usage, "total_token_count", None),
+                    }}
+                except Exception as e:
+                    line = {"index": index, "error": repr(e)}
+            async with write_lock:
+                await asyncio.to_thread(_append_line, results_path, json.dumps(line) + "\n")
+
+        await asyncio.gather(*(run(i, r) for i, r in enumerate(job.requests)))
+        await asyncio.to_thread(_touch, os.path.join(job.path, "done"))
+
+    async def poll(self, job: str) -> BatchPoll:
+        entry = self._jobs[job]
+        poll = await asyncio.to_thread(_read_results, entry)
+        if poll.done:
+            del self._jobs[job]
+        return poll
+
+    async def cancel(self, job: str) -> None:
+        entry = self._jobs.get(job)
+        if entry is not None and entry.task is not None:
+            entry.task.cancel()
+
+
+def _write_requests(path: str, model: str, requests: list[BatchRequest]) -> None:
+    os.makedirs(path)
+    with open(os.path.join(path, "requests.jsonl"), "w", encoding="utf-8") as f:
+        for i, r in enumerate(requests):
+            f.write(json.dumps({
+                "index": i,
+                "model": model,
+                "system": r.system_content,
+                "contents": r.user_content,
+                "response_schema": r.response_model.__name__,
+            }) + "\n")
+    _touch(os.path.join(path, "results.jsonl"))
+
+
+def _append_line(path: str, line: str) -> None:
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line)
+
+
+def _touch(path: str) -> None:
+    open(path, "w").close()
+
+
+def _read_results(entry: _LocalJob) -> BatchPoll:
+    """Whatever results have landed since entry.offset; only complete lines count."""
+    poll = BatchPoll(done=os.path.exists(os.path.join(entry.path, "done")))
+    with open(os.path.join(entry.path, "results.jsonl"), "rb") as f:
+        f.seek(entry.offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                break  # still being written
+            entry.offset += len(line)
+            data = json.loads(line)
+            if "error" in data:
+                poll.results[data["index"]] = None
+            else:
+                poll.results[data["index"]] = SimpleNamespace(
+                    text=data["text"], usage_metadata=SimpleNamespace(**data["usage"]))
+    return poll
@@ -1,3 +1,4 @@
+import glob
 import os
 
 from dotenv import load_dotenv
@@ -10,6 +11,14 @@ from core.sinks.console_sink import ConsoleGameEventSink
 from core.levels.phase_recipe_factory import PhaseRecipeFactoryDefault
 from core.simulation_engine import SimulationEngine
 from core.api_client import api_client
+from core.game_context.context_budget import ContextBudget
+from core.game_context.system_prompt import CLASSIC, PROMPT_LAYOUTS
+from core.batch_service import GenaiBatchService, LocalBatchService
+from core.levels.level_registry import get_level_by_id
+from core.prompt_cache import PromptCacheManager
+from core.response_cache import ResponseCache
+from core.thinking_policy import ThinkingPolicy
+from core.token_estimator import TokenEstimator
 from agents.player import Debater
 import google.genai as genai
 
@@ -21,6 +30,8 @@ import google.genai as genai
 DEFAULT_MODEL_NAME = "gemini-2.5-flash-lite"
 #DEFAULT_MODEL_NAME = "gemini-2.0-flash-lite"
 DEFAULT_HIGHER_MODEL_NAME = "gemini-2.5-flash"
+# An agent prompt past this many (estimated) tokens gets a warning; LLM_CONTEXT_WARN_TOKENS overrides it
+DEFAULT_CONTEXT_WARN_TOKENS = 32_000
 #gemini-3-flash-preview
 def create_agent(name):
     return Debater(name, '', DEFAULT_MODEL_NAME, higher_model_name = DEFAULT_HIGHER_MODEL_NAME)
@@ -29,23 +40,30 @@ def create_engine(game_sink, number_of_players: int = 0, generic_players: bool =
                   agents = None,
                   allow_rename = True,
                   model_name=DEFAULT_MODEL_NAME, higher_model_name=DEFAULT_HIGHER_MODEL_NAME,
-                  phase_factory= None):
+                  phase_factory= None, client=None, level_id=None):
     
     if phase_factory is None:
         phase_factory = PhaseRecipeFactoryDefault
         
     load_dotenv()
     #client = instructor.from_provider('google/' + model_name, api_key=os.getenv("GEMINI_API_KEY"))
-    project=os.getenv("PROJECT")
-    location=os.getenv("LOCATION") 
-    client = genai.Client(
-        vertexai=True,
-        project=project,
-        location=location
-    )
-    api_client.init(client, model_name)
+    if client is None:  # e.g. a SyntheticBackend for offline load tests
+        # One connection pool, loop and rate limiter for every game in the process.
+        client = api_client.client
+    if client is None:
+        project=os.getenv("PROJECT")
+        location=os.getenv("LOCATION") 
+        client = genai.Client(
+            vertexai=True,
+            project=project,
+            location=location
+        )
+    if client is not api_client.client:
+        _init_api_client(client, model_name)
+    # A reused client is left alone: this engine's model reaches its calls through its APISession's default_model.
+
     game_master = GameMaster(model_name, higher_model_name=higher_model_name)
-    gameBoard = GameBoard(game_sink)
+    gameBoard = GameBoard(game_sink, context_budget=_context_budget(level_id), prompt_layout=_prompt_layout())
     generator = CharacterGenerator(game_sink, model_name, higher_model_name)
     
     if agents:
@@ -58,4 +76,64 @@ def create_engine(game_sink, number_of_players: int = 0, generic_players: bool =
         rand_names = generator.generate_random_debaters_names(number_of_players)
         agents = generator.generate_agents_from_names(rand_names, allow_rename = allow_rename)
 
-    return SimulationEngine(agents=agents, game_board=gameBoard, game_master=game_master, generator=generator, phase_factory=phase_factory)
\ No newline at end of file
+    return SimulationEngine(agents=agents, game_board=gameBoard, game_master=game_master, generator=generator, phase_factory=phase_factory,
+                            thinking_policy=_thinking_policy(level_id))
+
+
+def _init_api_client(client, model_name):
+    # Shared by every game, so it only runs when the client changes — not once per engine. Games set their own
+    # model on their APISession (see SimulationEngine).
+    # LLM_CACHE_MODE=record|replay|read-through gives byte-identical reruns without token spend
+    cache_mode = os.getenv("LLM_CACHE_MODE")
+    cache = ResponseCache(os.getenv("LLM_CACHE_PATH"), mode=cache_mode) if cache_mode else None
+    # LLM_PROMPT_CACHE=on caches each agent's stable context provider-side (billed storage; stable_first layout only)
+    prompt_cache = PromptCacheManager() if os.getenv("LLM_PROMPT_CACHE", "").lower() == "on" else None
+    # LLM_BATCH=genai|local sends non-interactive fan-outs (phase summaries, cast generation) as batch jobs.
+    # genai needs a Developer API client and a deadline past its turnaround (LLM_BATCH_DEADLINE_S=600, say)
+    batch_mode = os.getenv("LLM_BATCH", "").lower()
+    batch_service = {"genai": GenaiBatchService, "local": LocalBatchService}.get(batch_mode)
+    # LLM_BATCH_DEADLINE_S: how long a fan-out waits on its batch job before sending what's left directly
+    batch_deadline_s = os.getenv("LLM_BATCH_DEADLINE_S")
+    # Prompt-size estimates start from the ratios seen in earlier runs' api_calls_*.jsonl logs
+    token_estimator = TokenEstimator(warn_tokens=int(os.getenv("LLM_CONTEXT_WARN_TOKENS", DEFAULT_CONTEXT_WARN_TOKENS)))
+    log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "logs", "api_logs")
+    token_estimator.calibrate_from_logs(sorted(glob.glob(os.path.join(log_dir, "api_calls_*.jsonl"))))
+    api_client.init(client, model_name, cache=cache, prompt_cache=prompt_cache,
+                    batch_service=batch_service(client) if batch_service else None,
+                    token_estimator=token_estimator,
+                    batch_deadline_s=float(batch_deadline_s) if batch_deadline_s else None)
+
+
+def _thinking_policy(level_id):
+    # LLM_THINKING_POLICY=off|lean|standard|deep overrides the level's own choice; with neither, calls keep
+    # the client's plain defaults
+    override = os.getenv("LLM_THINKING_POLICY", "").lower()
+    if override == "off":
+        return None
+    if override:
+        return ThinkingPolicy.named(override)
+    level = get_level_by_id(level_id) if level_id else None
+    if level is None or level.thinking_policy is None:
+        return None
+    return ThinkingPolicy.named(level.thinking_policy)
+
+
+def _prompt_layout():
+    # LLM_PROMPT_LAYOUT=classic|stable_first
+    layout = os.getenv("LLM_PROMPT_LAYOUT", CLASSIC).lower()
+    if layout not in PROMPT_LAYOUTS:
+        raise ValueError(f"LLM_PROMPT_LAYOUT must be one of {', '.join(PROMPT_LAYOUTS)}, got {layout!r}")
+    return layout
+
+
+def _context_budget(level_id):
+    # LLM_CONTEXT_BUDGET=off|<tokens> overrides the level's ceiling on each player's user content
+    override = os.getenv("LLM_CONTEXT_BUDGET", "").lower()
+    if override == "off":
+        return None
+    if override:
+        return ContextBudget(int(override))
+    level = get_level_by_id(level_id) if level_id else None
+    if level is None or level.context_budget_tokens is None:
+        return None
+    return ContextBudget(level.context_budget_tokens)
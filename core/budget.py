@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import contextvars
+import random
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Callable, Literal, get_args, get_origin
+
+from pydantic import BaseModel
+
+from models.schema_registry import RegisteredModel, cached_model
+
+
+class BudgetLevel(IntEnum):
+    NORMAL = 0
+    NO_UPGRADES = 1   # higher-model upgrades are ignored
+    LEAN = 2          # optional (cognitive) fields are left out of the response schema
+    HEURISTIC = 3     # no more LLM calls — responses are filled with defaults
+
+
+class GameBudget:
+    """
+    Spend ceiling for one game: tokens, calls and wall-clock seconds, any of
+    which may be None for unlimited. The most-used of the three decides the
+    level, and each level degrades a little more than the last.
+
+    The API client charges it after every call; BaseAgent.get_response reads
+    the level before making one, projected forward by the prompt's estimated
+    size (see core/token_estimator.py).
+    """
+
+    def __init__(
+        self,
+        max_tokens: int | None = None,
+        max_calls: int | None = None,
+        max_wall_s: float | None = None,
+        no_upgrades_at: float = 0.7,
+        lean_at: float = 0.85,
+        heuristic_at: float = 1.0,
+    ):
+        self.max_tokens = max_tokens
+        self.max_calls = max_calls
+        self.max_wall_s = max_wall_s
+        self.thresholds = (
+            (heuristic_at, BudgetLevel.HEURISTIC),
+            (lean_at, BudgetLevel.LEAN),
+            (no_upgrades_at, BudgetLevel.NO_UPGRADES),
+        )
+        self.tokens_used = 0
+        self.calls_used = 0
+        self.heuristic_responses = 0
+        self.listener: Callable[[dict], None] | None = None
+        self._started = time.monotonic()
+        self._level = BudgetLevel.NORMAL
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, cfg) -> "GameBudget":
+        return cls(
+            max_tokens=cfg.budget_max_tokens,
+            max_calls=cfg.budget_max_calls,
+            max_wall_s=cfg.budget_max_wall_s,
+        )
+
+    def used_fraction(self, extra_tokens: int = 0) -> float:
+        fractions = [0.0]
+        if self.max_tokens:
+            fractions.append((self.tokens_used + extra_tokens) / self.max_tokens)
+        if self.max_calls:
+            fractions.append(self.calls_used / self.max_calls)
+        if self.max_wall_s:
+            fractions.append((time.monotonic() - self._started) / self.max_wall_s)
+        return max(fractions)
+
+    @property
+    def level(self) -> BudgetLevel:
+        self._refresh()
+        return self._level
+
+    def projected_level(self, tokens: int) -> BudgetLevel:
+        """The level this budget would be at after spending another tokens — nothing is charged."""
+        used = self.used_fraction(tokens)
+        return max(self.level, next((lvl for at, lvl in self.thresholds if used >= at), BudgetLevel.NORMAL))
+
+    def charge(self, tokens: int | None, calls: int = 1) -> None:
+        with self._lock:
+            self.tokens_used += tokens or 0
+            self.calls_used += calls
+        self._refresh()
+
+    def record_heuristic(self) -> None:
+        with self._lock:
+            self.heuristic_responses += 1
+
+    def _refresh(self) -> None:
+        used = self.used_fraction()
+        level = next((lvl for at, lvl in self.thresholds if used >= at), BudgetLevel.NORMAL)
+        with self._lock:
+            # Levels only ever step down — a quiet spell doesn't restore the budget.
+            if level <= self._level:
+                return
+            self._level = level
+        if self.listener is not None:
+            self.listener(self.snapshot())
+
+    def snapshot(self) -> dict:
+        return {
+            "level": self._level.name.lower(),
+            "used_fraction": round(self.used_fraction(), 3),
+            "tokens_used": self.tokens_used,
+            "max_tokens": self.max_tokens,
+            "calls_used": self.calls_used,
+            "max_calls": self.max_calls,
+            "elapsed_s": round(time.monotonic() - self._started, 1),
+            "max_wall_s": self.max_wall_s,
+            "heuristic_responses": self.heuristic_responses,
+        }
+
+
+_current_budget: contextvars.ContextVar[GameBudget | None] = contextvars.ContextVar("game_budget", default=None)
+
+
+@contextmanager
+def budget_scope(budget: GameBudget | None):
+    token = _current_budget.set(budget)
+    try:
+        yield budget
+    finally:
+        _current_budget.reset(token)
+
+
+def current_budget() -> GameBudget | None:
+    return _current_budget.get()
+
+
+class LeanSchema(RegisteredModel):
+    """Mixin for lean response models: the JSON schema lists only the required fields."""
+
+    @classmethod
+    def model_json_schema(cls, *args, **kwargs):
+        schema = super().model_json_schema(*args, **kwargs)
+        required = set(schema.get("required", []))
+        schema["properties"] = {name: spec for name, spec in schema.get("properties", {}).items() if name in required}
+        return schema
+
+
+def lean_model(response_model: type[BaseModel]) -> type[BaseModel]:
+    """
+    The same response model with every optional (defaulted) field left out of
+    the schema the model is asked to fill. The fields stay on the class with
+    their defaults, so callers that read them still can.
+    """
+    if all(field.is_required() for field in response_model.model_fields.values()):
+        return response_model
+    return cached_model(response_model.__name__, __base__=(response_model, LeanSchema))
+
+
+def heuristic_response(response_model: type[BaseModel], rng=random) -> BaseModel:
+    """A safe, schema-valid response built without the LLM: random choices, quiet text."""
+    values = {}
+    for name, field in response_model.model_fields.items():
+        if not field.is_required():
+            continue
+        values[name] = _heuristic_value(name, field.annotation, field.metadata, rng)
+    return response_model(**values)
+
+
+def _heuristic_value(name, annotation, metadata, rng):
+    origin = get_origin(annotation)
+    if origin is Literal:
+        return rng.choice(get_args(annotation))
+    if origin is list:
+        inner = get_args(annotation)[0] if get_args(annotation) else str
+        count = max([0] + [getattr(m, "min_length", 0) or 0 for m in metadata])
+        return [_heuristic_value(name, inner, [], rng) for _ in range(count)]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return heuristic_response(annotation, rng)
+    if annotation is bool:
+        return False
+    if annotation in (int, float):
+        return annotation(0)
+    if name == "public_response":
+        return "..."
+    return ""
@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+# Structured attribution for LLM calls. Keys in use:
+#   game   — SimulationEngine.game_id
+#   phase  — phase number
+#   round  — round class name
+#   agent  — agent name
+#   turn   — response model name (the kind of turn being taken)
+_call_tags: contextvars.ContextVar[dict] = contextvars.ContextVar("llm_call_tags", default={})
+
+
+@contextmanager
+def call_tags(**tags):
+    """Layer tags over the current ones for the duration of the block. None values are ignored."""
+    merged = {**_call_tags.get(), **{k: v for k, v in tags.items() if v is not None}}
+    token = _call_tags.set(merged)
+    try:
+        yield merged
+    finally:
+        _call_tags.reset(token)
+
+
+def current_tags() -> dict:
+    return dict(_call_tags.get())
+
+
+class TaggedThreadPoolExecutor(ThreadPoolExecutor):
+    """
+    ThreadPoolExecutor whose tasks run inside a copy of the submitting
+    thread's context, so call tags follow the work into the pool.
+    map() goes through submit() and is covered too.
+    """
+
+    def submit(self, fn, /, *args, **kwargs):
+        context = contextvars.copy_context()
+        return super().submit(context.run, fn, *args, **kwargs)
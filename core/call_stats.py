@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from dataclasses import replace
+
+
+class StreamingHistogram:
+    """
+    Constant-memory latency histogram with log-spaced buckets, each ~5% wider
+    than the last. Percentiles are accurate to one bucket width, and a
+    process that makes a million calls holds a few hundred counters.
+    """
+
+    GROWTH = 1.05
+
+    def __init__(self) -> None:
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        bucket = 0 if value < 1 else int(math.log(value) / math.log(self.GROWTH)) + 1
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.max = max(self.max, value)
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                upper = 1.0 if bucket == 0 else self.GROWTH ** bucket
+                return min(upper, self.max)
+        return self.max
+
+    def percentiles(self) -> dict:
+        return {f"p{p}": round(self.percentile(p)) for p in (50, 90, 99)}
+
+
+class CallStats:
+    """Running totals and latency histograms for one slice of calls (a model, a caller, a round)."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.retries = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+        self.completion_tokens = 0
+        self.thought_tokens = 0
+        self.total_tokens = 0
+        self.ms = 0
+        self.request_ms = 0
+        self.latency = StreamingHistogram()       # end to end, including limiter queueing and retries
+        self.model_latency = StreamingHistogram() # the successful request alone
+
+    def add(self, record) -> None:
+        self.calls += 1
+        self.retries += record.retries
+        self.prompt_tokens += record.prompt_tokens or 0
+        self.cached_tokens += getattr(record, "cached_tokens", None) or 0
+        self.completion_tokens += record.completion_tokens or 0
+        self.total_tokens += record.total_tokens or 0
+        if None not in (record.prompt_tokens, record.completion_tokens, record.total_tokens):
+            # The API reports thoughts outside candidates but inside the total.
+            self.thought_tokens += max(0, record.total_tokens - record.prompt_tokens - record.completion_tokens)
+        self.ms += record.duration_ms
+        self.latency.add(record.duration_ms)
+        request_ms = record.request_ms if record.request_ms is not None else record.duration_ms
+        self.request_ms += request_ms
+        self.model_latency.add(request_ms)
+
+    def summary(self) -> dict:
+        request_s = self.request_ms / 1000
+        return {
+            "calls": self.calls,
+            "tokens": self.total_tokens,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            # Share of prompt tokens served from a cached prefix, explicit or implicit.
+            "cache_hit_rate": round(self.cached_tokens / self.prompt_tokens, 3) if self.prompt_tokens else 0.0,
+            "completion_tokens": self.completion_tokens,
+            "thought_tokens": self.thought_tokens,
+            "ms": self.ms,
+            "retries": self.retries,
+            "latency_ms": self.latency.percentiles(),
+            "model_ms": self.model_latency.percentiles(),
+            "prompt_tok_per_s": round(self.prompt_tokens / request_s, 1) if request_s else 0.0,
+            "completion_tok_per_s": round(self.completion_tokens / request_s, 1) if request_s else 0.0,
+        }
+
+
+class CallLedger:
+    """
+    The calls booked to one scope — the whole process, or a single game: the
+    most recent records, running CallStats per model/caller/round/category
+    slice, and repair counts. Memory is bounded by `recent` and the number of
+    distinct slice keys, however long the scope lives.
+    """
+
+    def __init__(self, recent: int = 1000) -> None:
+        self.records: deque = deque(maxlen=recent)
+        self.stats: dict[tuple[str, str], CallStats] = {}
+        self.repairs: dict[str, int] = {}
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def add(self, record):
+        """Book a call. Returns the record numbered in this ledger's order (its index)."""
+        slices = (("model", record.model), ("caller", record.caller),
+                  ("round", record.tags.get("round", "untagged")), ("category", record.category))
+        with self._lock:
+            record = replace(record, index=self.calls)
+            self.calls += 1
+            self.records.append(record)
+            for kind, key in slices:
+                self.stats.setdefault((kind, key), CallStats()).add(record)
+        return record
+
+    def count_repair(self, kind: str) -> None:
+        with self._lock:
+            self.repairs[kind] = self.repairs.get(kind, 0) + 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            groups: dict[str, dict] = {"model": {}, "caller": {}, "round": {}, "category": {}}
+            for (kind, key), stats in self.stats.items():
+                groups[kind][key] = stats.summary()
+            return {
+                "total_calls": self.calls,
+                "total_tokens": sum(s["tokens"] for s in groups["model"].values()),
+                "by_model": groups["model"],
+                "by_caller": groups["caller"],
+                "by_round": groups["round"],
+                "by_category": groups["category"],
+                "repairs": dict(self.repairs),
+            }
+
+
+class ConcurrencyTracker:
+    """
+    Time-weighted count of requests actually in flight. mean_in_flight near 1
+    with a low busy fraction means the game, not the model, is the bottleneck.
+    """
+
+    def __init__(self) -> None:
+        self.in_flight = 0
+        self.peak = 0
+        self._first: float | None = None
+        self._last = 0.0
+        self._area = 0.0  # integral of in_flight over time
+        self._busy = 0.0  # time with at least one request in flight
+
+    def _advance(self, now: float) -> None:
+        if self._first is None:
+            self._first = self._last = now
+        elapsed = now - self._last
+        self._area += self.in_flight * elapsed
+        if self.in_flight:
+            self._busy += elapsed
+        self._last = now
+
+    def enter(self, now: float) -> None:
+        self._advance(now)
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+
+    def exit(self, now: float) -> None:
+        self._advance(now)
+        self.in_flight -= 1
+
+    def summary(self, now: float) -> dict:
+        if self._first is None:
+            return {"peak": 0, "mean_in_flight": 0.0, "busy_fraction": 0.0, "wall_s": 0.0}
+        area = self._area + self.in_flight * (now - self._last)
+        busy = self._busy + ((now - self._last) if self.in_flight else 0.0)
+        wall = now - self._first
+        return {
+            "peak": self.peak,
+            "mean_in_flight": round(area / wall, 2) if wall else 0.0,
+            "busy_fraction": round(busy / wall, 3) if wall else 0.0,
+            "wall_s": round(wall, 1),
+        }
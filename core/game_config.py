@@ -23,6 +23,13 @@ class GameConfig:
         #....
         
         
+        # --------------------------------------------------------------
+        # Spend ceiling per game (None = unlimited) — see core/budget.py
+        # --------------------------------------------------------------
+        self.budget_max_tokens = None
+        self.budget_max_calls = None
+        self.budget_max_wall_s = None
+
         # --------------------------------------------------------------
         # Global / scoreboard defaults
         # --------------------------------------------------------------
@@ -96,6 +103,13 @@ class GameConfig:
         self.cycle_full_context_cycles = 2
         self.cycle_buffer_amount = 0.4
         # --------------------------------------------------------------
+        # Round compression (any round): summarise the older part of the
+        # current round in the background once agents' view of it passes
+        # the threshold. None turns it off.
+        # --------------------------------------------------------------
+        self.round_compression_threshold_tokens = 4000
+        self.round_compression_keep_recent_tokens = 1000
+        # --------------------------------------------------------------
         # Gang up games
         # --------------------------------------------------------------
         self.use_double_shots = False
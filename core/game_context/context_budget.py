@@ -0,0 +1,79 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+# Lower ceilings for models that lose the thread in long contexts; the level's own ceiling applies otherwise.
+MODEL_MAX_CONTEXT_TOKENS: dict[str, int] = {}
+
+CUT_MARKER = "\n[... earlier messages in this round cut for length ...]"
+
+
+@dataclass(frozen=True)
+class ContextBudget:
+    """
+    A token ceiling for a player's user content. The dashboard and turn
+    instruction always go in; the rest is filled in priority order: the
+    current round, then the phase's earlier rounds (newest first, older
+    ones swapped for the host's round summary), then phase summaries
+    (detailed, then all brief, then dropping the oldest). reserve keeps a
+    share of the ceiling for each lower-priority section, so a long current
+    round can't crowd out memory altogether.
+    """
+
+    max_tokens: int
+    model_max_tokens: dict[str, int] = field(default_factory=lambda: dict(MODEL_MAX_CONTEXT_TOKENS))
+    reserve: dict[str, float] = field(default_factory=lambda: {"previous_rounds": 0.2, "phase_summaries": 0.15})
+
+    def tokens_for(self, model: str | None) -> int:
+        return min(self.max_tokens, self.model_max_tokens.get(model, self.max_tokens))
+
+
+def fit_sections(limit: int, used: int, current: str, previous: list[tuple[str, str | None]],
+                 summaries: list[list[str]], reserve: dict[str, float]) -> tuple[str, list[str], list[str]]:
+    """
+    Fit the budgeted sections into limit - used characters.
+
+    previous: (full text, substitute or None) per earlier round, oldest first.
+    summaries: phase summary blocks (oldest first) at each level of detail, richest first.
+    Returns the current round, the earlier rounds and the phase summary blocks to use.
+    """
+    remaining = max(0, limit - used)
+    full_previous = sum(len(text) for text, _ in previous)
+    keep_previous = min(int(reserve.get("previous_rounds", 0) * limit), full_previous)
+    leanest = summaries[-1] if summaries else []
+    keep_summaries = min(int(reserve.get("phase_summaries", 0) * limit), sum(len(b) for b in leanest))
+
+    # The current round: as much of its tail as fits.
+    current = _tail(current, max(0, remaining - keep_previous - keep_summaries))
+    remaining -= len(current)
+
+    # Earlier rounds, newest first; those that don't fit whole fall back to their summary, or drop out.
+    allowance = remaining - keep_summaries
+    rounds = []
+    for text, substitute in reversed(previous):
+        for candidate in (text, substitute):
+            if candidate is not None and len(candidate) <= allowance:
+                rounds.append(candidate)
+                allowance -= len(candidate)
+                break
+    rounds.reverse()
+    remaining -= sum(len(r) for r in rounds)
+
+    # Phase summaries: the richest level that fits, else the leanest with its oldest phases dropped.
+    for blocks in summaries:
+        if sum(len(b) for b in blocks) <= remaining:
+            return current, rounds, blocks
+    blocks = list(leanest)
+    while blocks and sum(len(b) for b in blocks) > remaining:
+        blocks.pop(0)
+    return current, rounds, blocks
+
+
+def _tail(text: str, allowance: int) -> str:
+    if len(text) <= allowance:
+        return text
+    if allowance <= len(CUT_MARKER):
+        return ""
+    cut = len(text) - (allowance - len(CUT_MARKER))
+    newline = text.find("\n", cut)
+    return CUT_MARKER + (text[newline:] if newline != -1 else "")
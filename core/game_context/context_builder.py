@@ -1,6 +1,8 @@
 from typing import TYPE_CHECKING
 from core.game_context.dashboard import Dashboard
-from core.models import RoundEntry
+from core.game_context.round_render_cache import RoundRenderCache
+from core.game_context.system_prompt import STABLE_FIRST
+from core.models import MessageEntry, RoundEntry
 
 if TYPE_CHECKING:
     from core.gameboard import GameBoard
@@ -16,25 +18,21 @@ class ContextBuilder:
         self.game_log = game_log
         self.min_rounds_for_context = 0 #for 2.5, they can't handle the excessive context.
         #some settings can probably move here
+        # Each round is rendered once per viewer and extended as messages arrive; None renders from scratch.
+        self.render_cache = RoundRenderCache(self._formatted_entry)
 
     def current_round_formatted(self, agent: 'BaseAgent', anchor = None, other_player_message_found = False):
         current_round = self.game_log.current_round
 
-        if self.game_log._current_round_summarisation:
-            round_to_format = self._round_after_id(current_round,
-                            self.game_log._current_round_summarisation_until)
-            return self.game_log._current_round_summarisation + self._formatted_round(round_to_format, agent, anchor, other_player_message_found)
+        # One read: a background compressor may swap in a new cut-over at any point.
+        cut = self.game_log.current_round_cut()
+        if cut is not None:
+            return cut.summary + self._formatted_round(
+                current_round, agent, anchor, other_player_message_found, after_id=cut.until)
         else:
             return self._formatted_round(self.game_log.current_round, agent, anchor, other_player_message_found)
         
 
-    def _round_after_id(self, round, message_id):
-        round_messages = []
-        for message in round.messageEntries:
-            if message.id > message_id:
-                round_messages.append(message)
-        return RoundEntry(phase_number=round.phase_number, round_number=round.round_number, messageEntries=round_messages)
-
     def _previous_round_entries_for_context(self):
         rounds = self.game_log.completed_phase_rounds(self.game_board.phase_number)
         if len(rounds) < self.min_rounds_for_context:
@@ -43,13 +41,26 @@ class ContextBuilder:
         return rounds
         
     def previous_rounds_formatted(self, agent: 'BaseAgent', anchor, other_player_message_found):
-        rounds = self._previous_round_entries_for_context()
-        if len(rounds) == 0:
+        blocks = self.previous_round_blocks(agent, anchor, other_player_message_found)
+        return self.past_rounds_string([text for text, _ in blocks])
+
+    def previous_round_blocks(self, agent: 'BaseAgent', anchor, other_player_message_found):
+        """(full text, summary stand-in or None) for each earlier round in context, oldest first."""
+        return [(self._formatted_round(r, agent, anchor, other_player_message_found), self._summarised_round(r))
+                for r in self._previous_round_entries_for_context()]
+
+    def past_rounds_string(self, round_texts):
+        if not round_texts:
             return ""
-        else:
-            rounds_string = f"=== PAST {len(rounds)} ROUNDS  ===\n"
-            rounds_string += "\n\n".join(self._formatted_round(r, agent, anchor, other_player_message_found) for r in rounds)
-        return rounds_string
+        if self.game_board.prompt_layout == STABLE_FIRST:
+            # A count in the header would change every round, and everything after it with it.
+            return "=== PAST ROUNDS ===\n" + "\n\n".join(round_texts)
+        return f"=== PAST {len(round_texts)} ROUNDS  ===\n" + "\n\n".join(round_texts)
+
+    def _summarised_round(self, round: 'RoundEntry'):
+        if not round.summary:
+            return None
+        return f"\n{self._round_header(round)} (summary)\n{round.summary}"
     
     def phase_rounds_string(self, agent: 'BaseAgent'):  # Used to make a phase to summarise
         return self._formatted_phase(self.game_board.phase_number, agent)
@@ -74,12 +85,16 @@ class ContextBuilder:
     def _recency_anchor(self, agent):
         if agent.name in self.game_board.RESERVED_NAMES:
             return None, False
-        if self.game_log._current_round_summarisation:
-            rounds = [self._round_after_id(self.game_log.current_round,
-                                           self.game_log._current_round_summarisation_until)]
-        else:
-            rounds = [self.game_log.current_round] + self._previous_round_entries_for_context()
-            
+        phase_rounds = self.game_log.completed_phase_rounds(self.game_board.phase_number)
+        if self.game_log._current_round_summarisation or len(phase_rounds) >= self.min_rounds_for_context:
+            # GameLog keeps anchors up to date as messages arrive, over exactly this context.
+            return self.game_log.recency_anchor(agent.name)
+        return self._scan_recency_anchor(agent)
+
+    def _scan_recency_anchor(self, agent):
+        # Only when min_rounds_for_context reaches back past the current phase. Newest round first.
+        rounds = [self.game_log.current_round] + self._previous_round_entries_for_context()[::-1]
+
         other_player_message_found = False
         
         for round in rounds:
@@ -96,39 +111,48 @@ class ContextBuilder:
                     
         return None, False  
     
-    def _formatted_round(self, round: 'RoundEntry', agent: 'BaseAgent', anchor = None, other_player_message_found = False):
-
+    def _formatted_round(self, round: 'RoundEntry', agent: 'BaseAgent', anchor = None, other_player_message_found = False,
+                         after_id = None):
+        # after_id: only the entries after that message (the part of the round not yet summarised)
         output = f"\n{self._round_header(round)}\n"
-        if len(round.messageEntries) == 0:
-            return output + "No messages yet for round."
 
         if other_player_message_found:
             anchor_message = "\n===[This was your last message — react to what's happened since. Don't repeat above message. ]==="
         else:
             anchor_message = "\n===[ This was your last message — it's already been said. Your turn now is a fresh action, not a reaction. Don't repeat or recap the above; respond only to what the host has just asked. ]==="
-            
-        for entry in round.messageEntries:
-            if entry.visibility_restriction is None:
-                for message in entry.messages:
-                    
-                    output += (f"\n{message['speaker']}: {message['message']}")
-                    if message is anchor:
-                        #TODO - this check should be more solid
-                        output += anchor_message
-                    
-            else:
-                if agent.name in entry.visibility_restriction:
-                    if self.game_board.SYS_ADMIN in entry.visibility_restriction:
-                        #We dont need the tags for a sys_admin message
-                        for message in entry.messages:
-                            output += f"\n [Private System Message] {message['message']} [End Private Message]"
-                    else:
-                        names = ", ".join(entry.visibility_restriction)
-                        output += f"\n=== Private Conversation between {names} ===\n"
-                        for message in entry.messages:
-                            output += (f"\n{message['speaker']}: {message['message']}")
-                        if entry.closed:
-                            output += f"\n=== END OF Private Conversation between {names} ===\n"
+
+        if self.render_cache is not None:
+            body = self.render_cache.render(round, agent.name, anchor, anchor_message, after_id)
+        else:
+            entries = [e for e in round.messageEntries if after_id is None or e.id > after_id]
+            body = "".join(self._formatted_entry(e, agent.name, anchor, anchor_message) for e in entries) if entries else None
+        if body is None:
+            return output + "No messages yet for round."
+        return output + body
+
+    def _formatted_entry(self, entry: 'MessageEntry', viewer: str, anchor = None, anchor_message = ""):
+        output = ""
+        if entry.visibility_restriction is None:
+            for message in entry.messages:
+
+                output += (f"\n{message['speaker']}: {message['message']}")
+                if message is anchor:
+                    #TODO - this check should be more solid
+                    output += anchor_message
+
+        else:
+            if viewer in entry.visibility_restriction:
+                if self.game_board.SYS_ADMIN in entry.visibility_restriction:
+                    #We dont need the tags for a sys_admin message
+                    for message in entry.messages:
+                        output += f"\n [Private System Message] {message['message']} [End Private Message]"
+                else:
+                    names = ", ".join(entry.visibility_restriction)
+                    output += f"\n=== Private Conversation between {names} ===\n"
+                    for message in entry.messages:
+                        output += (f"\n{message['speaker']}: {message['message']}")
+                    if entry.closed:
+                        output += f"\n=== END OF Private Conversation between {names} ===\n"
         return output
 
     def get_dashboard_string(self, agent: 'BaseAgent') -> str:
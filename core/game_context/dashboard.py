@@ -1,3 +1,6 @@
+from core.game_context.render_memo import dashboard_memo
+
+
 class Dashboard:
     
     @classmethod 
@@ -44,6 +47,14 @@ class Dashboard:
     
     @classmethod
     def render(cls, agent, game_board) -> str:
+        if getattr(agent, "state_version", None) is None:
+            return cls._render(agent, game_board)
+        # Evictions go through remove_agent_state, so scores_version covers the evicted list too.
+        key = (id(game_board), game_board.scores_version, game_board.phase_version, agent.name, agent.game_over)
+        return dashboard_memo.get(agent, key, lambda: cls._render(agent, game_board))
+
+    @classmethod
+    def _render(cls, agent, game_board) -> str:
         agent_name = agent.name
         game_over = agent.game_over
         agent_scores = dict(game_board.agent_scores)
@@ -1,47 +1,144 @@
+import threading
+from bisect import bisect_right
 from collections import deque
+from heapq import merge
 from core.models import MessageEntry, RoundEntry
 
 
 SYS_ADMIN = "SYS_ADMIN"
 
 
-class GameLog:
+class _Anchors:
+    """
+    Each speaker's latest message in transcript order — entry order, then
+    order within the entry, so a late reply in an early conversation sits
+    where the conversation does — and the position of the latest message by
+    any player. Together they answer "what did this agent last say, and has
+    anyone spoken since" without walking the transcript.
+    """
+
     def __init__(self):
+        self.last: dict[str, tuple[tuple[int, int], dict, bool]] = {}  # speaker -> (position, message, private)
+        self.latest_player = (0, -1)
+
+    def add(self, position: tuple[int, int], message: dict, private: bool, is_player: bool) -> None:
+        speaker = message["speaker"]
+        current = self.last.get(speaker)
+        if current is None or position > current[0]:
+            self.last[speaker] = (position, message, private)
+        if is_player and position > self.latest_player:
+            self.latest_player = position
+
+    def anchor(self, name: str) -> tuple[dict | None, bool]:
+        last = self.last.get(name)
+        if last is None:
+            return None, False
+        position, message, private = last
+        if private:
+            # In a private conversation the anchor isn't relevant.
+            return None, False
+        return message, self.latest_player > position
+
+
+class _Cut:
+    """
+    A summarisation cut-over: the summary standing in for the current round
+    up to and including entry `until`, and the recency anchors over what
+    follows. Replaced whole, never edited, so a reader on another thread
+    sees either the old cut or the new one.
+    """
+
+    __slots__ = ("summary", "until", "anchors")
+
+    def __init__(self, summary: str, until: int, anchors: _Anchors):
+        self.summary = summary
+        self.until = until
+        self.anchors = anchors
+
+
+class GameLog:
+    def __init__(self, reserved_names=frozenset({SYS_ADMIN})):
         self.message_id = 0
         self.current_round: RoundEntry = None
         self.completed_round_entries: list[RoundEntry] = []
-        self._current_round_summarisation: str = ""
-        self._current_round_summarisation_until: int = None
+        self._cut: _Cut | None = None
+        # Parallel conversations append from their own threads; appends and cut-overs take it, so a
+        # message lands either before a cut's anchors are built or after the cut is published.
+        self._lock = threading.Lock()
+        # Speakers that aren't players (host, system) — for the most-recent-player-entry index.
+        self.reserved_names = frozenset(reserved_names)
+
+        # Secondary indexes, kept up to date as entries are appended so the read paths don't scan.
+        self._rounds_by_phase: dict[int, list[RoundEntry]] = {}
+        # Current round only; start_round resets them.
+        self._entries_by_id: dict[int, MessageEntry] = {}
+        self._last_public_entry: MessageEntry | None = None
+        self._player_entries: list[MessageEntry] = []   # entries opened by a player, newest last
+        self._public_ids: list[int] = []
+        self._private_ids: dict[str, list[int]] = {}    # participant -> ids of the private entries they're in
+        # Recency anchors over the phase so far (those over what follows a cut-over live on the _Cut).
+        self._phase_anchors = _Anchors()
+        # Summarises long rounds in the background (core/game_context/round_compressor.py); None leaves them whole.
+        self.compressor = None
 
     def most_recent_message_id(self) -> int:
         return self.message_id
 
+    @property
+    def _current_round_summarisation(self) -> str:
+        return self._cut.summary if self._cut is not None else ""
+
+    @property
+    def _current_round_summarisation_until(self) -> int | None:
+        return self._cut.until if self._cut is not None else None
+
+    def current_round_cut(self) -> _Cut | None:
+        """The current round's summarisation cut-over, if any — read it once and use its fields together."""
+        return self._cut
+
     def push_current_round_summarisation(self, summary: str, last_message_id: int):
-        self._current_round_summarisation = summary
-        self._current_round_summarisation_until = last_message_id
+        if not summary:
+            self._cut = None
+            return
+        # From here on context shows only what follows the cut, so anchors start over from it.
+        with self._lock:
+            anchors = _Anchors()
+            for entry in self.current_round.messageEntries[self._index_after(last_message_id):]:
+                for i, message in enumerate(entry.messages):
+                    self._add_anchor(anchors, entry, i, message)
+            self._cut = _Cut(summary, last_message_id, anchors)
 
     def _is_sys_admin_message(self, message: MessageEntry) -> bool:
         return bool(message.visibility_restriction and SYS_ADMIN in message.visibility_restriction)
 
+    def _index_after(self, message_id: int) -> int:
+        # Entry ids only ever increase, so the entries after an id are a suffix of the round.
+        return bisect_right(self.current_round.messageEntries, message_id, key=lambda e: e.id)
+
     def messages_since(self, message_id: int) -> list[MessageEntry]:
-        return [m for m in self.current_round.messageEntries if m.id > message_id and not self._is_sys_admin_message(m)]
+        entries = self.current_round.messageEntries
+        return [m for m in entries[self._index_after(message_id):] if not self._is_sys_admin_message(m)]
 
     def _current_round_messages_up_to(self, message_id: int) -> list[MessageEntry]:
-                return [m for m in self.current_round.messageEntries if m.id <= message_id and not self._is_sys_admin_message(m)]
-
-    def _current_round_most_recent_player_entry(self, reserved_names):
+        entries = self.current_round.messageEntries
+        return [m for m in entries[:self._index_after(message_id)] if not self._is_sys_admin_message(m)]
+
+    def _current_round_most_recent_player_entry(self, reserved_names=None):
+        if reserved_names is not None and frozenset(reserved_names) != self.reserved_names:
+            return self._scan_most_recent_player_entry(reserved_names)
+        # A conversation that has grown past its opening message no longer counts, and never will again.
+        while self._player_entries and len(self._player_entries[-1].messages) != 1:
+            self._player_entries.pop()
+        return self._player_entries[-1] if self._player_entries else None
+
+    def _scan_most_recent_player_entry(self, reserved_names):
         for entry in reversed(self.current_round.messageEntries):
             if len(entry.messages) == 1 and entry.messages[0]['speaker'] not in reserved_names:
                 return entry
         return None
 
-
     def _current_round_most_recent_message_entry(self):
-        entries = [
-            entry for entry in self.current_round.messageEntries 
-            if entry.visibility_restriction is None
-        ] # we dont care about pvt messages
-        return entries[-1] if entries else None
+        return self._last_public_entry  # we dont care about pvt messages
 
     def _is_host_message(self, message_entry, host_name: str) -> bool:
         if not message_entry.messages or len(message_entry.messages) != 1:
@@ -49,25 +146,87 @@ class GameLog:
         return message_entry.messages[0]['speaker'] == host_name
 
     def _get_conversation_entry(self, conversation_id) -> MessageEntry | None:
-        return next((e for e in self.current_round.messageEntries if e.id == conversation_id), None)
+        return self._entries_by_id.get(conversation_id)
+
+    def visible_entries(self, agent_name: str, after_id: int = 0) -> list[MessageEntry]:
+        """Current-round entries agent_name can see (public, or private with them in it), oldest first."""
+        public = self._public_ids[bisect_right(self._public_ids, after_id):]
+        private = self._private_ids.get(agent_name, [])
+        private = private[bisect_right(private, after_id):]
+        return [self._entries_by_id[i] for i in merge(public, private)]
+
+    def recency_anchor(self, agent_name: str) -> tuple[dict | None, bool]:
+        """
+        agent_name's latest public message in the context agents are shown
+        (the phase so far, or what follows a summarisation cut-over), and
+        whether another player has spoken since. (None, False) if they haven't
+        spoken, or last spoke in a private conversation.
+        """
+        cut = self._cut
+        anchors = cut.anchors if cut is not None else self._phase_anchors
+        return anchors.anchor(agent_name)
+
+    def _add_anchor(self, anchors: _Anchors, entry: MessageEntry, index: int, message: dict) -> None:
+        is_player = message["speaker"] not in self.reserved_names
+        anchors.add((entry.id, index), message, entry.visibility_restriction is not None, is_player)
+
+    def _append_to_conversation(self, entry: MessageEntry, player_name: str, message: str) -> None:
+        with self._lock:
+            entry.messages.append({"speaker": player_name, "message": message})
+            self._index_message(entry, len(entry.messages) - 1)
+        # Outside the lock: the compressor may push a cut-over, which takes it.
+        if self.compressor is not None:
+            self.compressor.on_append(self, entry, entry.messages[-1])
+
+    def _index_message(self, entry: MessageEntry, index: int) -> None:
+        message = entry.messages[index]
+        self._add_anchor(self._phase_anchors, entry, index, message)
+        cut = self._cut
+        if cut is not None and entry.id > cut.until:
+            self._add_anchor(cut.anchors, entry, index, message)
 
     def _update_history(self, player_name: str, message: str, visibility_restriction=None) -> int:
-        self.message_id += 1
-        entry = MessageEntry(
-            messages=[{"speaker": player_name, "message": message}],
-            id=self.message_id,
-            visibility_restriction=visibility_restriction
-        )
-        self.current_round.messageEntries.append(entry)
-        return self.message_id
+        with self._lock:
+            self.message_id += 1
+            entry = MessageEntry(
+                messages=[{"speaker": player_name, "message": message}],
+                id=self.message_id,
+                visibility_restriction=visibility_restriction
+            )
+            self.current_round.messageEntries.append(entry)
+            self._index(entry)
+        if self.compressor is not None:
+            self.compressor.on_append(self, entry, entry.messages[0])
+        return entry.id
+
+    def _index(self, entry: MessageEntry) -> None:
+        self._entries_by_id[entry.id] = entry
+        if entry.messages[0]['speaker'] not in self.reserved_names:
+            self._player_entries.append(entry)
+        if entry.visibility_restriction is None:
+            self._last_public_entry = entry
+            self._public_ids.append(entry.id)
+        else:
+            for name in entry.visibility_restriction:
+                self._private_ids.setdefault(name, []).append(entry.id)
+        self._index_message(entry, 0)
 
     def completed_phase_rounds(self, phase_number: int) -> list[RoundEntry]:
-        return [r for r in self.completed_round_entries if r.phase_number == phase_number]
+        # The index itself, not a copy — read it, don't change it.
+        return self._rounds_by_phase.get(phase_number, [])
 
     def start_round(self, phase_number: int, round_number: int):
-        self._current_round_summarisation = ""
-        self._current_round_summarisation_until = None
+        if self.current_round is not None and self.current_round.phase_number != phase_number:
+            # Context reaches back over the rounds of the current phase, so anchors only reset with it.
+            self._phase_anchors = _Anchors()
+        self._cut = None
         self.current_round = RoundEntry(phase_number=phase_number, round_number=round_number, messageEntries=[])
+        self._entries_by_id = {}
+        self._last_public_entry = None
+        self._player_entries = []
+        self._public_ids = []
+        self._private_ids = {}
 
     def close_round(self):
         self.completed_round_entries.append(self.current_round)
+        self._rounds_by_phase.setdefault(self.current_round.phase_number, []).append(self.current_round)
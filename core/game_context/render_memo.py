@@ -0,0 +1,50 @@
+import threading
+import weakref
+from typing import Callable
+
+
+class RenderMemo:
+    """
+    The last string rendered for each owner (an agent), reused while the
+    owner's key is unchanged. Keys are built from monotonically increasing
+    version counters — plus any cheap scalars the render also reads — so an
+    old entry can never match again; it's simply replaced on the next miss.
+    Owners are held weakly, so a finished game's agents drop out on their own.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._entries: "weakref.WeakKeyDictionary[object, tuple[tuple, str]]" = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, owner, key: tuple, build: Callable[[], str]) -> str:
+        with self._lock:
+            entry = self._entries.get(owner)
+            if entry is not None and entry[0] == key:
+                self.hits += 1
+                return entry[1]
+        text = build()
+        with self._lock:
+            self.misses += 1
+            self._entries[owner] = (key, text)
+        return text
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+# ── module-level singletons ──────────────────────────────────────────────────
+stable_prefix_memo = RenderMemo("stable_prefix")
+system_prompt_memo = RenderMemo("system_prompt")
+dashboard_memo = RenderMemo("dashboard")
+
+
+def render_memo_stats() -> dict:
+    return {memo.name: memo.stats() for memo in (stable_prefix_memo, system_prompt_memo, dashboard_memo)}
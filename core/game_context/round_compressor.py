@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Callable
+
+from core.call_context import TaggedThreadPoolExecutor
+from core.token_estimator import TokenEstimator
+
+if TYPE_CHECKING:
+    from core.game_context.game_log import GameLog
+    from core.models import MessageEntry, RoundEntry
+
+# Shared by every game's compressor; tagged, so each summary is booked to the game, round and budget
+# of the append that triggered it.
+_executor: TaggedThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def _background() -> TaggedThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = TaggedThreadPoolExecutor(max_workers=4, thread_name_prefix="round-compressor")
+        return _executor
+
+
+class RoundCompressor:
+    """
+    Keeps any round's transcript in check. Once the public part of the
+    current round after the last cut-over passes threshold_tokens — the
+    part every agent sees, and the part a summary can replace — the older
+    public entries — all but roughly the newest
+    keep_recent_tokens — are summarised on a background thread. The summary
+    is swapped in with GameLog.push_current_round_summarisation on the next
+    append once it's ready, so no agent ever waits on it; until then they
+    read the full transcript.
+
+    The cut never passes an open private conversation, which may still grow.
+    Private entries are left out of the summary (every agent is shown it),
+    so once the cut passes a closed conversation its participants no longer
+    see it in the current round — the same trade CycleRound's compression
+    makes. Rounds that push their own summarisation (CycleRound with
+    cycle_use_context_compression) are left to it.
+
+    summarise(context, game_text) -> summary, e.g. GameMaster.summarise_game_text.
+    """
+
+    def __init__(self, summarise: Callable[[str, str], str], threshold_tokens: int = 4000,
+                 keep_recent_tokens: int = 1000, chars_per_token: float = TokenEstimator.DEFAULT_CHARS_PER_TOKEN):
+        self._summarise = summarise
+        self.threshold_chars = int(threshold_tokens * chars_per_token)
+        self.keep_recent_chars = int(keep_recent_tokens * chars_per_token)
+        self._lock = threading.Lock()
+        self.compressions = 0
+        self.entries_summarised = 0
+        self.failures = 0
+        self._start(None)
+
+    def _start(self, round: RoundEntry | None) -> None:
+        self._round = round
+        self._summaries: list[str] = []
+        self._cut_id: int | None = None   # the cut this compressor last pushed
+        self._chars = 0                   # public characters after the cut
+        self._pending: tuple[Future, int, int] | None = None  # (summary, cut id, entries summarised)
+        self._stopped = False             # the round compresses itself, or summarising failed
+
+    def on_append(self, log: GameLog, entry: MessageEntry, message: dict) -> None:
+        """
+        Called by GameLog after each message is appended to the current round —
+        from parallel conversations' threads too, so the whole step holds the lock.
+        """
+        with self._lock:
+            if log.current_round is not self._round:
+                # A new round; a summary still in flight for the old one is dropped when it lands.
+                self._start(log.current_round)
+            if self._stopped:
+                return
+            cut = log.current_round_cut()
+            if (cut.until if cut is not None else None) != self._cut_id:
+                self._stopped = True
+                return
+            if entry.visibility_restriction is None:
+                self._chars += _message_chars(message)
+            if self._pending is not None:
+                if self._pending[0].done():
+                    self._apply(log)
+                return
+            if self._chars >= self.threshold_chars:
+                self._submit(log)
+
+    def _submit(self, log: GameLog) -> None:
+        entries = [e for e in log.current_round.messageEntries[log._index_after(self._cut_id or 0):]
+                   if not log._is_sys_admin_message(e)]
+        # Keep the newest keep_recent_chars of public text in full.
+        tail, end = 0, len(entries)
+        while end > 0 and tail < self.keep_recent_chars:
+            end -= 1
+            if entries[end].visibility_restriction is None:
+                tail += _entry_chars(entries[end])
+        segment = entries[:end]
+        still_open = next((i for i, e in enumerate(segment) if e.visibility_restriction and not e.closed), None)
+        if still_open is not None:
+            segment = segment[:still_open]
+        if not segment:
+            return
+        game_text = "\n".join(f"{m['speaker']}: {m['message']}"
+                              for e in segment if e.visibility_restriction is None for m in e.messages)
+        if not game_text:
+            return
+        context = "\n".join(self._summaries)
+        self._pending = (_background().submit(self._summarise, context, game_text), segment[-1].id, len(segment))
+
+    def _apply(self, log: GameLog) -> None:
+        future, until, count = self._pending
+        self._pending = None
+        try:
+            summary = future.result()
+        except Exception as e:
+            print(f"[round_compressor] summary failed ({e!r}) — leaving round {self._round.round_number} whole")
+            self._stopped = True
+            self.failures += 1
+            return
+        self._summaries.append(summary)
+        text = "".join(f"Summary of earlier messages, part {i + 1}: {s}\n" for i, s in enumerate(self._summaries))
+        log.push_current_round_summarisation(text, until)
+        self._cut_id = until
+        self._chars = sum(_entry_chars(e) for e in log.messages_since(until) if e.visibility_restriction is None)
+        self.compressions += 1
+        self.entries_summarised += count
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "compressions": self.compressions,
+                "entries_summarised": self.entries_summarised,
+                "failures": self.failures,
+            }
+
+
+def _message_chars(message: dict) -> int:
+    return len(message["speaker"]) + len(message["message"]) + 2
+
+
+def _entry_chars(entry: MessageEntry) -> int:
+    return sum(_message_chars(m) for m in entry.messages)
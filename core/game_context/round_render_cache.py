@@ -0,0 +1,107 @@
+import threading
+from bisect import bisect_right
+from itertools import accumulate
+from typing import Callable
+
+from core.models import MessageEntry, RoundEntry
+
+
+class _View:
+    """One viewer's rendering of one round: a piece per entry ("" where hidden), joined on demand."""
+
+    __slots__ = ("round", "parts", "anchors", "private", "text", "offsets", "dirty")
+
+    def __init__(self, round: RoundEntry):
+        self.round = round
+        self.parts: list[str] = []
+        self.anchors: dict[int, int] = {}                  # id(public message) -> entry index
+        self.private: dict[int, tuple[int, bool]] = {}     # entry index -> (messages, closed) when rendered
+        self.text = ""
+        self.offsets = [0]
+        self.dirty = False
+
+
+class RoundRenderCache:
+    """
+    Append-only transcript rendering per (round, viewer). Each entry is
+    rendered once for each viewer and kept; asking again only renders the
+    entries appended since, so a turn costs its new messages rather than the
+    whole phase. Private conversations are the one thing that changes after
+    it's appended (more messages, then closed), so those entries are checked
+    and re-rendered in place when they have.
+
+    The recency anchor is spliced into the cached text at render time rather
+    than cached, since it moves every time the viewer speaks.
+    """
+
+    def __init__(self, render_entry: Callable[..., str]):
+        # render_entry(entry, viewer, anchor=None, anchor_message="") -> str
+        self._render_entry = render_entry
+        self._views: dict[tuple[int, str], _View] = {}
+        self._phase = 0
+        self._lock = threading.Lock()
+        self.entries_rendered = 0
+        self.renders = 0
+
+    def render(self, round: RoundEntry, viewer: str, anchor: dict | None = None, anchor_message: str = "",
+               after_id: int | None = None) -> str | None:
+        """
+        The viewer's text for round's entries (those with id > after_id, if
+        given), without the round header. None when there are no entries.
+        """
+        entries = round.messageEntries
+        start = 0 if after_id is None else bisect_right(entries, after_id, key=lambda e: e.id)
+        if start >= len(entries):
+            return None
+        with self._lock:
+            self.renders += 1
+            view = self._view(round, viewer)
+            self._refresh(view, viewer)
+            text, offsets = view.text, view.offsets
+            i = view.anchors.get(id(anchor)) if anchor is not None else None
+        if i is None or i < start:
+            return text[offsets[start]:]
+        anchored = self._render_entry(entries[i], viewer, anchor, anchor_message)
+        return text[offsets[start]:offsets[i]] + anchored + text[offsets[i + 1]:]
+
+    def _view(self, round: RoundEntry, viewer: str) -> _View:
+        key = (id(round), viewer)
+        view = self._views.get(key)
+        if view is not None and view.round is round:
+            return view
+        if round.phase_number > self._phase:
+            # Context only ever reaches back to the current phase; let earlier phases go.
+            self._phase = round.phase_number
+            self._views = {k: v for k, v in self._views.items() if v.round.phase_number >= self._phase}
+        view = self._views[key] = _View(round)
+        return view
+
+    def _refresh(self, view: _View, viewer: str) -> None:
+        entries = view.round.messageEntries
+        for i, signature in view.private.items():
+            if _signature(entries[i]) != signature:
+                view.parts[i] = self._render(view, i, entries[i], viewer)
+                view.dirty = True
+        for i in range(len(view.parts), len(entries)):
+            view.parts.append(self._render(view, i, entries[i], viewer))
+            view.dirty = True
+        if view.dirty:
+            view.text = "".join(view.parts)
+            view.offsets = [0, *accumulate(len(p) for p in view.parts)]
+            view.dirty = False
+
+    def _render(self, view: _View, i: int, entry: MessageEntry, viewer: str) -> str:
+        self.entries_rendered += 1
+        if entry.visibility_restriction is None:
+            for message in entry.messages:
+                view.anchors[id(message)] = i
+        else:
+            view.private[i] = _signature(entry)
+        return self._render_entry(entry, viewer)
+
+    def stats(self) -> dict:
+        return {"renders": self.renders, "entries_rendered": self.entries_rendered, "views": len(self._views)}
+
+
+def _signature(entry: MessageEntry) -> tuple[int, bool]:
+    return len(entry.messages), entry.closed
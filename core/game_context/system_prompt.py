@@ -1,7 +1,29 @@
+from core.game_context.render_memo import stable_prefix_memo, system_prompt_memo
+
+# Prompt layouts. classic: strategy notes in the system prompt, the dashboard first in the user content.
+# stable_first: most stable to least — profile, phase summaries, rounds, strategy notes, dashboard, turn —
+# so consecutive prompts share the longest possible prefix for the provider's implicit caching.
+CLASSIC = "classic"
+STABLE_FIRST = "stable_first"
+PROMPT_LAYOUTS = (CLASSIC, STABLE_FIRST)
+
+
 class SystemPrompt:
     
     @classmethod
-    def render(cls, agent) -> str:
+    def render(cls, agent, layout=CLASSIC) -> str:
+        version = getattr(agent, "state_version", None)
+        if version is None:
+            return cls._render(agent, layout)
+        # The buffer, elimination and intro flag are set outside the turn fields, so they're keyed directly.
+        key = (version, layout, agent.name, agent.game_over, agent.initialising, agent.optional_response_buffer)
+        return system_prompt_memo.get(agent, key, lambda: cls._render(agent, layout))
+
+    @classmethod
+    def _render(cls, agent, layout) -> str:
+        if layout == STABLE_FIRST:
+            # The strategy notes move to the user content (see UserContent.render).
+            return cls.stable_prefix(agent) + cls._init_string(agent)
         return cls.player_system_prompt(agent)
         
     
@@ -13,18 +35,22 @@ class SystemPrompt:
         return output
     
     @classmethod
-    def player_system_prompt(cls, agent):
-        #TODO maybe this should be optional- hard to say
-        #I think we will make a new class - dashboard- that will have more flexibility
-        optional_response_buffer_string = cls._response_buffer_string(agent) #if gameBoard.optional_responses_in_use else ""
-        
+    def stable_prefix(cls, agent):
+        """Identity, profile and life lessons — the head of the prompt that rarely changes within a phase."""
+        version = getattr(agent, "profile_version", None)
+        if version is None:
+            return cls._stable_prefix(agent)
+        return stable_prefix_memo.get(agent, (version, agent.name), lambda: cls._stable_prefix(agent))
+
+    @classmethod
+    def _stable_prefix(cls, agent):
         # Format Life Lessons as a bulleted list (Clean Readability)
         if agent.life_lessons:
             lessons_str = "\n".join([f"- {lesson}" for lesson in agent.life_lessons])
         else:
             lessons_str = "- None yet. I am a blank slate."
 
-        output_string = (f"You are {agent.name}.\n\n"
+        return (f"You are {agent.name}.\n\n"
             
             f"=== YOUR PROFILE ===\n"
             f"Persona: {agent.persona}\n"
@@ -33,15 +59,27 @@ class SystemPrompt:
             f"=== LIFE LESSONS ===\n"
             f"Use these past learnings to guide your current behavior:\n"
             f"{lessons_str}\n\n")
-        
-        if not agent.game_over:
-            output_string += (
-            f"{optional_response_buffer_string}"
+
+    @classmethod
+    def player_system_prompt(cls, agent):
+        #TODO maybe this should be optional- hard to say
+        #I think we will make a new class - dashboard- that will have more flexibility
+        output_string = cls.stable_prefix(agent)
+        output_string += cls.strategy_block(agent)
+        output_string += cls._init_string(agent)
+        return output_string
+
+    @classmethod
+    def strategy_block(cls, agent):
+        """The response buffer and current strategy — rewritten most turns."""
+        if agent.game_over:
+            return ""
+        return (
+            f"{cls._response_buffer_string(agent)}"
             f"=== YOUR INTERNAL STRATEGY AND ASSESSMENT ===\n"
             f"Current Strategy: {agent.game_strategy}\n"
             f"Position Assessment: {agent.position_assessment}\n")
 
-        if agent.initialising:
-            output_string += f"\n{agent.system_prompt_init()}"
-
-        return output_string
+    @classmethod
+    def _init_string(cls, agent):
+        return f"\n{agent.system_prompt_init()}" if agent.initialising else ""
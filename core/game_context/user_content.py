@@ -1,3 +1,6 @@
+from core.api_client import api_client
+from core.game_context.context_budget import fit_sections
+from core.game_context.system_prompt import STABLE_FIRST, SystemPrompt
 from prompts.prompts import PromptLibrary
 
 
@@ -5,6 +8,8 @@ class UserContent:
     
     @classmethod
     def render(cls, agent, game_board, turn_instruction, game_history_override) -> str:
+        if game_board.prompt_layout == STABLE_FIRST:
+            return cls.render_stable_first(agent, game_board, turn_instruction, game_history_override)
         #TODO the game_history_override -- eventually will have different context objects that call different render methods
         dash = []
         dashboard = game_board.context_builder.get_dashboard_string(agent)
@@ -13,6 +18,9 @@ class UserContent:
       
         if game_history_override:
             dash.append(game_history_override)
+        elif game_board.context_budget is not None:
+            fixed = sum(len(d) for d in dash) + len(turn_instruction or "")
+            cls.append_budgeted_game_context(dash, agent, game_board, fixed)
         else:
             cls.append_game_context(dash, agent, game_board)
             
@@ -21,12 +29,43 @@ class UserContent:
             dash.append(f"({turn_instruction})")
             
         return "\n\n".join(dash)
-    
-    
-    
+
     @classmethod
-    def append_game_context(cls, dash, agent, game_board):
+    def render_stable_first(cls, agent, game_board, turn_instruction, game_history_override) -> str:
+        """
+        render with the sections ordered most stable first: the game context,
+        then the strategy notes, dashboard and turn — the parts that change
+        every turn — so each prompt shares as long a prefix as possible with
+        the agent's previous one.
+        """
+        dashboard = game_board.context_builder.get_dashboard_string(agent)
+        strategy = SystemPrompt.strategy_block(agent).strip()
+        tail = [s for s in (strategy, dashboard) if s]
+
+        dash = []
+        if game_history_override:
+            dash.append(game_history_override)
+        elif game_board.context_budget is not None:
+            fixed = sum(len(t) for t in tail) + len(turn_instruction or "")
+            cls.append_budgeted_game_context(dash, agent, game_board, fixed)
+        else:
+            cls.append_game_context(dash, agent, game_board)
+        dash.extend(tail)
+
+        dash.append("=== YOUR TURN ===")
+        if turn_instruction:
+            dash.append(f"({turn_instruction})")
+
+        return "\n\n".join(dash)
+
+    @classmethod
+    def phase_summaries_block(cls, agent) -> str:
         summaries = agent.phase_summaries_string()
+        return f"=== PHASE SUMMARIES ===\n\n{summaries}" if summaries else ""
+
+    @classmethod
+    def append_game_context(cls, dash, agent, game_board):
+        summaries = cls.phase_summaries_block(agent)
         cb = game_board.context_builder
         anchor, other_player_message_found = cb._recency_anchor(agent)
         
@@ -34,15 +73,41 @@ class UserContent:
         previous_rounds = cb.previous_rounds_formatted(agent, anchor, other_player_message_found)
         
         if summaries:
-            dash.append("=== PHASE SUMMARIES ===")
             dash.append(summaries)
         if previous_rounds:
             #header included in method
             dash.append(previous_rounds)
         dash.append("=== CURRENT ROUND ===")
         dash.append(current_round)
-        
-    
-        
-        
-    
\ No newline at end of file
+
+    @classmethod
+    def append_budgeted_game_context(cls, dash, agent, game_board, fixed_chars):
+        """
+        append_game_context under game_board.context_budget: the current round
+        first, then earlier rounds (or their summaries), then phase summaries
+        (see core/game_context/context_budget.py). When the summaries are cut
+        the cached prompt prefix no longer matches, and the call goes uncached.
+        """
+        cb = game_board.context_builder
+        budget = game_board.context_budget
+        anchor, other_player_message_found = cb._recency_anchor(agent)
+
+        current_round = cb.current_round_formatted(agent, anchor, other_player_message_found)
+        previous_rounds = cb.previous_round_blocks(agent, anchor, other_player_message_found)
+        # Richest first: the agent's usual mix of detailed and brief, then brief throughout.
+        summaries = [agent.phase_summary_blocks(), agent.phase_summary_blocks(detailed_count=0)]
+
+        # The budget is in tokens; sections are measured in characters at the model's calibrated ratio.
+        limit = int(budget.tokens_for(agent.model_name) * api_client.token_estimator.chars_per_token(agent.model_name))
+        headers = 100  # section headers and separators
+        current_round, previous_rounds, summary_blocks = fit_sections(
+            limit, fixed_chars + headers, current_round, previous_rounds, summaries, budget.reserve)
+
+        if summary_blocks:
+            dash.append(f"=== PHASE SUMMARIES ===\n\n{''.join(summary_blocks)}")
+        previous_rounds = cb.past_rounds_string(previous_rounds)
+        if previous_rounds:
+            #header included in method
+            dash.append(previous_rounds)
+        dash.append("=== CURRENT ROUND ===")
+        dash.append(current_round)
@@ -1,5 +1,8 @@
+from concurrent.futures import Future
 from typing import Union
 from agents.base_agent import BaseAgent
+from core.game_context.context_budget import ContextBudget
+from core.game_context.system_prompt import CLASSIC
 from core.game_context.context_builder import ContextBuilder
 from core.game_context.game_log import GameLog
 from core.models import RoundEntry
@@ -11,15 +14,22 @@ class GameBoard:
     SYSTEM = "SYSTEM"
     RESERVED_NAMES = {SYSTEM, SYS_ADMIN, HOST_NAME}
 
-    def __init__(self, game_sink):
+    def __init__(self, game_sink, context_budget: ContextBudget | None = None, prompt_layout: str = CLASSIC):
         self.game_sink = game_sink
-        self.game_log = GameLog()
+        # Ceiling on each player's user content; None sends the whole phase every turn.
+        self.context_budget = context_budget
+        # How player prompts are ordered — see core/game_context/system_prompt.py.
+        self.prompt_layout = prompt_layout
+        self.game_log = GameLog(self.RESERVED_NAMES)
 
         self.phase_number = 0
         self.round_number = 0
         self.turn_number = 0
 
         self.agent_scores: dict[str, int] = {}
+        # Bumped when scores/evictions change and when the phase cursor moves; the dashboard is memoised on them.
+        self.scores_version = 0
+        self.phase_version = 0
         self.context_builder = ContextBuilder(game_board=self, game_log=self.game_log)
 
         self.phase_runner = None
@@ -50,7 +60,7 @@ class GameBoard:
     def log_message_to_conversation(self, conversation_id, player_name: str, message: str):
         entry = self._get_conversation_entry(conversation_id)
         if entry:
-            entry.messages.append({"speaker": player_name, "message": message})
+            self.game_log._append_to_conversation(entry, player_name, message)
             if self._human_in_restriction(entry.visibility_restriction):
                 #TODO
                 #if a human involved - we need to print it! normal - do we need a header?
@@ -85,13 +95,30 @@ class GameBoard:
         self.game_sink.on_turn_header(self.turn_number)
 
     def endRound(self, round_summary):
-        self.game_sink.on_round_summary(round_summary.round_summary)
+        """Close the round. round_summary may be a Future still being written: the round gets it when it lands."""
+        round = self.game_log.current_round
         self.game_log.close_round()
+        if isinstance(round_summary, Future):
+            round_summary.add_done_callback(lambda future: self._round_summary_ready(round, future))
+        else:
+            self._record_round_summary(round, round_summary)
+
+    def _round_summary_ready(self, round: RoundEntry, future: Future):
+        # On the summariser's thread, or here if it was already done.
+        if future.exception() is not None:
+            self.game_sink.on_warning(f"Round {round.round_number} summary failed: {future.exception()!r}")
+            return
+        self._record_round_summary(round, future.result())
+
+    def _record_round_summary(self, round: RoundEntry, round_summary):
+        round.summary = round_summary.round_summary
+        self.game_sink.on_round_summary(round.round_number, round_summary.round_summary)
 
     def newRound(self):
         #self.system_broadcast(self.score_string(), private = False) Probably a good idea for agents to read
         self.round_number += 1
         self.turn_number = 0
+        self.phase_version += 1
         self.game_log.start_round(self.phase_number, self.round_number)
         self.game_sink.on_round_start(self.round_number, self.score_string())
 
@@ -100,6 +127,7 @@ class GameBoard:
 
     def new_phase(self):
         self.phase_number += 1
+        self.phase_version += 1
         self.game_sink.on_phase_header(self.phase_number)
 
     #--------- public output --------- #
@@ -183,6 +211,7 @@ class GameBoard:
 
     def remove_agent_state(self, agent_name: str):
         self.agent_scores.pop(agent_name, None)
+        self.scores_version += 1
         self.game_sink.on_points_update(self.agent_scores)
         self.game_sink.on_evictions_update(self.phase_runner.removed_agent_names())
 
@@ -206,6 +235,7 @@ class GameBoard:
 
     def add_agent_state(self, agent_name: str):
         self.agent_scores[agent_name] = 0
+        self.scores_version += 1
 
     def append_agent_points(self, agent_name, points):
         #NOTE - this should always come AFTER a player broadcast
@@ -213,6 +243,7 @@ class GameBoard:
         #finishes animating on web.
         new_score = max(0, self.agent_scores[agent_name] + points)
         self.agent_scores[agent_name] = new_score
+        self.scores_version += 1
         self.game_sink.on_points_update(dict(self.agent_scores))
 
     def score_string(self) -> str:
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Type, TYPE_CHECKING
+from typing import Optional, Type, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from core.levels.phase_recipe_factory import PhaseRecipeFactory
@@ -15,3 +15,5 @@ class LevelDefinition:
     max_players: int
     phase_recipe_factory: Type[PhaseRecipeFactory]
     locked: bool = True
+    thinking_policy: Optional[str] = None  # a name in core.thinking_policy.POLICIES; None sends no thinking policy
+    context_budget_tokens: int | None = None  # ceiling on each player's user content; None for no ceiling
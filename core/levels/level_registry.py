@@ -15,7 +15,9 @@ AVAILABLE_LEVELS: List[LevelDefinition] = [
         min_players=6,
         max_players=6,
         phase_recipe_factory=PhaseRecipeFactoryBeginner,
-        locked=False
+        locked=False,
+        thinking_policy="lean",
+        context_budget_tokens=8_000,
     ),
     LevelDefinition(
         id="standard",
@@ -24,7 +26,9 @@ AVAILABLE_LEVELS: List[LevelDefinition] = [
         min_players=5,
         max_players=8,
         phase_recipe_factory=PhaseRecipeFactoryBeginner,
-        locked=False
+        locked=False,
+        thinking_policy="standard",
+        context_budget_tokens=12_000,
     ),
     LevelDefinition(
         id="intermediate",
@@ -33,7 +37,9 @@ AVAILABLE_LEVELS: List[LevelDefinition] = [
         min_players=6,
         max_players=8,
         phase_recipe_factory=PhaseRecipeFactoryBeginner,
-        locked=True
+        locked=True,
+        thinking_policy="deep",
+        context_budget_tokens=16_000,
     ),
 ]
 
@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import atexit
+import json
+import queue
+import threading
+
+
+class LogWriter:
+    """
+    Single background thread that appends JSONL entries for every log file in
+    the process. Callers hand over a dict and return immediately; the writer
+    serialises and flushes in batches, one open() per file per batch.
+
+    The queue is bounded — if the disk falls that far behind, entries are
+    dropped (and counted) rather than stalling a game thread.
+    """
+
+    def __init__(self, max_queue: int = 10_000, batch_size: int = 256, flush_interval: float = 0.5):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+
+    def write(self, path: str | None, entry: dict) -> bool:
+        """Queue one JSONL entry for path. Returns False if it was dropped."""
+        if path is None or self._closed:
+            return False
+        self._ensure_thread()
+        try:
+            self._queue.put_nowait((path, entry))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self) -> None:
+        """Block until everything queued so far is on disk."""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        self.flush()
+        self._closed = True
+
+    def stats(self) -> dict:
+        return {
+            "written": self.written,
+            "dropped": self.dropped,
+            "batches": self.batches,
+            "queued": self._queue.qsize(),
+        }
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            try:
+                batch = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._flush_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _flush_batch(self, batch: list[tuple[str, dict]]) -> None:
+        by_path: dict[str, list[str]] = {}
+        for path, entry in batch:
+            by_path.setdefault(path, []).append(json.dumps(entry, ensure_ascii=False) + "\n")
+        for path, lines in by_path.items():
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.writelines(lines)
+                self.written += len(lines)
+            except OSError as e:
+                self.dropped += len(lines)
+                print(f"[log_writer] failed to write {path}: {e}")
+        self.batches += 1
+
+
+# ── module-level singleton ───────────────────────────────────────────────────
+log_writer = LogWriter()
+atexit.register(log_writer.close)
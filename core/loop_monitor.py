@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+from core.call_stats import StreamingHistogram
+
+
+class LoopLagMonitor:
+    """
+    Measures how late an event loop wakes up: it sleeps interval_s over and
+    over and records the overshoot. Anything that blocks the loop — a
+    synchronous API call inside an async handler, say — shows up here as
+    lag, and every WebSocket on that loop waits just as long.
+    """
+
+    def __init__(self, interval_s: float = 0.1):
+        self.interval_s = interval_s
+        self.lag_ms = StreamingHistogram()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            before = time.monotonic()
+            await asyncio.sleep(self.interval_s)
+            self.lag_ms.add(max(0.0, (time.monotonic() - before - self.interval_s) * 1000))
+
+    def stats(self) -> dict:
+        return {**self.lag_ms.percentiles(), "max": round(self.lag_ms.max), "samples": self.lag_ms.count}
@@ -13,3 +13,4 @@ class RoundEntry:
     phase_number: int
     round_number: int
     messageEntries: list[MessageEntry]
+    summary: str | None = None  # the host's summary, once the round has been summarised
@@ -1,6 +1,8 @@
-from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING
 
+from core.api_client import api_client
+from core.call_context import TaggedThreadPoolExecutor, call_tags
+
 from gameplay_management.immunities.immunity_mechanicsMixin import ImmunityMechanicsMixin
 
 
@@ -37,7 +39,8 @@ class PhaseRunner:
         immune_players = []
         if immunity_types:
             for immunity_type in immunity_types:
-                result = immunity_type(self.game_board, self.simulation_engine).run_immunity()
+                with call_tags(round=immunity_type.__name__):
+                    result = immunity_type(self.game_board, self.simulation_engine).run_immunity()
                 immune_players.extend(result)
         immune_players = list(dict.fromkeys(immune_players)) #remove any dupes
         round_class(self.game_board, self.simulation_engine).run_vote(immunity_players=immune_players)
@@ -62,6 +65,10 @@ class PhaseRunner:
         self.game_board.game_sink.on_game_intro(host_intro)
         
     def run_round(self, round, immunity_types):
+        with call_tags(phase=self.game_board.phase_number, round=round.__name__):
+            self._run_round(round, immunity_types)
+
+    def _run_round(self, round, immunity_types):
         self.current_round_index += 1
         self.game_board.newRound()
         self.game_board.game_sink.on_phase_round_index(self.current_round_index - 1)
@@ -76,7 +83,9 @@ class PhaseRunner:
             round(self.game_board, self.simulation_engine).run_game()
         
         #self.game_board.system_broadcast(self.game_board.agent_scores)
-        round_summary = self.simulation_engine.game_master.summariseRound(self.game_board)
+        # Written in the background while the next round starts; the host waits for it only when it next reads
+        # round_summaries, and the sink hears it when it lands.
+        round_summary = self.simulation_engine.game_master.summariseRound(self.game_board, wait=False)
         
         self.game_board.endRound(round_summary)
 
@@ -97,7 +106,9 @@ class PhaseRunner:
         
         agents = self.simulation_engine.agents + self.simulation_engine.dead_agents
         
-        with ThreadPoolExecutor(max_workers=min(32, len(agents))) as executor:
+        # Nobody watches summaries being written — send them as one batch job where a batch service is set up.
+        with call_tags(phase=self.game_board.phase_number, round="PhaseSummary"), api_client.batch(), \
+                TaggedThreadPoolExecutor(max_workers=min(32, len(agents))) as executor:
             for agent in agents:
                 executor.submit(agent.summarise_phase, self.game_board)
                 
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import time
+from dataclasses import dataclass
+
+import google.genai.types as types
+
+
+@dataclass(frozen=True)
+class PromptPrefix:
+    """
+    The part of an agent's prompt that holds still for a whole phase: the
+    profile/life-lessons head of the system prompt, and the phase summaries
+    block of the user content. key says whose prefix it is (game/agent); a
+    new phase changes the fingerprint, not the key, so it replaces the handle.
+    """
+    key: str
+    system: str
+    context: str
+
+    @property
+    def fingerprint(self) -> str:
+        return hashlib.sha256(f"{self.system}\x00{self.context}".encode("utf-8")).hexdigest()
+
+    def remainder(self, system_content: str, user_content: str) -> str | None:
+        """
+        What's left to send once the prefix is cached, or None if the prompt doesn't start with it.
+
+        The cached content is the system head followed by the context block, so
+        the model reads the context ahead of the rest of the system prompt. Only
+        the stable_first layout builds prefixes (see Debater._prompt_prefix): its
+        user content opens with the context block and its system prompt is the
+        head alone, bar the brief note on initialising turns, which moves behind it.
+        """
+        if not system_content.startswith(self.system) or self.context not in user_content:
+            return None
+        dynamic_system = system_content[len(self.system):].strip()
+        user = user_content.replace(self.context, "", 1).strip()
+        return f"{dynamic_system}\n\n{user}" if dynamic_system else user
+
+
+@dataclass
+class _Entry:
+    fingerprint: str
+    name: str | None  # None when the prefix is too short, or creating it failed
+    expires: float
+
+
+class PromptCacheManager:
+    """
+    Keeps one provider-side cached-content handle per (model, prefix key) and
+    recreates it when the fingerprint changes — a new persona, new life
+    lessons or another phase summary. Prefixes under min_tokens aren't worth
+    caching (the API refuses them anyway) and go out as plain prompts.
+
+    Works against anything shaped like client.aio.caches: the real SDK or
+    the synthetic backend's local stand-in.
+    """
+
+    def __init__(self, min_tokens: int = 1024, ttl_s: int = 900):
+        self.min_tokens = min_tokens
+        self.ttl_s = ttl_s
+        self.created = 0
+        self.reused = 0
+        self.skipped = 0
+        self.failed = 0
+        self._entries: dict[tuple[str, str], _Entry] = {}
+        self._locks: dict[tuple[str, str], asyncio.Lock] = {}
+
+    async def handle(self, client, api_model: str, prefix: PromptPrefix) -> str | None:
+        key = (api_model, prefix.key)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry is not None and entry.fingerprint == prefix.fingerprint and entry.expires > now:
+                if entry.name is not None:
+                    self.reused += 1
+                return entry.name
+
+            if entry is not None and entry.name is not None:
+                await self._delete(client, entry.name)
+
+            name = None
+            if (len(prefix.system) + len(prefix.context)) // 4 < self.min_tokens:
+                self.skipped += 1
+            else:
+                name = await self._create(client, api_model, prefix)
+            # Keep a little margin so a handle never expires mid-request.
+            self._entries[key] = _Entry(prefix.fingerprint, name, now + self.ttl_s - 30)
+            return name
+
+    async def _create(self, client, api_model: str, prefix: PromptPrefix) -> str | None:
+        contents = [prefix.context] if prefix.context else None
+        try:
+            cached = await client.aio.caches.create(
+                model=api_model,
+                config=types.CreateCachedContentConfig(
+                    display_name=prefix.key[:128],
+                    system_instruction=prefix.system,
+                    contents=contents,
+                    ttl=f"{self.ttl_s}s",
+                ),
+            )
+        except Exception as e:
+            self.failed += 1
+            print(f"[prompt_cache] could not cache prefix for {prefix.key}: {e!r}")
+            return None
+        self.created += 1
+        return cached.name
+
+    async def _delete(self, client, name: str) -> None:
+        try:
+            await client.aio.caches.delete(name=name)
+        except Exception:
+            pass  # it expires on its own
+
+    def forget(self, api_model: str, prefix: PromptPrefix) -> None:
+        """Stop handing out this prefix's handle — the API rejected it. The next call recreates it."""
+        self._entries.pop((api_model, prefix.key), None)
+
+    async def clear(self, client, key_prefix: str = "") -> None:
+        """Drop every handle whose prefix key starts with key_prefix (all of them by default)."""
+        for key in [k for k in self._entries if k[1].startswith(key_prefix)]:
+            entry = self._entries.pop(key)
+            self._locks.pop(key, None)
+            if entry.name is not None:
+                await self._delete(client, entry.name)
+
+    def stats(self) -> dict:
+        return {
+            "live": sum(1 for e in self._entries.values() if e.name is not None),
+            "created": self.created,
+            "reused": self.reused,
+            "skipped": self.skipped,
+            "failed": self.failed,
+        }
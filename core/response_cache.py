@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+
+class CacheMiss(RuntimeError):
+    """Raised in replay mode when a request has never been recorded."""
+
+
+class ResponseCache:
+    """
+    Content-addressed store of raw LLM response text, keyed by a hash of
+    (model, system prompt, user prompt, response schema).
+
+    Modes:
+        record        — always call the API and store every response
+        replay        — only serve from the cache; a miss raises CacheMiss
+        read-through  — serve from the cache, call the API on a miss and store it
+
+    Backed by a single SQLite file with least-recently-used eviction once the
+    stored responses exceed max_bytes.
+    """
+
+    RECORD = "record"
+    REPLAY = "replay"
+    READ_THROUGH = "read-through"
+    MODES = (RECORD, REPLAY, READ_THROUGH)
+
+    def __init__(self, path: str | None = None, mode: str = READ_THROUGH, max_bytes: int = 256 * 1024 * 1024):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown cache mode '{mode}' — expected one of {self.MODES}")
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.path = path or _default_path()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY,"
+            " model TEXT,"
+            " response_model TEXT,"
+            " text TEXT NOT NULL,"
+            " size INTEGER NOT NULL,"
+            " last_used REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses(last_used)")
+        self._conn.commit()
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    @property
+    def reads(self) -> bool:
+        return self.mode in (self.REPLAY, self.READ_THROUGH)
+
+    @staticmethod
+    def key(model: str, system_content: str | None, user_content: str | None, response_model) -> str:
+        schema = response_model.model_json_schema()
+        payload = json.dumps(
+            [model, system_content or "", user_content or "", schema],
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute("SELECT text FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, key: str, text: str, model: str = "", response_model: str = "") -> None:
+        size = len(text.encode("utf-8"))
+        with self._lock:
+            old = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, model, response_model, text, size, last_used) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, response_model, text, size, time.time()),
+            )
+            self._total_bytes += size - (old[0] if old else 0)
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes:
+            row = self._conn.execute("SELECT key, size FROM responses ORDER BY last_used ASC LIMIT 1").fetchone()
+            if row is None:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (row[0],))
+            self._total_bytes -= row[1]
+            self.evictions += 1
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes": self._total_bytes,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _default_path() -> str:
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "logs")
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, "llm_cache.sqlite")
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import json
+import re
+import types
+from typing import Literal, Union, get_args, get_origin
+
+from pydantic import BaseModel, ValidationError
+
+from models.schema_registry import cached_model
+
+
+def clean_choice(value) -> str | None:
+    """Trim a model-written choice down to its text; None if nothing is left."""
+    if value is None:
+        return None
+    cleaned = str(value).strip()
+    return cleaned or None
+
+
+def match_literal(value, options: tuple):
+    """
+    Map a near-miss choice onto one of options: stray whitespace, quotes,
+    a leading @ or trailing full stop, or different casing. None if it
+    matches nothing, or more than one option.
+    """
+    if value in options:
+        return value
+    if not isinstance(value, str):
+        return None
+    key = _choice_key(value)
+    matches = [option for option in options if isinstance(option, str) and _choice_key(option) == key]
+    return matches[0] if len(matches) == 1 else None
+
+
+def _choice_key(text: str) -> str:
+    text = (clean_choice(text) or "").strip("\"'`@.")
+    return re.sub(r"\s+", " ", text).casefold()
+
+
+def _literal_options(annotation) -> tuple | None:
+    origin = get_origin(annotation)
+    if origin is Literal:
+        return get_args(annotation)
+    if origin in (Union, types.UnionType):
+        for arg in get_args(annotation):
+            options = _literal_options(arg)
+            if options:
+                return options
+    return None
+
+
+def repair_response(response_model: type[BaseModel], text: str, error: ValidationError) -> tuple[dict, list[str], bool]:
+    """
+    Fix what can be fixed locally in a response that failed validation.
+    Returns (data, fields that are still invalid, whether anything was normalised).
+    Raises the original error if the text isn't a JSON object at all.
+    """
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        raise error
+    if not isinstance(data, dict):
+        raise error
+
+    normalised = False
+    invalid: list[str] = []
+    for err in error.errors():
+        loc = err["loc"]
+        if not loc or not isinstance(loc[0], str) or loc[0] not in response_model.model_fields:
+            continue
+        name = loc[0]
+        field = response_model.model_fields[name]
+        fixed = False
+        if err["type"] == "literal_error":
+            annotation = field.annotation
+            if get_origin(annotation) is list and len(loc) == 2 and isinstance(data.get(name), list):
+                options = _literal_options(get_args(annotation)[0])
+                match = match_literal(data[name][loc[1]], options) if options else None
+                if match is not None:
+                    data[name][loc[1]] = match
+                    fixed = True
+            else:
+                options = _literal_options(annotation)
+                match = match_literal(data.get(name), options) if options else None
+                if match is not None:
+                    data[name] = match
+                    fixed = True
+        normalised = normalised or fixed
+        if not fixed and name not in invalid:
+            invalid.append(name)
+    return data, invalid, normalised
+
+
+def followup_model(response_model: type[BaseModel], fields: list[str]) -> type[BaseModel]:
+    """A response model holding only the fields that need asking for again."""
+    spec = {name: (response_model.model_fields[name].annotation, response_model.model_fields[name]) for name in fields}
+    return cached_model(f"{response_model.__name__}_repair", **spec)
+
+
+def followup_messages(messages: list, fields: list[str], previous_text: str) -> list:
+    system = next((m["content"] for m in messages if m["role"] == "system"), "")
+    user = next((m["content"] for m in messages if m["role"] == "user"), "")
+    note = (
+        f"\n\n--- CORRECTION NEEDED ---\n"
+        f"Your previous reply was:\n{previous_text}\n\n"
+        f"These fields were missing or not one of the allowed values: {', '.join(fields)}. "
+        f"Reply with only these fields, keeping them consistent with the rest of your previous reply."
+    )
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": user + note},
+    ]
@@ -1,9 +1,15 @@
 from __future__ import annotations
+import uuid
+from functools import partial
 from typing import TYPE_CHECKING
 
+from core.budget import GameBudget, budget_scope
+from core.call_context import call_tags
 from core.game_config import GameConfig
+from core.game_context.round_compressor import RoundCompressor
 from core.phase_runner import PhaseRunner
-from core.api_client import api_client
+from core.thinking_policy import ThinkingPolicy, thinking_scope
+from core.api_client import api_client, session_scope
 from agents.human_player import Human
 
 if TYPE_CHECKING:
@@ -17,8 +23,9 @@ if TYPE_CHECKING:
     
 class SimulationEngine:
     def __init__(self, agents: list[Debater], game_board: GameBoard, game_master: GameMaster, generator: CharacterGenerator,
-                 phase_factory: PhaseRecipeFactory):
+                 phase_factory: PhaseRecipeFactory, thinking_policy: ThinkingPolicy | None = None):
 
+        self.game_id = uuid.uuid4().hex[:8]
         self.game_master = game_master
         self.phase_factory = phase_factory
 
@@ -26,6 +33,13 @@ class SimulationEngine:
         self.generator = generator
         self.gameplay_config = GameConfig()
         self.phase_factory.initialise_game_config(self.gameplay_config)
+        self.budget = GameBudget.from_config(self.gameplay_config)
+        self.round_compressor = self._round_compressor(self.gameplay_config)
+        self.gameBoard.game_log.compressor = self.round_compressor
+        self.budget.listener = game_board.game_sink.on_budget_update
+        self.thinking_policy = thinking_policy
+        # This game's own call records, stats and log, over the shared client.
+        self.api_session = api_client.session(self.game_id, default_model=game_master.model_name)
         self.phase_runner = PhaseRunner(self)
         
         
@@ -33,6 +47,14 @@ class SimulationEngine:
         self._select_debug_targets()
         self.dead_agents = []
             
+    def _round_compressor(self, cfg):
+        if cfg.round_compression_threshold_tokens is None:
+            return None
+        # Quietly: it runs in the background on every long round, and the transcript is already in the game log.
+        summarise = partial(self.game_master.summarise_game_text, verbose=False)
+        return RoundCompressor(summarise, cfg.round_compression_threshold_tokens,
+                               cfg.round_compression_keep_recent_tokens)
+
     def initialiseGameBoard(self):
         self.gameBoard.initialize_agents(self.agents)
         self.gameBoard.phase_runner = self.phase_runner
@@ -57,6 +79,15 @@ class SimulationEngine:
                     
 
     def run(self, human_player_name = ""):
+        with call_tags(game=self.game_id), budget_scope(self.budget), thinking_scope(self.thinking_policy), \
+                session_scope(self.api_session):
+            try:
+                self._run(human_player_name)
+            finally:
+                self.game_master.close()
+                api_client.release_prompt_caches(f"{self.game_id}/")
+
+    def _run(self, human_player_name):
 
         if human_player_name:
             #name = 'Brian' # input("Name?\n")
@@ -69,8 +100,11 @@ class SimulationEngine:
             phase = self.phase_factory.get_phase_recipe(self.gameBoard.phase_number + 1, len(self.agents), self.gameplay_config)
             self.phase_runner.run_phase(phase)
         #------------Fin------------#
+        # The last round's summary is still being written; let it reach the sink before the game-over event.
+        self.game_master.await_round_summaries()
         self.gameBoard.game_sink.on_game_over(self.agents[0].name)
-        api_client.print_summary()
+        self.gameBoard.game_sink.on_budget_update(self.budget.snapshot())
+        self.api_session.print_summary()
         self._post_game_interview()
         
     def _post_game_interview(self):
@@ -51,9 +51,9 @@ class ConsoleGameEventSink(GameEventSink):
         ConsoleRenderer.print_public_action("SYSTEM", score_string)
         ConsoleRenderer.print_public_action("SYSTEM", f"BEGIN ROUND {round_number}")
 
-    def on_round_summary(self, summary: str) -> None:
+    def on_round_summary(self, round_number: int, summary: str) -> None:
         #big question, should this be public? the round summaries should be passed to each agent anyway...
-        ConsoleRenderer.print_private("SUMMARY", f"{summary}\n", color_name="YELLOW")
+        ConsoleRenderer.print_private(f"ROUND {round_number} SUMMARY", f"{summary}\n", color_name="YELLOW")
 
     def on_turn_header(self, turn_number: int) -> None:
         ConsoleRenderer.print_turn_header(turn_number)
@@ -96,6 +96,12 @@ class ConsoleGameEventSink(GameEventSink):
     def on_warning(self, message: str) -> None:
         ConsoleRenderer.print_system_private(f"⚠ {message}")
 
+    def on_budget_update(self, budget: dict) -> None:
+        if budget["level"] != "normal":
+            ConsoleRenderer.print_system_private(
+                f"⚠ Budget {budget['used_fraction']:.0%} used — now running in '{budget['level']}' mode"
+            )
+
     def delay(self, delay: float = 0.0) -> None:
         time.sleep(delay)
         
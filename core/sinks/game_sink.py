@@ -70,8 +70,11 @@ class GameEventSink(ABC):
         ...
 
     @abstractmethod
-    def on_round_summary(self, summary: str) -> None:
-        """Game master's summary of the round just completed."""
+    def on_round_summary(self, round_number: int, summary: str) -> None:
+        """
+        Game master's summary of a completed round. It's written in the
+        background, so it usually arrives once the next round has begun.
+        """
         ...
 
     @abstractmethod
@@ -144,6 +147,27 @@ class GameEventSink(ABC):
         """A private conversation between specific players."""
         ...
 
+    # Set True by sinks that can render a message while it's still being generated.
+    streams_public_deltas = False
+
+    def on_public_action_delta(self, speaker: Speaker, delta: str) -> None:
+        """
+        A fragment of a public message still being generated. Called from the API
+        client's event loop, so implementations must not block. No-op by default.
+        """
+        pass
+
+    def on_public_action_stream_end(self, speaker: Speaker) -> None:
+        """Generation for this speaker finished; the final text follows via on_public_action. No-op by default."""
+        pass
+
+    def on_budget_update(self, budget: dict) -> None:
+        """
+        The game's spend budget changed level (or the game ended). Can fire from
+        the API client's event loop, so implementations must not block. No-op by default.
+        """
+        pass
+
     def on_cast(self, names: list[str]) -> None:
         """Announce the full player roster once the game's agents are finalized. No-op by default."""
         pass
@@ -214,7 +238,7 @@ class NoopGameSink(GameEventSink):
     def on_phase_rounds(self, rounds): pass
     def on_phase_round_index(self, index): pass
     def on_round_start(self, round_number, scores): pass
-    def on_round_summary(self, summary): pass
+    def on_round_summary(self, round_number, summary): pass
     def on_turn_header(self, turn_number): pass
     def on_public_action(self, speaker, message, color="", animate=True, directed_to_name=None, is_reply=False): pass
     def on_private_thought(self, speaker, message): pass
@@ -245,7 +269,7 @@ class CapturingGameSink(GameEventSink):
         self.phase_headers: list[int] = []
         self.phase_intros: list[dict] = []
         self.round_starts: list[dict] = []
-        self.round_summaries: list[str] = []
+        self.round_summaries: list[dict] = []
         self.turn_headers: list[int] = []
         self.public_actions: list[dict] = []
         self.private_thoughts: list[dict] = []
@@ -254,6 +278,7 @@ class CapturingGameSink(GameEventSink):
         self.points_updates: list[dict[str, int]] = []
         self.evictions_updates: list[str] = []
         self.widget_updates: list = []
+        self.budget_updates: list[dict] = []
         
 
     def get_user_input_simple(self, field_name, description):
@@ -280,8 +305,8 @@ class CapturingGameSink(GameEventSink):
     def on_round_start(self, round_number, scores):
         self.round_starts.append({"round_number": round_number, "scores": scores})
 
-    def on_round_summary(self, summary):
-        self.round_summaries.append(summary)
+    def on_round_summary(self, round_number, summary):
+        self.round_summaries.append({"round_number": round_number, "summary": summary})
 
     def on_turn_header(self, turn_number):
         self.turn_headers.append(turn_number)
@@ -323,4 +348,7 @@ class CapturingGameSink(GameEventSink):
 
     def on_widget_update(self, widget) -> None:
         self.widget_updates.append(widget)
+
+    def on_budget_update(self, budget) -> None:
+        self.budget_updates.append(dict(budget))
         
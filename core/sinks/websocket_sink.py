@@ -11,6 +11,8 @@ from core.sinks.game_sink import GameEventSink
 class WebSocketSink(GameEventSink):
     """Serialises game events to JSON and broadcasts over a websocket."""
 
+    streams_public_deltas = True
+
     def __init__(self, websocket: WebSocket, loop: asyncio.AbstractEventLoop):
         self.websocket = websocket
         self.loop = loop
@@ -27,6 +29,15 @@ class WebSocketSink(GameEventSink):
         )
         future.result(timeout=5)
 
+    def _send_nowait(self, payload: dict):
+        """Fire-and-forget send for high-frequency events that mustn't stall the caller."""
+        if self._disconnected:
+            return
+        asyncio.run_coroutine_threadsafe(
+            self.websocket.send_text(json.dumps(payload)),
+            self.loop,
+        )
+
     # -- Game lifecycle -------------------------------------------------------
 
     def on_game_intro(self, message: str):
@@ -54,8 +65,8 @@ class WebSocketSink(GameEventSink):
     def on_round_start(self, round_number: int, scores: str):
         self._send({"type": "round_start", "round_number": round_number, "scores": scores})
 
-    def on_round_summary(self, summary: str):
-        self._send({"type": "round_summary", "summary": summary})
+    def on_round_summary(self, round_number: int, summary: str):
+        self._send({"type": "round_summary", "round_number": round_number, "summary": summary})
 
     def on_turn_header(self, turn_number: int):
         self._send({"type": "turn_header", "turn_number": turn_number})
@@ -72,6 +83,17 @@ class WebSocketSink(GameEventSink):
         self._send(event)
         
 
+    def on_public_action_delta(self, speaker, delta: str):
+        speaker_name = speaker.name if hasattr(speaker, "name") else str(speaker)
+        self._send_nowait({"type": "public_action_delta", "speaker": speaker_name, "delta": delta})
+
+    def on_public_action_stream_end(self, speaker):
+        speaker_name = speaker.name if hasattr(speaker, "name") else str(speaker)
+        self._send_nowait({"type": "public_action_stream_end", "speaker": speaker_name})
+
+    def on_budget_update(self, budget: dict):
+        self._send_nowait({"type": "budget_update", "budget": budget})
+
     def on_private_thought(self, speaker, message: str):
         speaker_name = speaker.name if hasattr(speaker, "name") else str(speaker)
         self._send({"type": "private_thought", "speaker": speaker_name, "message": message})
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+_SIMPLE_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class FieldStreamParser:
+    """
+    Incremental scanner over a streamed JSON object. Feed it raw text chunks
+    as they arrive; it returns the decoded characters of one top-level string
+    field (public_response by default) as soon as they appear.
+
+    It doesn't build the object — the full text is still validated against
+    the Pydantic model once the stream ends.
+    """
+
+    def __init__(self, field_name: str = "public_response"):
+        self.field_name = field_name
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._unicode: str | None = None  # hex digits of a \\uXXXX escape
+        self._high_surrogate: int | None = None
+        self._expect_key = False
+        self._string_is_key = False
+        self._key_chars: list[str] = []
+        self._last_key: str | None = None
+        self._streaming = False
+        self.done = False
+
+    def feed(self, chunk: str) -> str:
+        out: list[str] = []
+        for ch in chunk:
+            if self._in_string:
+                self._string_char(ch, out)
+            elif ch == '"':
+                self._in_string = True
+                self._string_is_key = self._depth == 1 and self._expect_key
+                self._streaming = (
+                    self._depth == 1 and not self._string_is_key and self._last_key == self.field_name
+                )
+                self._key_chars = []
+            elif ch in "{[":
+                self._depth += 1
+                if self._depth == 1:
+                    self._expect_key = ch == "{"
+            elif ch in "}]":
+                self._depth -= 1
+            elif ch == "," and self._depth == 1:
+                self._expect_key = True
+            elif ch == ":" and self._depth == 1:
+                self._expect_key = False
+        return "".join(out)
+
+    def _string_char(self, ch: str, out: list[str]) -> None:
+        if self._unicode is not None:
+            self._unicode += ch
+            if len(self._unicode) == 4:
+                self._emit_code_point(int(self._unicode, 16), out)
+                self._unicode = None
+            return
+        if self._escape:
+            self._escape = False
+            if ch == "u":
+                self._unicode = ""
+            else:
+                self._emit(_SIMPLE_ESCAPES.get(ch, ch), out)
+            return
+        if ch == "\\":
+            self._escape = True
+        elif ch == '"':
+            self._in_string = False
+            if self._string_is_key:
+                self._last_key = "".join(self._key_chars)
+            elif self._streaming:
+                self._streaming = False
+                self.done = True
+        else:
+            self._emit(ch, out)
+
+    def _emit_code_point(self, code: int, out: list[str]) -> None:
+        if 0xD800 <= code <= 0xDBFF:
+            self._high_surrogate = code
+            return
+        if 0xDC00 <= code <= 0xDFFF and self._high_surrogate is not None:
+            code = 0x10000 + ((self._high_surrogate - 0xD800) << 10) + (code - 0xDC00)
+        self._high_surrogate = None
+        self._emit(chr(code), out)
+
+    def _emit(self, text: str, out: list[str]) -> None:
+        if self._string_is_key:
+            self._key_chars.append(text)
+        elif self._streaming:
+            out.append(text)
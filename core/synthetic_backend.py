@@ -0,0 +1,270 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+from core.api_client import _LOREM, mock_response
+
+# z-score of the 99th percentile of a standard normal
+_Z99 = 2.326
+
+
+@dataclass(frozen=True)
+class LogNormal:
+    """A right-skewed distribution pinned by its median and 99th percentile."""
+    p50: float
+    p99: float
+
+    def sample(self, rng: random.Random) -> float:
+        p50 = max(self.p50, 1e-6)
+        p99 = max(self.p99, p50)
+        sigma = (math.log(p99) - math.log(p50)) / _Z99
+        return rng.lognormvariate(math.log(p50), sigma)
+
+
+@dataclass(frozen=True)
+class CallProfile:
+    latency_ms: LogNormal
+    completion_tokens: LogNormal
+    # Thought tokens at the model's default thinking (flash-lite doesn't think unless given a budget).
+    thinking_tokens: LogNormal | None = None
+
+
+DEFAULT_PROFILE = CallProfile(latency_ms=LogNormal(2500, 9000), completion_tokens=LogNormal(450, 1400))
+DEFAULT_THINKING = LogNormal(600, 3000)
+# How fast thought tokens come out — a thinking budget moves latency by the tokens it adds or saves.
+THINKING_TOK_PER_S = 250
+# Implicit prefix caching: prompts are matched in blocks of this many characters against recent prompts.
+IMPLICIT_BLOCK_CHARS = 1024
+IMPLICIT_CACHE_ENTRIES = 100_000  # block hashes remembered, least recently used dropped first
+
+
+class SyntheticAPIError(Exception):
+    """Stands in for the SDK's APIError — the message carries the status like the real one."""
+
+
+class SyntheticBackend:
+    """
+    Offline stand-in for google.genai.Client, injected via api_client.init().
+
+    Each call sleeps for a latency sampled from the profile for its
+    (model, response_model) pair — falling back to response_model, then model,
+    then the default — and returns schema-valid filler with realistic
+    usage_metadata. Optional fault injection raises 429s and timeouts so the
+    limiter and retry paths get exercised too.
+
+    Like the real API, calls without an explicit cached_content get
+    implicit prefix caching: the leading blocks of the prompt already sent
+    to the same model recently come back as cached_content_token_count,
+    once they reach implicit_cache_min_tokens (None turns it off).
+    """
+
+    def __init__(
+        self,
+        profiles: dict | None = None,
+        default_profile: CallProfile = DEFAULT_PROFILE,
+        rate_limit_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        timeout_s: float = 30.0,
+        time_scale: float = 1.0,
+        seed: int | None = None,
+        implicit_cache_min_tokens: int | None = 1024,
+        optional_fill_rate: float = 1.0,
+    ):
+        self.profiles = profiles or {}
+        self.default_profile = default_profile
+        self.rate_limit_rate = rate_limit_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_s = timeout_s
+        self.time_scale = time_scale  # < 1 speeds the whole simulation up
+        self._rng = random.Random(seed)
+        self.calls = 0
+        self.cached_contents: dict[str, int] = {}  # name -> prompt tokens it stands for
+        self.implicit_cache_min_tokens = implicit_cache_min_tokens
+        # Share of optional response fields filled in; real models leave most (persona updates, …) empty.
+        self.optional_fill_rate = optional_fill_rate
+        self._implicit_blocks: OrderedDict[int, None] = OrderedDict()  # hashes of prompt prefixes, by block
+        self.models = SimpleNamespace(generate_content=self._generate_content)
+        self.aio = SimpleNamespace(models=SimpleNamespace(
+            generate_content=self._agenerate_content,
+            generate_content_stream=self._agenerate_content_stream,
+        ), caches=SimpleNamespace(
+            create=self._acreate_cache,
+            delete=self._adelete_cache,
+        ))
+
+    # ------------------------------------------------------------------
+    # Profiles
+    # ------------------------------------------------------------------
+    @classmethod
+    def from_api_logs(cls, paths: list[str], **kwargs) -> "SyntheticBackend":
+        """Build per-model and per-response_model profiles from api_calls_*.jsonl records."""
+        samples: dict = {}
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    record = json.loads(line)
+                    keys = [
+                        (record.get("model"), record.get("response_model")),
+                        record.get("response_model"),
+                        record.get("model"),
+                    ]
+                    for key in keys:
+                        bucket = samples.setdefault(key, ([], []))
+                        bucket[0].append(record.get("duration_ms") or 0)
+                        if record.get("completion_tokens") is not None:
+                            bucket[1].append(record["completion_tokens"])
+
+        profiles = {}
+        for key, (latencies, completions) in samples.items():
+            if not latencies:
+                continue
+            completions = completions or [DEFAULT_PROFILE.completion_tokens.p50]
+            profiles[key] = CallProfile(
+                latency_ms=LogNormal(_percentile(latencies, 50), _percentile(latencies, 99)),
+                completion_tokens=LogNormal(_percentile(completions, 50), _percentile(completions, 99)),
+            )
+        return cls(profiles=profiles, **kwargs)
+
+    def _profile(self, model: str, response_model_name: str) -> CallProfile:
+        for key in ((model, response_model_name), response_model_name, model):
+            if key in self.profiles:
+                return self.profiles[key]
+        return self.default_profile
+
+    # ------------------------------------------------------------------
+    # Calls
+    # ------------------------------------------------------------------
+    def _plan(self, model, contents, config):
+        self.calls += 1
+        response_model = getattr(config, "response_schema", None)
+        name = getattr(response_model, "__name__", "")
+        profile = self._profile(model, name)
+        latency_s = profile.latency_ms.sample(self._rng) / 1000 * self.time_scale
+
+        roll = self._rng.random()
+        if roll < self.rate_limit_rate:
+            return latency_s * 0.1, SyntheticAPIError("429 RESOURCE_EXHAUSTED (synthetic)")
+        if roll < self.rate_limit_rate + self.timeout_rate:
+            return self.timeout_s * self.time_scale, TimeoutError("synthetic timeout")
+
+        cached_name = getattr(config, "cached_content", None)
+        if cached_name and cached_name not in self.cached_contents:
+            return latency_s * 0.1, SyntheticAPIError(f"404 NOT_FOUND cached content {cached_name} (synthetic)")
+
+        completion = max(1, int(profile.completion_tokens.sample(self._rng)))
+        system = getattr(config, "system_instruction", None) or ""
+        text = system + str(contents)
+        if cached_name:
+            cached = self.cached_contents.get(cached_name, 0)
+            prompt = max(1, len(text) // 4) + cached
+        else:
+            cached = self._implicit_cached(model, text)
+            prompt = max(1, len(text) // 4)
+        thoughts, default_thoughts = self._thoughts(model, profile, config)
+        latency_s = max(latency_s * 0.1, latency_s + (thoughts - default_thoughts) / THINKING_TOK_PER_S * self.time_scale)
+        return latency_s, self._response(response_model, prompt, completion, cached or None, thoughts)
+
+    def _implicit_cached(self, model: str, text: str) -> int:
+        """Tokens of text's leading blocks seen before for this model; every block is remembered."""
+        if self.implicit_cache_min_tokens is None:
+            return 0
+        seen = self._implicit_blocks
+        prefix_hash, matched = hash(model), 0
+        for i in range(len(text) // IMPLICIT_BLOCK_CHARS):
+            # Chained, so a block only matches behind the same prefix — the hits are always leading blocks.
+            prefix_hash = hash((prefix_hash, text[i * IMPLICIT_BLOCK_CHARS:(i + 1) * IMPLICIT_BLOCK_CHARS]))
+            if prefix_hash in seen:
+                seen.move_to_end(prefix_hash)
+                matched += 1
+            else:
+                seen[prefix_hash] = None
+        while len(seen) > IMPLICIT_CACHE_ENTRIES:
+            seen.popitem(last=False)
+        tokens = matched * IMPLICIT_BLOCK_CHARS // 4
+        return tokens if tokens >= self.implicit_cache_min_tokens else 0
+
+    def _thoughts(self, model: str, profile: CallProfile, config) -> tuple[int, int]:
+        """(thought tokens for this call, what the model would have spent by default)."""
+        budget = getattr(getattr(config, "thinking_config", None), "thinking_budget", None)
+        thinking = profile.thinking_tokens or DEFAULT_THINKING
+        default = 0 if "lite" in model else int(thinking.sample(self._rng))
+        if budget is None:
+            return default, default
+        if budget == 0:
+            return 0, default
+        return min(budget, default or int(thinking.sample(self._rng))), default
+
+    def _response(self, response_model, prompt_tokens: int, completion_tokens: int, cached_tokens: int | None = None,
+                  thought_tokens: int = 0):
+        if response_model is not None:
+            fields = max(1, len(response_model.model_fields))
+            chars = max(20, completion_tokens * 4 // fields)
+            filler = (_LOREM * (chars // len(_LOREM) + 1))[:chars]
+            text = mock_response(response_model, filler, self._rng, self.optional_fill_rate).model_dump_json()
+        else:
+            text = "synthetic transcript"
+        usage = SimpleNamespace(
+            prompt_token_count=prompt_tokens,
+            candidates_token_count=completion_tokens,
+            total_token_count=prompt_tokens + completion_tokens + thought_tokens,
+            cached_content_token_count=cached_tokens,
+            thoughts_token_count=thought_tokens or None,
+        )
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+    def _generate_content(self, model, contents, config=None):
+        delay, outcome = self._plan(model, contents, config)
+        time.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def _agenerate_content(self, model, contents, config=None):
+        delay, outcome = self._plan(model, contents, config)
+        await asyncio.sleep(delay)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def _agenerate_content_stream(self, model, contents, config=None, chunks: int = 8):
+        delay, outcome = self._plan(model, contents, config)
+        if isinstance(outcome, Exception):
+            await asyncio.sleep(delay)
+            raise outcome
+
+        async def stream():
+            text = outcome.text
+            step = max(1, math.ceil(len(text) / chunks))
+            pieces = [text[i:i + step] for i in range(0, len(text), step)] or [""]
+            for i, piece in enumerate(pieces):
+                await asyncio.sleep(delay / len(pieces))
+                last = i == len(pieces) - 1
+                yield SimpleNamespace(text=piece, usage_metadata=outcome.usage_metadata if last else None)
+
+        return stream()
+
+    async def _acreate_cache(self, model, config=None):
+        system = getattr(config, "system_instruction", None) or ""
+        contents = getattr(config, "contents", None) or []
+        name = f"cachedContents/synthetic-{len(self.cached_contents) + 1}-{self._rng.getrandbits(32):08x}"
+        self.cached_contents[name] = max(1, (len(str(system)) + sum(len(str(c)) for c in contents)) // 4)
+        return SimpleNamespace(name=name)
+
+    async def _adelete_cache(self, name, config=None):
+        self.cached_contents.pop(name, None)
+
+
+def _percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, math.ceil(pct / 100 * len(ordered)) - 1))
+    return float(ordered[index])
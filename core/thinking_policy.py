@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import contextvars
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+import google.genai.types as types
+
+
+@dataclass(frozen=True)
+class ThinkingProfile:
+    # None leaves the model's own default (dynamic thinking on flash, none on flash-lite);
+    # 0 turns thinking off, and a positive budget turns it on even where it's off by default.
+    thinking_budget: int | None = None
+    temperature: float = 1.0
+
+    def thinking_config(self) -> types.ThinkingConfig:
+        return types.ThinkingConfig(thinking_budget=self.thinking_budget, include_thoughts=False)
+
+
+# Which category a call belongs to, by response model name or by its turn/round tag.
+CATEGORIES: dict[str, str] = {
+    # A pick from a fixed list — nothing to deliberate over.
+    "rps_choice": "choice",
+    "GuessTheNumber": "choice",
+    "GivePointsModel": "choice",
+    "StealPointsModel": "choice",
+    "SabotageModel": "choice",
+    "vote_for_leader": "choice",
+    "elect_leader_choice": "choice",
+    # Decisions that shape the game.
+    "vote_out_player": "vote",
+    "jury_vote": "vote",
+    "SobStoryJudge": "vote",
+    # Speaking in character.
+    "DynamicTurnModel": "speech",
+    "basic_turn": "speech",
+    "SobStory": "speech",
+    "CharacterProfile": "speech",
+    # Memory: the agent's own summaries and the host's round summaries.
+    "sumariser": "summary",
+    "PhaseSummary": "summary",
+    "SummariseRoundBasic": "summary",
+    "SummariseRoundComplex": "summary",
+}
+
+_DEFAULT = ThinkingProfile()
+
+# Named policies; each level in AVAILABLE_LEVELS picks one by name.
+POLICIES: dict[str, dict[str, ThinkingProfile]] = {
+    "lean": {
+        "choice": ThinkingProfile(0),
+        "vote": ThinkingProfile(0),
+        "speech": ThinkingProfile(0),
+        "summary": ThinkingProfile(512, temperature=0.7),
+    },
+    "standard": {
+        "choice": ThinkingProfile(0),
+        "vote": ThinkingProfile(512),
+        "speech": ThinkingProfile(None),
+        "summary": ThinkingProfile(1024, temperature=0.7),
+    },
+    "deep": {
+        "choice": ThinkingProfile(0),
+        "vote": ThinkingProfile(2048),
+        "speech": ThinkingProfile(1024),
+        "summary": ThinkingProfile(4096, temperature=0.7),
+    },
+}
+
+
+class ThinkingPolicy:
+    """
+    Thinking budget and temperature per call category. A call is placed by
+    its response model name first, then its turn tag, then its round tag;
+    anything unrecognised gets the model's defaults.
+    """
+
+    def __init__(self, name: str = "standard", profiles: dict[str, ThinkingProfile] | None = None,
+                 categories: dict[str, str] | None = None):
+        self.name = name
+        self.profiles = POLICIES[name] if profiles is None else profiles
+        self.categories = CATEGORIES if categories is None else categories
+
+    @classmethod
+    def named(cls, name: str | None) -> "ThinkingPolicy":
+        return cls(name if name in POLICIES else "standard")
+
+    def category(self, response_model_name: str, tags: dict | None = None) -> str:
+        tags = tags or {}
+        # Repair follow-ups think like the call they're patching.
+        base_name = response_model_name.removesuffix("_repair")
+        for key in (base_name, tags.get("turn"), tags.get("round")):
+            if key in self.categories:
+                return self.categories[key]
+        return "default"
+
+    def profile(self, response_model_name: str, tags: dict | None = None) -> tuple[str, ThinkingProfile]:
+        category = self.category(response_model_name, tags)
+        return category, self.profiles.get(category, _DEFAULT)
+
+
+_current_policy: contextvars.ContextVar[ThinkingPolicy | None] = contextvars.ContextVar("thinking_policy", default=None)
+
+
+@contextmanager
+def thinking_scope(policy: ThinkingPolicy | None):
+    token = _current_policy.set(policy)
+    try:
+        yield policy
+    finally:
+        _current_policy.reset(token)
+
+
+def current_policy() -> ThinkingPolicy | None:
+    return _current_policy.get()
+
+
+# No policy in scope: calls are still categorised, for the stats, but run on model defaults.
+_OFF = ThinkingPolicy("off", profiles={})
+
+
+def resolve(response_model_name: str, tags: dict | None = None) -> tuple[str, ThinkingProfile]:
+    """The category and profile for a call."""
+    return (current_policy() or _OFF).profile(response_model_name, tags)
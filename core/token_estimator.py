@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import json
+import threading
+
+from core.call_stats import StreamingHistogram
+
+
+class TokenEstimator:
+    """
+    Prompt tokens from characters, without a network round-trip. Each model
+    starts at DEFAULT_CHARS_PER_TOKEN and is calibrated from the actual
+    prompt_tokens of every call (and from api_calls_*.jsonl logs, which
+    record prompt_chars), as a ratio of running sums: long prompts count for
+    more than short ones, which is where an estimate matters.
+
+    The API client prices rate-limiter reservations with it; BaseAgent reads
+    it before sending, to warn about oversized contexts and to judge a call
+    by where it would leave the game's budget.
+    """
+
+    DEFAULT_CHARS_PER_TOKEN = 4.0
+    # Weight of the default ratio, in characters, before any calls are seen — roughly ten typical prompts.
+    PRIOR_CHARS = 40_000
+
+    def __init__(self, warn_tokens: int | None = None):
+        self.warn_tokens = warn_tokens
+        self._chars: dict[str, int] = {}
+        self._tokens: dict[str, int] = {}
+        self._observed: dict[str, int] = {}
+        self.error_pct = StreamingHistogram()
+        self._warned: set[str] = set()
+        self._lock = threading.Lock()
+
+    def chars_per_token(self, model: str | None = None) -> float:
+        chars = self._chars.get(model, 0) + self.PRIOR_CHARS
+        tokens = self._tokens.get(model, 0) + self.PRIOR_CHARS / self.DEFAULT_CHARS_PER_TOKEN
+        return chars / tokens
+
+    def estimate(self, chars: int, model: str | None = None) -> int:
+        return round(chars / self.chars_per_token(model))
+
+    def estimate_messages(self, messages: list, model: str | None = None) -> int:
+        return self.estimate(prompt_chars(messages), model)
+
+    def observe(self, model: str, chars: int, actual: int | None, estimated: int | None = None) -> None:
+        """Fold one call's actual prompt size into the model's ratio, and score the estimate made for it."""
+        if not actual or not chars:
+            return
+        with self._lock:
+            self._chars[model] = self._chars.get(model, 0) + chars
+            self._tokens[model] = self._tokens.get(model, 0) + actual
+            self._observed[model] = self._observed.get(model, 0) + 1
+            if estimated is not None:
+                self.error_pct.add(abs(estimated - actual) * 100 / actual)
+
+    def calibrate_from_logs(self, paths: list[str]) -> int:
+        """Calibrate from api_calls_*.jsonl records; returns how many were usable (older logs lack prompt_chars)."""
+        used = 0
+        for path in paths:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = json.loads(line)
+                        except ValueError:
+                            continue
+                        if record.get("prompt_chars") and record.get("prompt_tokens"):
+                            self.observe(record.get("model"), record["prompt_chars"], record["prompt_tokens"])
+                            used += 1
+            except OSError:
+                continue
+        return used
+
+    def check_context(self, agent: str, tokens: int) -> bool:
+        """True (and a one-off warning per agent) when an agent's prompt is over warn_tokens."""
+        if self.warn_tokens is None or tokens <= self.warn_tokens:
+            return False
+        with self._lock:
+            first = agent not in self._warned
+            self._warned.add(agent)
+        if first:
+            print(f"[token_estimator] {agent}'s prompt is ~{tokens:,} tokens, over the {self.warn_tokens:,} warning line")
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "chars_per_token": {m: round(self.chars_per_token(m), 2) for m in list(self._observed)},
+            "observed": sum(self._observed.values()),
+            "error_pct": self.error_pct.percentiles(),
+            "over_warning": sorted(self._warned),
+        }
+
+
+def prompt_chars(messages: list) -> int:
+    return sum(len(m.get("content") or "") for m in messages)
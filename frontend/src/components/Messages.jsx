@@ -170,12 +170,12 @@ function PublicAction({ speaker, message, color, animate, onComplete, skipRef, a
   )
 }
 
-function RoundSummary({ summary }) {
+function RoundSummary({ round_number, summary }) {
   const [open, setOpen] = useState(false)
   return (
     <div className="msg round-summary">
       <button className="summary-toggle" onClick={() => setOpen(o => !o)}>
-        {open ? '▼' : '▶'} Round Summary
+        {open ? '▼' : '▶'} {round_number != null ? `Round ${round_number} Summary` : 'Round Summary'}
       </button>
       {open && <p className="summary-text">{summary}</p>}
     </div>
@@ -326,6 +326,16 @@ export function ThreadedFeed({ events, colorMap, animateText, onAnimationComplet
   })
 }
 
+// Messages still being generated, shown live until the final public_action lands.
+export function DraftFeed({ drafts, colorMap }) {
+  return Object.entries(drafts).map(([speaker, text]) => (
+    <div key={speaker} className="msg public-action draft">
+      <span className="speaker" style={{ color: getSpeakerColor(speaker, colorMap) }}>{speaker}</span>
+      <span className="message-text">{text}<span className="draft-cursor">▍</span></span>
+    </div>
+  ))
+}
+
 export function Message({ event, colorMap, onComplete, skipRef, animateText}) {
   switch (event.type) {
     case 'phase_header':
@@ -3,6 +3,17 @@ import { useState, useRef, useCallback, useEffect } from 'react'
 const WS_URL = `ws://${window.location.host}/ws/game`
 const WS_DEMO_URL = `ws://${window.location.host}/ws/demo`
 
+// Round summaries are written in the background and usually land once the next round has begun;
+// file each under its own round, ahead of whatever header follows it.
+function placeRoundSummary(events, evt) {
+  let start = -1
+  events.forEach((e, i) => { if (e.type === 'round_start' && e.round_number === evt.round_number) start = i })
+  if (start === -1) return [...events, evt]
+  const next = events.findIndex((e, i) => i > start && (e.type === 'round_start' || e.type === 'phase_header'))
+  if (next === -1) return [...events, evt]
+  return [...events.slice(0, next), evt, ...events.slice(next)]
+}
+
 function isAnimatableEvent(evt, animateText) {
   if (evt.type !== 'public_action') return false
   if (!animateText) return false
@@ -23,6 +34,8 @@ export function useGameSocket(autoRun, animateText) {
   const [widget, setWidget] = useState(null)
   const [privateConversations, setPrivateConversations] = useState([])
   const [playerNames, setPlayerNames] = useState([])
+  const [drafts, setDrafts] = useState({})
+  const [budget, setBudget] = useState(null)
 
   const wsRef = useRef(null)
   const autoRunRef = useRef(autoRun)
@@ -44,6 +57,7 @@ export function useGameSocket(autoRun, animateText) {
       if (evt.type === 'points_update') { setScores(evt.scores); continue }
       if (evt.type === 'evicted_update') { setEvicted(evt.evicted_names); continue }
       if (evt.type === 'widget_update') { setWidget(evt.widget ?? null); continue }
+      if (evt.type === 'round_summary') { setEvents(prev => placeRoundSummary(prev, evt)); continue }
       if (evt.type === 'feed_marker') {
         setFeedMarkers(prev => [...prev, evt.label])
         setEvents(prev => [...prev, evt])
@@ -100,6 +114,18 @@ export function useGameSocket(autoRun, animateText) {
       setPrivateConversations(prev => [...prev, { participants: evt.participants ?? [], messages: evt.messages }])
       return
     }
+    if (evt.type === 'public_action_delta') {
+      setDrafts(prev => ({ ...prev, [evt.speaker]: (prev[evt.speaker] ?? '') + evt.delta }))
+      return
+    }
+    if (evt.type === 'public_action_stream_end') {
+      setDrafts(prev => {
+        const { [evt.speaker]: _done, ...rest } = prev
+        return rest
+      })
+      return
+    }
+    if (evt.type === 'budget_update') { setBudget(evt.budget); return }
     if (evt.type === 'cast') { setPlayerNames(evt.names ?? []); return }
     if (evt.type === 'input_request') { setInputRequest(evt); return }
     if (evt.type === 'loading_done') {
@@ -129,6 +155,8 @@ export function useGameSocket(autoRun, animateText) {
     setWidget(null)
     setPrivateConversations([])
     setPlayerNames([])
+    setDrafts({})
+    setBudget(null)
     pendingQueue.current = []
     isAnimating.current = false
     setIsAnimatingState(false)
@@ -176,7 +204,7 @@ export function useGameSocket(autoRun, animateText) {
   return {
     status, events, scores, evicted,
     inputRequest, awaitingNext, phaseRounds, currentRoundIndex, feedMarkers, segmentTitles,
-    widget, privateConversations, playerNames,
+    widget, privateConversations, playerNames, drafts, budget,
     startGame, startDemo, submitInput, sendNext, skipAnimation,
     onAnimationComplete, skipRef, isAnimating: isAnimatingState,
   }
@@ -1,5 +1,5 @@
 import { useRef, useEffect, useState } from 'react'
-import { ThreadedFeed } from '../components/Messages'
+import { ThreadedFeed, DraftFeed } from '../components/Messages'
 import Scoreboard from '../components/Scoreboard'
 import RoundTracker from '../components/RoundTracker'
 import RoundWidget from '../components/RoundWidget'
@@ -12,7 +12,7 @@ export default function GameView({
   inputRequest, awaitingNext, phaseRounds, currentRoundIndex,
   submitInput, sendNext, skipAnimation, onAnimationComplete, skipRef,
   isAnimating, settings, updateSetting, feedMarkers, segmentTitles, widget,
-  privateConversations, playerNames = [],
+  privateConversations, playerNames = [], drafts = {}, budget = null,
 }) {
   const { showPrivate, autoRun, animateText, showPrivateChats } = settings
 
@@ -158,6 +158,11 @@ export default function GameView({
             {status === 'done' && '✓ Done'}
             {status === 'error' && '⚠ Error'}
           </span>
+          {budget && budget.level !== 'normal' && (
+            <span className={`budget-badge budget-${budget.level}`} title={`${Math.round(budget.used_fraction * 100)}% of the game budget used`}>
+              Budget: {budget.level.replace('_', ' ')}
+            </span>
+          )}
         </div>
       </header>
 
@@ -207,6 +212,7 @@ export default function GameView({
               onAnimationComplete={onAnimationComplete}
               skipRef={skipRef}
             />
+            <DraftFeed drafts={drafts} colorMap={colorMapRef.current} />
             <div ref={bottomRef} />
           </main>
           {showPrivateChats && (
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from concurrent.futures import ThreadPoolExecutor
+from core.call_context import TaggedThreadPoolExecutor
 import random
 from typing import Callable, Sequence
 from agents.base_agent import BaseAgent
@@ -138,7 +138,7 @@ class BaseRound:
         if not tasks:
             return []
         if parallel:
-            with ThreadPoolExecutor() as executor:
+            with TaggedThreadPoolExecutor() as executor:
                 futures = [executor.submit(worker, *task) for task in tasks]
                 return [f.result() for f in futures]
         return [worker(*task) for task in tasks]
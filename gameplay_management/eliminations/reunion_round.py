@@ -4,7 +4,8 @@ from gameplay_management.eliminations.vote_mechanicsMixin import VoteMechanicsMi
 from models.player_models import DynamicModelFactory
 from prompts.gamePrompts import GamePromptLibrary
 from pydantic import Field
-from concurrent.futures import ThreadPoolExecutor
+from core.api_client import api_client
+from core.call_context import TaggedThreadPoolExecutor
 
 class FinaleReunionRound(VoteMechanicsMixin):
     
@@ -65,7 +66,9 @@ class FinaleReunionRound(VoteMechanicsMixin):
         self._on_segment(self._WAKEUP)
         self.gameBoard._loading_string("Waking players up")
         agents_to_wake = [[agent] for agent in self.voting_players if not agent.is_human()]
-        conversation_ids = self._run_tasks(agents_to_wake, self._wake_up_player_reunion, parallel=True)
+        # Runs behind the host's intro, so the answers can come back as one batch job.
+        with api_client.batch():
+            conversation_ids = self._run_tasks(agents_to_wake, self._wake_up_player_reunion, parallel=True)
         for conv_id in conversation_ids:
             if conv_id: #human - return None
                 self.gameBoard.close_private_conversation(conv_id)
@@ -88,7 +91,7 @@ class FinaleReunionRound(VoteMechanicsMixin):
                                        
 
         #- action -#
-        executor = ThreadPoolExecutor()
+        executor = TaggedThreadPoolExecutor()
         wake_up_future = executor.submit(self._wake_up_round)
                 
         self._host_broadcast("In this last round, our eliminated players will return to cast the final vote to determine the winner of the game.")
@@ -94,7 +94,7 @@ class VoteMechanicsMixin(BaseRound):
         voter_names = [a.name for a in self.simulationEngine.agents]
         self._initialise_voting_widget(players_up_for_elimination, voter_names, theme="blood")
 
-        with ThreadPoolExecutor() as executor:
+        with TaggedThreadPoolExecutor() as executor:
             for agent in self.simulationEngine.agents:
                 future = executor.submit(self.vote_one_player_off, agent, players_up_for_elimination)
                 voting_futures.append(future)
@@ -1,6 +1,6 @@
 import random
 from collections import Counter
-from concurrent.futures import ThreadPoolExecutor
+from core.call_context import TaggedThreadPoolExecutor
 from typing import Optional, Sequence
 
 from gameplay_management.eliminations.vote_mechanicsMixin import VoteMechanicsMixin
@@ -34,7 +34,7 @@ class VoteElectLeader(VoteMechanicsMixin):
 
     def _collect_leader_votes(self, all_names: Sequence[str]):
         voting_futures = []
-        with ThreadPoolExecutor() as executor:
+        with TaggedThreadPoolExecutor() as executor:
             for agent in self.simulationEngine.agents:
                 future = executor.submit(self._vote_for_leader, agent, all_names)
                 voting_futures.append(future)
@@ -1,4 +1,6 @@
-from pydantic import Field, create_model
+from pydantic import Field
+from core.response_repair import clean_choice
+from models.schema_registry import cached_model
 from gameplay_management.games.game_mechanicsMixin import GameMechanicsMixin
 from models.player_models import DynamicModelFactory
 from prompts.gamePrompts import GamePromptLibrary
@@ -10,7 +12,7 @@ class GameTargetedChoice(GameMechanicsMixin):
 
     def get_error_model(self, message: str):
     # This creates a NEW class where the default value is your specific message
-        return create_model("Error", error_string=(str, message))
+        return cached_model("Error", error_string=(str, message))
     
     def get_error_string(self, model_class):
         if GamePromptLibrary.model_field_error in model_class.model_fields:
@@ -21,10 +23,7 @@ class GameTargetedChoice(GameMechanicsMixin):
         return str(target).strip().lower() if target is not None else ""
 
     def _clean_target_name(self, target: str):
-        if target is None:
-            return None
-        cleaned = str(target).strip()
-        return cleaned or None
+        return clean_choice(target)
     
     def run_targeted_round(self, game_intro, player_intro, game_instruction, logic_callback, response_model_callback, validate_name=True):
         self.gameBoard.host_broadcast(game_intro)
@@ -1,4 +1,4 @@
-from concurrent.futures import ThreadPoolExecutor
+from core.call_context import TaggedThreadPoolExecutor
 import random
 from gameplay_management.games.game_mechanicsMixin import GameMechanicsMixin
 from models.player_models import DynamicModelFactory
@@ -83,7 +83,7 @@ class GameGuess(GameMechanicsMixin):
         
         # --- Collect guesses in parallel (mirrors PD / vote patterns) ---------
         futures = []
-        with ThreadPoolExecutor() as executor:
+        with TaggedThreadPoolExecutor() as executor:
             for agent in self.simulationEngine.agents:
                 response_model = DynamicModelFactory.create_model_(
                     agent,
@@ -143,7 +143,7 @@ class GameGuess(GameMechanicsMixin):
         if len(incorrect) == 1:
             agents_for_response.append(incorrect[0][0])
         if agents_for_response:
-            with ThreadPoolExecutor() as executor:
+            with TaggedThreadPoolExecutor() as executor:
                 for player in agents_for_response:
                     future = executor.submit(self.turn_manager.respond_to, player, result_string)
                     reaction_futures.append((player, future))
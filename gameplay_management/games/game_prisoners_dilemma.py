@@ -1,4 +1,4 @@
-from concurrent.futures import ThreadPoolExecutor
+from core.call_context import TaggedThreadPoolExecutor
 from itertools import combinations
 from gameplay_management.games.game_mechanicsMixin import GameMechanicsMixin
 from models.player_models import DynamicModelFactory
@@ -107,7 +107,7 @@ class GamePrisonersDilemma(GameMechanicsMixin):
     def _execute_pair(self, agent0, agent1, nested_host_announcement = False):
         self._host_broadcast(f"{agent0.name} vs {agent1.name}. Split or Steal?\n", is_reply = nested_host_announcement)
 
-        with ThreadPoolExecutor() as executor:
+        with TaggedThreadPoolExecutor() as executor:
             future0 = executor.submit(self.get_split_or_steal, agent0, agent1)
             future1 = executor.submit(self.get_split_or_steal, agent1, agent0)
             results = [future0.result(), future1.result()]
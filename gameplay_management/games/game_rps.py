@@ -1,4 +1,4 @@
-from concurrent.futures import ThreadPoolExecutor
+from core.call_context import TaggedThreadPoolExecutor
 from gameplay_management.games.game_mechanicsMixin import GameMechanicsMixin
 from models.player_models import DynamicModelFactory
 from prompts.gamePrompts import GamePromptLibrary
@@ -80,7 +80,7 @@ class GameRockPaperScissors(GameMechanicsMixin):
         for agent0, agent1 in pairs:
             self.gameBoard.host_broadcast(f"{agent0.name} vs {agent1.name} — Rock, Paper, or Scissors?\n")
 
-            with ThreadPoolExecutor() as executor:
+            with TaggedThreadPoolExecutor() as executor:
                 future0 = executor.submit(self._get_rps_choice, agent0, agent1)
                 future1 = executor.submit(self._get_rps_choice, agent1, agent0)
                 results = [future0.result(), future1.result()]
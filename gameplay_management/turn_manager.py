@@ -1,6 +1,7 @@
 from __future__ import annotations
 from typing import TYPE_CHECKING, Literal, Optional
-from pydantic import Field, create_model
+from pydantic import Field
+from models.schema_registry import cached_model
 from models.player_models import DynamicModelFactory
 from prompts.gamePrompts import GamePromptLibrary
 
@@ -35,7 +36,7 @@ class TurnManager:
         existing_response_desc = model.model_fields["public_response"].description or ""
         updated_response_desc = existing_response_desc + f" Your optional response buffer is at: {buffer}. If you want to save it for later: Return null — do not write anything here, do not explain your choice or silence. "
 
-        return create_model(
+        return cached_model(
             model.__name__,
             __base__=model,
             private_thoughts=(str, Field(description=updated_thought_desc)),
@@ -117,10 +118,12 @@ class TurnManager:
             game_logic_fields=game_logic_fields
         )
 
+        # Only a broadcast reply is shown as it's written; anything else may be private.
         if optional:
-            result = self._basic_turn_optional(model, player, user_content)
+            result = self._basic_turn_optional(model, player, user_content, stream_public=broadcast)
         else:
-            result = player.take_turn_standard(user_content, self.gameBoard, model, instruction_override=instruction_override)
+            result = player.take_turn_standard(user_content, self.gameBoard, model, instruction_override=instruction_override,
+                                               stream_public=broadcast)
 
         if broadcast and result and result.public_response:
             directed_to_name = self._get_target_name_from_response(result) if include_target_name else None
@@ -167,7 +170,7 @@ class TurnManager:
 
     # --- Optional Response Mechanics ---
 
-    def _basic_turn_optional(self, model, agent, user_content_prompt):
+    def _basic_turn_optional(self, model, agent, user_content_prompt, stream_public = False):
         agent.optional_response_buffer = round(agent.optional_response_buffer + self._buffer_amount, 2)
         if agent.optional_response_buffer < 1:
             self._low_buffer_message(agent)
@@ -179,7 +182,7 @@ class TurnManager:
             f"Staying silent is free and lets the buffer accumulate for higher-value moments later.")
         user_content_prompt += f"\n{optional_response_prompt}\n"
 
-        result = agent.take_turn_standard(user_content_prompt, self.gameBoard, model)
+        result = agent.take_turn_standard(user_content_prompt, self.gameBoard, model, stream_public=stream_public)
         if result.public_response:
             agent.optional_response_buffer = round(agent.optional_response_buffer - 1, 2)
             self.base_manager.debug_print(f"{agent.name} spends buffer - new buffer: {agent.optional_response_buffer} ")
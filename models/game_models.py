@@ -1,5 +1,6 @@
 from typing import Literal
-from pydantic import BaseModel, Field, create_model
+from pydantic import BaseModel, Field
+from models.schema_registry import cached_model
 
 class SummariseRoundBasic(BaseModel):
     round_summary: str = Field(description="A summary of the round to give to each player")
@@ -8,7 +9,7 @@ class DynamicGameModelFactory:
     #depreciate i guess... altho why isnt it better here?
     @classmethod
     def choose_agent_based_on_parameter(cls, allowed_names, parameter: str):
-        return create_model("ChooseAgentBasedOnParameter",
+        return cached_model("ChooseAgentBasedOnParameter",
             nameToChoose=(Literal[tuple(allowed_names)], Field(
                 description=f"The exact name of the agent to choose. Only the players in the allowed names are valid. "
                 f"Allowed names: {allowed_names}. The parameter for choosing: {parameter}")),
@@ -17,7 +18,7 @@ class DynamicGameModelFactory:
         
     @classmethod
     def cycle_game_compression_model(cls):
-        return create_model("cycle_game_compression",
+        return cached_model("cycle_game_compression",
             summary=(str, Field(description=(
                 "Summarise the marked game text. "
                 "For each player: what did they say or do, who did they advocate for or against- include the emotional reasoning behind their decision. "
@@ -28,13 +29,13 @@ class DynamicGameModelFactory:
     
     @classmethod
     def select_players_model(cls, names):
-        return create_model("selection",
+        return cached_model("selection",
             summary=(str, Field(description=("Based on the question, what names do you think qualify? ")))
         )
     
     @classmethod
     def choose_multiple_agents(cls, allowed_names: list[str], parameter: str, max_choices: int):
-        return create_model("ChooseMultipleAgents",
+        return cached_model("ChooseMultipleAgents",
             namesToChoose=(
                 list[Literal[tuple(allowed_names)]], # The list containing your dynamic literal
                 Field(
@@ -56,7 +57,7 @@ class DynamicGameModelFactory:
                 field_name = f"reasoning_analysis_{i}"
                 dynamic_fields[field_name] = (str, Field(description=prompt))
 
-        return create_model(
+        return cached_model(
             "host_script",
             thought_process=(str, Field(description="What's your creative process and intent?")),
             **dynamic_fields,  # Unpack the dynamic COT prompts here
@@ -1,6 +1,7 @@
 from typing import Dict, List, Literal, Optional, Type, TYPE_CHECKING
-from pydantic import BaseModel, Field, create_model, field_validator, validator
+from pydantic import BaseModel, Field, field_validator, validator
 from prompts.prompts import PromptLibrary
+from models.schema_registry import cached_model
 
 import warnings
 if TYPE_CHECKING:
@@ -24,7 +25,7 @@ class DynamicModelFactory:
         pub_prompt = public_response_prompt or PromptLibrary.desc_message
         ordered_fields["public_response"] = (str, Field(description=pub_prompt))
         ordered_fields["private_thoughts"] = (str, Field(description="Private thoughts..."))
-        return create_model('human_model', **ordered_fields)
+        return cached_model('human_model', **ordered_fields)
         
     
     @classmethod
@@ -95,7 +96,7 @@ class DynamicModelFactory:
         if agent_complex_fields:
             ordered_fields.update(agent_complex_fields)
 
-        return create_model(model_name, **ordered_fields)
+        return cached_model(model_name, **ordered_fields)
     
 
      
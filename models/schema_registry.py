@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import copy
+import threading
+import weakref
+from collections import OrderedDict
+
+from pydantic import BaseModel, create_model
+
+# Generated JSON schemas, one per registered class. Weak so evicted classes can go.
+_json_schemas: "weakref.WeakKeyDictionary[type, dict]" = weakref.WeakKeyDictionary()
+
+
+class RegisteredModel(BaseModel):
+    """
+    Base for every registry-built response model. The JSON schema is generated
+    once per class and handed out as a copy afterwards — the genai SDK asks for
+    it on every call and then rewrites the dict in place, so it can't be shared.
+    """
+
+    @classmethod
+    def model_json_schema(cls, *args, **kwargs):
+        if args or kwargs:
+            return super().model_json_schema(*args, **kwargs)
+        schema = schema_registry.json_schema(cls)
+        if schema is None:
+            schema = schema_registry.store_json_schema(cls, super().model_json_schema())
+        return copy.deepcopy(schema)
+
+
+class SchemaRegistry:
+    """
+    Hands back an already-built response model when the same field spec is
+    requested again. The signature covers the model name, base, field order,
+    annotations and each FieldInfo (description, defaults, constraints), so
+    anything that would change the schema changes the key.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.schema_hits = 0
+        self.schema_misses = 0
+        self._models: OrderedDict[tuple, type[BaseModel]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def model(self, model_name: str, __base__=None, **fields) -> type[BaseModel]:
+        key = (model_name, __base__, tuple((name, *_spec_key(spec)) for name, spec in fields.items()))
+        with self._lock:
+            cached = self._models.get(key)
+            if cached is not None:
+                self._models.move_to_end(key)
+                self.hits += 1
+                return cached
+        base = RegisteredModel if __base__ is None else _with_registered_base(__base__)
+        built = create_model(model_name, __base__=base, **fields)
+        with self._lock:
+            self.misses += 1
+            self._models[key] = built
+            while len(self._models) > self.max_entries:
+                self._models.popitem(last=False)
+        return built
+
+    def json_schema(self, cls: type) -> dict | None:
+        """The stored JSON schema for cls, counted as a hit, or None."""
+        with self._lock:
+            schema = _json_schemas.get(cls)
+            if schema is not None:
+                self.schema_hits += 1
+            return schema
+
+    def store_json_schema(self, cls: type, schema: dict) -> dict:
+        """Keep cls's freshly built schema (or one another thread stored first) and count the miss."""
+        with self._lock:
+            self.schema_misses += 1
+            return _json_schemas.setdefault(cls, schema)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            schema_lookups = self.schema_hits + self.schema_misses
+            return {
+                "models": len(self._models),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "schema_hit_rate": round(self.schema_hits / schema_lookups, 3) if schema_lookups else 0.0,
+            }
+
+
+def _spec_key(spec) -> tuple:
+    annotation, info = spec if isinstance(spec, tuple) else (spec, ...)
+    # Classes compare by identity (two dynamic models can share a name); everything else by repr.
+    annotation_key = annotation if isinstance(annotation, type) else repr(annotation)
+    return annotation_key, repr(info)
+
+
+def _with_registered_base(base):
+    bases = base if isinstance(base, tuple) else (base,)
+    if any(isinstance(b, type) and issubclass(b, RegisteredModel) for b in bases):
+        return base
+    return (*bases, RegisteredModel)
+
+
+# ── module-level singleton ───────────────────────────────────────────────────
+schema_registry = SchemaRegistry()
+
+
+def cached_model(model_name: str, __base__=None, **fields) -> type[BaseModel]:
+    """Drop-in for pydantic.create_model that reuses identical models."""
+    return schema_registry.model(model_name, __base__, **fields)
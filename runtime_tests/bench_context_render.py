@@ -0,0 +1,78 @@
+"""
+Context-building micro-benchmark: one discussion-heavy phase (12 players,
+6 rounds by default), building each speaker's transcript context before
+every turn, with ContextBuilder's round render cache on and off.
+
+    python runtime_tests/bench_context_render.py
+    python runtime_tests/bench_context_render.py --players 12 --rounds 6 --turns-per-player 4
+
+Off renders every round of the phase from scratch on every turn, so the
+cost per turn grows with the phase; on, it grows only with the new messages.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from core.gameboard import GameBoard
+from core.game_context.user_content import UserContent
+from core.sinks.game_sink import NoopGameSink
+
+
+def play(args, cached: bool) -> tuple[list[float], int, dict | None]:
+    rng = random.Random(args.seed)
+    board = GameBoard(NoopGameSink())
+    board.phase_runner = SimpleNamespace(simulation_engine=SimpleNamespace(agents=[]))
+    if not cached:
+        board.context_builder.render_cache = None
+    players = [SimpleNamespace(name=f"Player{i}", phase_summaries_string=lambda: "") for i in range(args.players)]
+    words = "deal vote trust alliance points round steal give target plan".split()
+
+    per_round_ms, chars = [], 0
+    board.new_phase()
+    for _ in range(args.rounds):
+        board.newRound()
+        board.host_broadcast("A new round of discussion begins. Make your case.")
+        elapsed = 0.0
+        for _ in range(args.turns_per_player):
+            for player in players:
+                dash = []
+                start = time.perf_counter()
+                UserContent.append_game_context(dash, player, board)
+                elapsed += time.perf_counter() - start
+                chars += sum(len(d) for d in dash)
+                message = " ".join(rng.choice(words) for _ in range(args.words))
+                board.broadcast_public_action(player.name, message)
+            speaker = rng.choice(players)
+            convo = board.log_new_restricted_conversation(["Host", speaker.name], "Host", "A quiet word?")
+            board.log_message_to_conversation(convo, speaker.name, "Go on.")
+            board.close_private_conversation(convo, silent=True)
+        per_round_ms.append(elapsed * 1000)
+        board.game_log.close_round()
+    render_cache = board.context_builder.render_cache
+    return per_round_ms, chars, render_cache.stats() if render_cache else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time per-turn context building with and without the render cache.")
+    parser.add_argument("--players", type=int, default=12)
+    parser.add_argument("--rounds", type=int, default=6)
+    parser.add_argument("--turns-per-player", type=int, default=4)
+    parser.add_argument("--words", type=int, default=60, help="words per message")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    turns = args.players * args.turns_per_player
+    print(f"{args.players} players · {args.rounds} rounds · {turns} turns per round")
+    results = {}
+    for label, cached in (("off", False), ("on", True)):
+        per_round_ms, chars, stats = play(args, cached)
+        results[label] = chars
+        rounds = "  ".join(f"{ms / turns:6.2f}" for ms in per_round_ms)
+        print(f"  cache {label:<3}  total {sum(per_round_ms):8.1f}ms   ms/turn by round: {rounds}")
+        if stats:
+            print(f"             {stats['entries_rendered']:,} entries rendered for {stats['renders']:,} round renders")
+    assert results["on"] == results["off"], "cached and uncached contexts differ in size"
@@ -0,0 +1,94 @@
+"""
+Prompt-layout benchmark: plays the same synthetic games with the classic
+layout and with stable_first, explicit prompt caching off, and reports how
+much of each caller's prompt the provider's implicit prefix cache served.
+
+    python runtime_tests/bench_prompt_layout.py
+    python runtime_tests/bench_prompt_layout.py --games 2 --players 8 --time-scale 0.005
+
+Cache hits come from the SyntheticBackend's implicit-cache model (matching
+leading blocks of recent prompts), so the numbers compare layouts rather than
+predict the real API's hit rate.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+LAYOUTS = ["classic", "stable_first"]
+
+
+def _play(args) -> dict:
+    """One layout, in this process: play the games and return the per-caller summary."""
+    os.environ["LLM_PROMPT_LAYOUT"] = args.mode
+    os.environ["LLM_PROMPT_CACHE"] = "off"  # implicit caching only
+    from core.api_client import api_client
+    from core.bootstrap import create_engine
+    from core.levels.level_registry import phase_factory_for_id
+    from core.sinks.game_sink import NoopGameSink
+    from core.synthetic_backend import SyntheticBackend
+
+    backend = SyntheticBackend(time_scale=args.time_scale, seed=args.seed, optional_fill_rate=args.optional_fill_rate)
+
+    def game():
+        engine = create_engine(NoopGameSink(), number_of_players=args.players, generic_players=True, client=backend,
+                               phase_factory=phase_factory_for_id(args.level), level_id=args.level)
+        engine.run()
+
+    threads = [threading.Thread(target=game) for _ in range(args.games)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return api_client.summary()["by_caller"]
+
+
+def _run_mode(mode: str, args) -> dict:
+    # A fresh process per layout, so the shared api_client's stats and the backend's cache start empty.
+    cmd = [sys.executable, __file__, "--mode", mode, "--games", str(args.games), "--players", str(args.players),
+           "--level", args.level, "--time-scale", str(args.time_scale), "--seed", str(args.seed),
+           "--optional-fill-rate", str(args.optional_fill_rate)]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _print_table(results: dict[str, dict]) -> None:
+    callers = sorted({c for by_caller in results.values() for c in by_caller})
+    print(f"\n{'caller':<40} {'layout':<13} {'calls':>5} {'prompt tok/call':>15} {'cached':>7}")
+    for caller in callers:
+        for mode, by_caller in results.items():
+            s = by_caller.get(caller)
+            if not s:
+                continue
+            print(f"{caller:<40} {mode:<13} {s['calls']:>5} {s['prompt_tokens'] / s['calls']:>15.0f}"
+                  f" {s['cache_hit_rate']:>7.0%}")
+    print()
+    for mode, by_caller in results.items():
+        prompt = sum(s["prompt_tokens"] for s in by_caller.values())
+        cached = sum(s["cached_tokens"] for s in by_caller.values())
+        print(f"{mode:<13} {prompt:>10,} prompt tokens · {cached / prompt if prompt else 0:.0%} cached")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare implicit prompt-cache hit rates across prompt layouts.")
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--level", default="beginner")
+    parser.add_argument("--time-scale", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--optional-fill-rate", type=float, default=0.05,
+                        help="share of optional response fields (persona/strategy updates, …) the synthetic model fills")
+    parser.add_argument("--mode", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        import contextlib
+        with contextlib.redirect_stdout(sys.stderr):  # keep the game's chatter off the result line
+            result = _play(args)
+        print(json.dumps(result))
+    else:
+        _print_table({mode: _run_mode(mode, args) for mode in LAYOUTS})
@@ -0,0 +1,92 @@
+"""
+Thinking-policy benchmark: plays the same synthetic games with the policy
+off (model defaults — the old behaviour) and with each named policy, and
+reports latency and completion/thought tokens per call category.
+
+    python runtime_tests/bench_thinking_policy.py
+    python runtime_tests/bench_thinking_policy.py --policies lean standard --games 2 --time-scale 0.01
+    python runtime_tests/bench_thinking_policy.py --logs logs/api_logs/api_calls_*.jsonl
+
+Against the SyntheticBackend a budget only moves thought tokens and latency
+(see THINKING_TOK_PER_S); run with real logs for realistic base latencies.
+"""
+import argparse
+import glob
+import json
+import os
+import subprocess
+import sys
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _play(args) -> dict:
+    """One mode, in this process: play the games and return the per-category summary."""
+    os.environ["LLM_THINKING_POLICY"] = args.mode
+    from core.api_client import api_client
+    from core.bootstrap import create_engine
+    from core.levels.level_registry import phase_factory_for_id
+    from core.sinks.game_sink import NoopGameSink
+    from core.synthetic_backend import SyntheticBackend
+
+    kwargs = dict(time_scale=args.time_scale, seed=args.seed)
+    log_paths = [p for pattern in (args.logs or []) for p in glob.glob(pattern)]
+    backend = SyntheticBackend.from_api_logs(log_paths, **kwargs) if log_paths else SyntheticBackend(**kwargs)
+
+    def game():
+        engine = create_engine(NoopGameSink(), number_of_players=args.players, generic_players=True, client=backend,
+                               phase_factory=phase_factory_for_id(args.level), level_id=args.level)
+        engine.run()
+
+    threads = [threading.Thread(target=game) for _ in range(args.games)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return api_client.summary()["by_category"]
+
+
+def _run_mode(mode: str, args) -> dict:
+    # A fresh process per mode, so the shared api_client's stats start empty.
+    cmd = [sys.executable, __file__, "--mode", mode, "--games", str(args.games), "--players", str(args.players),
+           "--level", args.level, "--time-scale", str(args.time_scale), "--seed", str(args.seed)]
+    if args.logs:
+        cmd += ["--logs", *args.logs]
+    out = subprocess.run(cmd, capture_output=True, text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def _print_table(results: dict[str, dict]) -> None:
+    categories = sorted({c for by_category in results.values() for c in by_category})
+    print(f"\n{'category':<10} {'mode':<9} {'calls':>5} {'p50 ms':>7} {'p90 ms':>7} {'out tok/call':>12} {'thought tok/call':>16}")
+    for category in categories:
+        for mode, by_category in results.items():
+            s = by_category.get(category)
+            if not s:
+                continue
+            calls = s["calls"]
+            print(f"{category:<10} {mode:<9} {calls:>5} {s['latency_ms']['p50']:>7} {s['latency_ms']['p90']:>7}"
+                  f" {s['completion_tokens'] / calls:>12.0f} {s['thought_tokens'] / calls:>16.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare thinking policies per call category.")
+    parser.add_argument("--policies", nargs="*", default=["lean", "standard", "deep"])
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--level", default="beginner")
+    parser.add_argument("--time-scale", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--logs", nargs="*", default=None)
+    parser.add_argument("--mode", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        import contextlib
+        with contextlib.redirect_stdout(sys.stderr):  # keep the game's chatter off the result line
+            result = _play(args)
+        print(json.dumps(result))
+    else:
+        results = {mode: _run_mode(mode, args) for mode in ["off", *args.policies]}
+        _print_table(results)
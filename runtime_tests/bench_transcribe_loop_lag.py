@@ -0,0 +1,100 @@
+"""
+Event-loop lag while transcribing: the old /api/transcribe handler (a
+blocking call inside the async handler) against the new one (awaiting
+api_client.atranscribe, which runs on the API client's own loop).
+
+    python runtime_tests/bench_transcribe_loop_lag.py
+    python runtime_tests/bench_transcribe_loop_lag.py --requests 8 --latency 1.5 --clip-s 90
+
+The fake model takes --latency seconds per request however long the clip is,
+so a long WAV split on its pauses also shows the parallel speed-up.
+"""
+import argparse
+import asyncio
+import io
+import math
+import os
+import sys
+import time
+import wave
+from array import array
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from core.api_client import APIClient
+from core.loop_monitor import LoopLagMonitor
+
+
+class SlowTranscriber:
+    def __init__(self, latency_s: float):
+        self.latency_s = latency_s
+        self.models = SimpleNamespace(generate_content=self._generate)
+        self.aio = SimpleNamespace(models=SimpleNamespace(generate_content=self._agenerate))
+
+    def _generate(self, model, contents, config=None):
+        time.sleep(self.latency_s)
+        return SimpleNamespace(text="words")
+
+    async def _agenerate(self, model, contents, config=None):
+        await asyncio.sleep(self.latency_s)
+        return SimpleNamespace(text="words")
+
+
+def speech_like_wav(seconds: float, rate: int = 16000) -> bytes:
+    """Four seconds of tone, half a second of quiet, over and over."""
+    samples = array("h", (
+        int(8000 * math.sin(2 * math.pi * 220 * i / rate)) if (i / rate) % 4.5 < 4.0 else 0
+        for i in range(int(seconds * rate))
+    ))
+    if sys.byteorder == "big":
+        samples.byteswap()
+    out = io.BytesIO()
+    with wave.open(out, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(samples.tobytes())
+    return out.getvalue()
+
+
+async def _measure(label, handler, requests):
+    monitor = LoopLagMonitor(interval_s=0.02)
+    monitor.start()
+    start = time.monotonic()
+    await asyncio.gather(*(handler() for _ in range(requests)))
+    wall = time.monotonic() - start
+    await asyncio.sleep(0.05)
+    monitor.stop()
+    lag = monitor.stats()
+    print(f"  {label:<34} wall {wall:5.1f}s   loop lag p50/p99/max {lag['p50']}/{lag['p99']}/{lag['max']}ms")
+
+
+async def main(args):
+    backend = SlowTranscriber(args.latency)
+    api = APIClient()
+    api._client = backend
+    api._default_model = "bench-model"
+    clip = speech_like_wav(args.clip_s)
+
+    async def blocking_handler():
+        # What the endpoint used to do: a synchronous SDK call on the server loop.
+        return backend.models.generate_content(model="bench-model", contents=[clip])
+
+    async def webm_handler():
+        return await api.atranscribe(clip, "audio/webm", hints=["Alice"])
+
+    async def wav_handler():
+        return await api.atranscribe(clip, "audio/wav", hints=["Alice"])
+
+    print(f"{args.requests} concurrent requests, {args.clip_s:.0f}s clip, {args.latency}s per model call")
+    await _measure("before: blocking call in handler", blocking_handler, args.requests)
+    await _measure("after: atranscribe, whole clip", webm_handler, args.requests)
+    await _measure("after: atranscribe, split on silence", wav_handler, args.requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare server event-loop lag for the transcription paths.")
+    parser.add_argument("--requests", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=1.0)
+    parser.add_argument("--clip-s", type=float, default=60.0)
+    asyncio.run(main(parser.parse_args()))
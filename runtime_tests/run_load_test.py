@@ -0,0 +1,75 @@
+"""
+Offline load test: runs whole games against the SyntheticBackend — no network.
+
+    python runtime_tests/run_load_test.py                      # 1 game, default latency profile
+    python runtime_tests/run_load_test.py --games 5            # 5 concurrent games, like the server
+    python runtime_tests/run_load_test.py --logs logs/api_logs/api_calls_*.jsonl --time-scale 0.1
+    python runtime_tests/run_load_test.py --rate-limit-rate 0.05 --timeout-rate 0.01
+    python runtime_tests/run_load_test.py --batch              # phase summaries etc. via the local batch stand-in
+"""
+import argparse
+import glob
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+from core.bootstrap import create_engine
+from core.api_client import api_client
+from core.levels.level_registry import phase_factory_for_id
+from core.sinks.game_sink import NoopGameSink
+from core.synthetic_backend import SyntheticBackend
+
+
+def _run_game(backend, players, level_id, results, index):
+    start = time.monotonic()
+    try:
+        engine = create_engine(NoopGameSink(), number_of_players=players, generic_players=True, client=backend,
+                               phase_factory=phase_factory_for_id(level_id), level_id=level_id)
+        engine.run()
+        results[index] = ("ok", time.monotonic() - start)
+    except Exception as e:
+        results[index] = (f"failed: {e!r}", time.monotonic() - start)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test the engine against a synthetic LLM backend.")
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--players", type=int, default=6)
+    parser.add_argument("--level", default="beginner", help="Level id from core.levels (the default factory has an interactive round)")
+    parser.add_argument("--logs", nargs="*", default=None, help="api_calls_*.jsonl files to take latency/token profiles from")
+    parser.add_argument("--time-scale", type=float, default=0.05, help="Multiply every sampled latency (1.0 = real time)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0)
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--batch", action="store_true", help="Send non-interactive fan-outs through the local batch stand-in")
+    args = parser.parse_args()
+    if args.batch:
+        os.environ["LLM_BATCH"] = "local"
+
+    backend_kwargs = dict(
+        time_scale=args.time_scale,
+        rate_limit_rate=args.rate_limit_rate,
+        timeout_rate=args.timeout_rate,
+        seed=args.seed,
+    )
+    log_paths = [p for pattern in (args.logs or []) for p in glob.glob(pattern)]
+    if log_paths:
+        backend = SyntheticBackend.from_api_logs(log_paths, **backend_kwargs)
+    else:
+        backend = SyntheticBackend(**backend_kwargs)
+
+    results = [None] * args.games
+    threads = [threading.Thread(target=_run_game, args=(backend, args.players, args.level, results, i)) for i in range(args.games)]
+    wall_start = time.monotonic()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.monotonic() - wall_start
+
+    for i, (status, seconds) in enumerate(results):
+        print(f"game {i}: {status} in {seconds:.1f}s")
+    print(f"{args.games} game(s), {backend.calls} synthetic calls, {wall:.1f}s wall clock")
+    api_client.print_summary()
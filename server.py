@@ -2,6 +2,7 @@ import asyncio
 import json
 import os
 import threading
+from contextlib import asynccontextmanager
 from datetime import date
 
 from dotenv import load_dotenv
@@ -12,10 +13,22 @@ from core.sinks.websocket_sink import WebSocketSink
 from runtime_tests.demo_runner import DEMO_REGISTRY
 from core.api_client import api_client
 from core.levels.level_registry import phase_factory_for_id
+from core.loop_monitor import LoopLagMonitor
 
 load_dotenv()
 
-app = FastAPI()
+# How late the server loop wakes up — blocking work in a handler stalls every game's socket.
+_loop_lag = LoopLagMonitor()
+
+
+@asynccontextmanager
+async def lifespan(app):
+    _loop_lag.start()
+    yield
+    _loop_lag.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Feature flags — set to True to enable before publishing
 GAME_ENABLED = True
@@ -49,7 +62,8 @@ async def status():
         "games_today": _games_today,
         "cap": DAILY_CAP,
         "date": _limit_date.isoformat(),
-        "remaining": max(0, DAILY_CAP - _games_today)
+        "remaining": max(0, DAILY_CAP - _games_today),
+        "loop_lag_ms": _loop_lag.stats(),
     }
     
 
@@ -65,15 +79,29 @@ app.add_middleware(
 # Transcribe endpoint
 # ---------------------------------------------------------------------------
 
+MAX_AUDIO_BYTES = 10 * 1024 * 1024  # 10 MB
+AUDIO_READ_CHUNK = 256 * 1024
+
+
+async def _read_capped(upload: UploadFile, limit: int) -> bytes | None:
+    """Read the upload a chunk at a time; None as soon as it passes limit."""
+    buffer = bytearray()
+    while chunk := await upload.read(AUDIO_READ_CHUNK):
+        buffer += chunk
+        if len(buffer) > limit:
+            return None
+    return bytes(buffer)
+
+
 @app.post("/api/transcribe")
 async def transcribe(audio: UploadFile = File(...), names: str = Form("")):
     from fastapi import HTTPException
-    MAX_AUDIO_BYTES = 10 * 1024 * 1024  # 10 MB
-    audio_bytes = await audio.read(MAX_AUDIO_BYTES + 1)
-    if len(audio_bytes) > MAX_AUDIO_BYTES:
+    audio_bytes = await _read_capped(audio, MAX_AUDIO_BYTES)
+    if audio_bytes is None:
         raise HTTPException(status_code=413, detail="Audio file too large (max 10 MB)")
     hints = json.loads(names) if names else None
-    text = api_client.transcribe(audio_bytes, audio.content_type or "audio/webm", hints=hints)
+    # Runs on the API client's loop, so this loop keeps serving the games' sockets meanwhile.
+    text = await api_client.atranscribe(audio_bytes, audio.content_type or "audio/webm", hints=hints)
     return {"text": text}
 
 # ---------------------------------------------------------------------------
@@ -184,9 +212,10 @@ async def game_ws(websocket: WebSocket):
             try:
                 from core.bootstrap import create_engine
                 if player_names:
-                    engine = create_engine(sink, names=player_names, phase_factory=phase_factory)
+                    engine = create_engine(sink, names=player_names, phase_factory=phase_factory, level_id=level_id)
                 else:
-                    engine = create_engine(sink, number_of_players=7, generic_players=False, phase_factory=phase_factory)
+                    engine = create_engine(sink, number_of_players=7, generic_players=False, phase_factory=phase_factory,
+                                           level_id=level_id)
                 engine.run(human_player_name=human_player_name)
             except Exception as e:
                 asyncio.run_coroutine_threadsafe(
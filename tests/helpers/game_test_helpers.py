@@ -36,7 +36,7 @@ class TestGameSink:
     def on_phase_header(self, phase_number): pass
     def on_phase_intro(self, host_text, summary_text): pass
     def on_round_start(self, round_number, scores): pass
-    def on_round_summary(self, summary): pass
+    def on_round_summary(self, round_number, summary): pass
     def on_turn_header(self, turn_number): pass
     def on_public_action(self, speaker, message, color="", animate=True, directed_to_name=None, is_reply=False): pass
     def on_private_thought(self, speaker, message): pass
@@ -68,7 +68,7 @@ class NoopGameMaster:
     def summariseRound(self, *_args, **_kwargs):
         return SimpleNamespace(round_summary="")
 
-    def summarise_game_text(self, context, game_text):
+    def summarise_game_text(self, context, game_text, verbose=True):
         return "[test summary]"
 
 
@@ -0,0 +1,89 @@
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+from pydantic import BaseModel
+
+from core.api_client import APIClient
+
+
+class Reply(BaseModel):
+    public_response: str
+
+
+class FakeAioModels:
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.calls = []
+        self._lock = threading.Lock()
+
+    async def generate_content(self, model, contents, config):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            self.calls.append(model)
+        await asyncio.sleep(self.delay)
+        with self._lock:
+            self.in_flight -= 1
+        usage = SimpleNamespace(prompt_token_count=10, candidates_token_count=5, total_token_count=15)
+        return SimpleNamespace(text=json.dumps({"public_response": contents}), usage_metadata=usage)
+
+
+def _client(delay=0.0):
+    models = FakeAioModels(delay)
+    api = APIClient()
+    api._client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    api._default_model = "test-model"
+    return api, models
+
+
+def _messages(text):
+    return [{"role": "system", "content": "sys"}, {"role": "user", "content": text}]
+
+
+def test_sync_create_runs_through_async_transport():
+    api, models = _client()
+
+    result = api.create(Reply, _messages("hello"))
+
+    assert result.public_response == "hello"
+    assert models.calls == ["test-model"]
+    assert api.summary()["total_calls"] == 1
+
+
+def test_acreate_can_be_awaited_from_another_event_loop():
+    api, _models = _client()
+
+    result = asyncio.run(api.acreate(Reply, _messages("from elsewhere")))
+
+    assert result.public_response == "from elsewhere"
+
+
+def test_concurrency_is_capped_per_model():
+    api, models = _client(delay=0.05)
+    api.MAX_CONCURRENT_CALLS_PER_MODEL = 2
+
+    async def fan_out():
+        return await asyncio.gather(*(api.acreate(Reply, _messages(str(i))) for i in range(6)))
+
+    results = asyncio.run(fan_out())
+
+    assert [r.public_response for r in results] == [str(i) for i in range(6)]
+    assert models.max_in_flight == 2
+
+
+def test_summary_reports_percentiles_and_concurrency_per_model():
+    api, _models = _client(delay=0.02)
+
+    for i in range(5):
+        api.create(Reply, _messages(str(i)))
+    summary = api.summary()
+
+    stats = summary["by_model"]["test-model"]
+    assert stats["calls"] == 5 and stats["retries"] == 0
+    assert 15 <= stats["model_ms"]["p50"] <= stats["latency_ms"]["p99"]
+    assert stats["completion_tok_per_s"] > 0
+    assert summary["concurrency"]["all"]["peak"] == 1
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+from types import SimpleNamespace
+
+from pydantic import BaseModel
+
+import core.api_client as api_client_module
+from core.api_client import APIClient, APISession, session_scope
+from core.call_context import TaggedThreadPoolExecutor
+from core.log_writer import log_writer
+
+
+class Reply(BaseModel):
+    public_response: str
+
+
+class EchoModels:
+    async def generate_content(self, model, contents, config):
+        usage = SimpleNamespace(prompt_token_count=3, candidates_token_count=2, total_token_count=5)
+        return SimpleNamespace(text=json.dumps({"public_response": contents}), usage_metadata=usage)
+
+
+def _client():
+    api = APIClient()
+    api._client = SimpleNamespace(aio=SimpleNamespace(models=EchoModels()))
+    api._default_model = "test-model"
+    return api
+
+
+def _messages(text):
+    return [{"role": "system", "content": "sys"}, {"role": "user", "content": text}]
+
+
+def test_concurrent_games_only_see_their_own_calls(tmp_path):
+    api = _client()
+    sessions = [api.session(f"g{i}", log_path=str(tmp_path / f"g{i}.jsonl")) for i in range(2)]
+
+    def game(session, calls):
+        with session_scope(session), TaggedThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(lambda i: api.create(Reply, _messages(f"{session.name}-{i}")), range(calls)))
+
+    threads = [threading.Thread(target=game, args=(s, n)) for s, n in zip(sessions, (3, 5))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    log_writer.flush()
+
+    assert [s.summary()["total_calls"] for s in sessions] == [3, 5]
+    assert api.summary()["total_calls"] == 8
+    assert sorted(r.index for r in sessions[1].records) == list(range(5))
+    for session, calls in zip(sessions, (3, 5)):
+        lines = [json.loads(l) for l in open(session.log_path)]
+        assert sorted(line["index"] for line in lines) == list(range(calls))
+    assert sorted(r.index for r in api._records) == list(range(8))
+    assert sessions[0].summary()["session"] == "g0"
+
+
+def test_session_records_are_a_bounded_ring(monkeypatch, tmp_path):
+    monkeypatch.setattr(APISession, "RECENT_RECORDS", 4)
+    api = _client()
+    session = api.session("long", log_path=str(tmp_path / "long.jsonl"))
+
+    with session_scope(session):
+        for i in range(10):
+            api.create(Reply, _messages(str(i)))
+
+    assert [r.index for r in session.records] == [6, 7, 8, 9]
+    assert session.summary()["total_calls"] == 10
+    assert session.summary()["by_model"]["test-model"]["calls"] == 10
+
+
+def test_init_keeps_the_process_log_and_other_sessions(tmp_path):
+    api = _client()
+    api._log_path = str(tmp_path / "process.jsonl")
+    session = api.session("g1", log_path=str(tmp_path / "g1.jsonl"))
+
+    api.init(api._client, "test-model")
+
+    assert api._log_path == str(tmp_path / "process.jsonl")
+    with session_scope(session):
+        api.create(Reply, _messages("after init"))
+    assert session.summary()["total_calls"] == 1
+
+
+def test_each_session_calls_its_own_default_model(tmp_path):
+    api = _client()
+    session = api.session("g1", log_path=str(tmp_path / "g1.jsonl"), default_model="game-model")
+
+    with session_scope(session):
+        api.create(Reply, _messages("in game"))
+    api.create(Reply, _messages("outside"))
+
+    assert [r.model for r in api._records] == ["game-model", "test-model"]
+
+
+def test_old_logs_are_pruned_once_and_live_ones_never(monkeypatch, tmp_path):
+    monkeypatch.setattr(api_client_module, "LOG_DIR", str(tmp_path))
+    for i in range(30):
+        (tmp_path / f"api_calls_20000101_0000{i:02d}_old.jsonl").write_text("{}\n")
+        (tmp_path / f"api_calls_20000101_0000{i:02d}_old_summary.json").write_text("{}")
+    api = _client()
+    api._log_path = None
+    api.init(api._client, "test-model")  # the process log: prunes to the newest 25 of each
+
+    assert len(list(tmp_path.glob("*_old.jsonl"))) == 25
+    assert len(list(tmp_path.glob("*_summary.json"))) == 25
+
+    sessions = [api.session(f"g{i}") for i in range(30)]
+    for session in sessions:
+        with session_scope(session):
+            api.create(Reply, _messages(session.name))
+    api.create(Reply, _messages("process"))
+    log_writer.flush()
+
+    assert all(os.path.exists(s.log_path) for s in sessions) and os.path.exists(api._log_path)
+    assert len(list(tmp_path.glob("*_old.jsonl"))) == 25
+
+
+def test_a_second_engine_leaves_the_shared_default_model_alone(monkeypatch):
+    import core.bootstrap as bootstrap
+    import core.simulation_engine as simulation_engine
+    from core.sinks.game_sink import NoopGameSink
+
+    api = _client()
+    monkeypatch.setattr(bootstrap, "api_client", api)
+    monkeypatch.setattr(simulation_engine, "api_client", api)
+
+    first = bootstrap.create_engine(NoopGameSink(), number_of_players=2, generic_players=True,
+                                    client=api._client, model_name="test-model")
+    second = bootstrap.create_engine(NoopGameSink(), number_of_players=2, generic_players=True,
+                                     client=api._client, model_name="other-model")
+
+    assert api._default_model == "test-model"
+    assert [first.api_session.default_model, second.api_session.default_model] == ["test-model", "other-model"]
@@ -0,0 +1,116 @@
+import time
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from core.api_client import APIClient
+from core.batch_service import BatchPoll, GenaiBatchService, LocalBatchService
+from core.call_context import TaggedThreadPoolExecutor
+from core.synthetic_backend import CallProfile, LogNormal, SyntheticBackend
+
+
+class Summary(BaseModel):
+    brief_summary: str
+
+
+def _client(service=None):
+    backend = SyntheticBackend(default_profile=CallProfile(LogNormal(5, 5), LogNormal(20, 20)), seed=3)
+    api = APIClient()
+    api._client = backend
+    api._default_model = "test-model"
+    api.batch_service = service or LocalBatchService(backend)
+    return api, backend
+
+
+def _messages(i):
+    return [{"role": "system", "content": "sys"}, {"role": "user", "content": f"summarise phase for player {i}"}]
+
+
+class StuckService:
+    """Accepts jobs and never finishes them."""
+
+    def __init__(self):
+        self.cancelled = []
+
+    async def create(self, model, requests):
+        return "batches/stuck"
+
+    async def poll(self, job):
+        return BatchPoll()
+
+    async def cancel(self, job):
+        self.cancelled.append(job)
+
+
+def test_submitted_requests_share_one_job_and_resolve_as_futures(tmp_path):
+    api, backend = _client()
+    api.batch_service.root = str(tmp_path)
+
+    with api.batch(linger_s=0.05) as batch:
+        futures = [batch.submit(Summary, _messages(i)) for i in range(5)]
+        results = [f.result(timeout=10) for f in futures]
+
+    assert all(isinstance(r, Summary) for r in results)
+    assert api.summary()["batch"] == {"jobs": 1, "batched": 5, "fallbacks": 0}
+    assert api.summary()["total_calls"] == 5
+    [job] = list(tmp_path.iterdir())
+    assert len((job / "requests.jsonl").read_text().splitlines()) == 5
+    assert len((job / "results.jsonl").read_text().splitlines()) == 5
+
+
+def test_create_calls_on_executor_threads_join_the_batch():
+    api, backend = _client()
+
+    with api.batch(linger_s=0.05), TaggedThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda i: api.create(Summary, _messages(i)), range(4)))
+
+    assert len(results) == 4
+    assert api.summary()["batch"]["jobs"] == 1 and api.summary()["batch"]["batched"] == 4
+    # Outside the scope calls go straight out again.
+    api.create(Summary, _messages(9))
+    assert api.summary()["batch"]["batched"] == 4 and api.summary()["total_calls"] == 5
+
+
+def test_missed_deadline_falls_back_to_direct_calls():
+    service = StuckService()
+    api, backend = _client(service)
+
+    with api.batch(linger_s=0.01, poll_s=0.01, deadline_s=0.1) as batch:
+        results = [f.result(timeout=10) for f in [batch.submit(Summary, _messages(i)) for i in range(3)]]
+
+    assert all(isinstance(r, Summary) for r in results)
+    assert service.cancelled == ["batches/stuck"]
+    assert api.summary()["batch"] == {"jobs": 1, "batched": 0, "fallbacks": 3}
+    assert backend.calls == 3
+
+
+def test_stuck_batch_costs_the_configured_deadline_not_a_minute():
+    service = StuckService()
+    api, backend = _client(service)
+    api.batch_deadline_s = 0.2
+
+    start = time.monotonic()
+    with api.batch(linger_s=0.01, poll_s=0.01) as batch:
+        [f.result(timeout=10) for f in [batch.submit(Summary, _messages(i)) for i in range(2)]]
+
+    assert batch.deadline_s == 0.2
+    assert time.monotonic() - start < 5
+    assert api.summary()["batch"]["fallbacks"] == 2
+
+
+def test_a_service_slower_than_the_deadline_creates_no_job():
+    service = StuckService()
+    service.turnaround_s = 300.0
+    api, backend = _client(service)
+
+    with api.batch(linger_s=0.01) as batch:
+        result = api.create(Summary, _messages(0))
+
+    assert batch is None and isinstance(result, Summary)
+    assert api.summary()["batch"]["jobs"] == 0 and backend.calls == 1
+
+
+def test_genai_batches_refuse_a_vertex_client():
+    with pytest.raises(ValueError, match="Developer API"):
+        GenaiBatchService(SimpleNamespace(vertexai=True))
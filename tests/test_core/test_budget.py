@@ -0,0 +1,108 @@
+import json
+from types import SimpleNamespace
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from agents.base_agent import BaseAgent
+from core.api_client import APIClient
+from core.budget import BudgetLevel, GameBudget, budget_scope, heuristic_response, lean_model
+
+
+class Turn(BaseModel):
+    private_thoughts: str
+    public_response: str
+    vote: Literal["Ann", "Bob"]
+    lessons: list[str] = Field(min_length=2)
+    lifeLesson: Optional[str] = None
+
+
+class CountingModels:
+    def __init__(self):
+        self.calls = []
+
+    async def generate_content(self, model, contents, config):
+        self.calls.append((model, config.response_schema))
+        usage = SimpleNamespace(prompt_token_count=60, candidates_token_count=40, total_token_count=100)
+        reply = {"private_thoughts": "t", "public_response": "p", "vote": "Ann", "lessons": ["a", "b"]}
+        shown = config.response_schema.model_json_schema()["properties"]
+        text = json.dumps({name: value for name, value in reply.items() if name in shown})
+        return SimpleNamespace(text=text, usage_metadata=usage)
+
+
+class Agent(BaseAgent):
+    def _system_prompt(self, gameBoard):
+        return "sys"
+
+
+def _agent():
+    models = CountingModels()
+    api = APIClient()
+    api._client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    api._default_model = "base"
+    return Agent("Ann", "base", higher_model_name="higher", client=api), models
+
+
+def test_levels_step_down_as_the_budget_is_spent():
+    seen = []
+    budget = GameBudget(max_calls=10)
+    budget.listener = seen.append
+
+    for expected in [BudgetLevel.NORMAL] * 6 + [BudgetLevel.NO_UPGRADES] * 2 + [BudgetLevel.LEAN, BudgetLevel.HEURISTIC]:
+        budget.charge(10)
+        assert budget.level == expected
+    assert [s["level"] for s in seen] == ["no_upgrades", "lean", "heuristic"]
+
+
+def test_lean_model_drops_optional_fields_from_the_schema_and_heuristic_is_schema_valid():
+    lean = lean_model(Turn)
+    assert set(lean.model_json_schema()["properties"]) == {"private_thoughts", "public_response", "vote", "lessons"}
+    # Callers can still read the optional fields, at their defaults.
+    parsed = lean.model_validate({"private_thoughts": "t", "public_response": "p", "vote": "Ann", "lessons": ["a", "b"]})
+    assert parsed.lifeLesson is None
+
+    response = heuristic_response(Turn)
+    assert response.vote in ("Ann", "Bob")
+    assert len(response.lessons) == 2
+    assert response.lifeLesson is None
+
+
+def test_get_response_degrades_and_charges_the_scoped_budget():
+    agent, models = _agent()
+    budget = GameBudget(max_tokens=1000, no_upgrades_at=0.1, lean_at=0.2, heuristic_at=0.3)
+
+    with budget_scope(budget):
+        agent.use_higher_model = True
+        agent.get_response("u", Turn, None)   # normal: upgrade honoured
+        agent.use_higher_model = True
+        agent.get_response("u", Turn, None)   # no upgrades
+        agent.get_response("u", Turn, None)   # lean
+        response = agent.get_response("u", Turn, None)  # heuristic, no call
+
+    assert [m for m, _ in models.calls] == ["higher", "base", "base"]
+    assert "lifeLesson" not in models.calls[2][1].model_json_schema()["properties"]
+    assert response.public_response == "..."
+    assert budget.tokens_used == 300 and budget.calls_used == 3
+    assert budget.heuristic_responses == 1
+
+
+def test_an_optional_turn_runs_under_lean():
+    from gameplay_management.turn_manager import TurnManager
+
+    agent, models = _agent()
+    agent.optional_response_buffer = 1
+    agent.take_turn_standard = lambda user_content, gameBoard, model, **kwargs: agent.get_response(user_content, model, gameBoard)
+    manager = TurnManager(SimpleNamespace(gameBoard=None, debug_print=lambda *a: None))
+    manager._buffer_amount = 0.5
+
+    class OptionalTurn(BaseModel):
+        private_thoughts: str
+        public_response: str
+
+    budget = GameBudget(max_calls=10, lean_at=0.0)
+    with budget_scope(budget):
+        result = manager._basic_turn_optional(OptionalTurn, agent, "u")
+
+    assert "public_response" not in models.calls[0][1].model_json_schema()["properties"]
+    assert result.public_response is None
+    assert agent.optional_response_buffer == 1.5
@@ -0,0 +1,63 @@
+import json
+from types import SimpleNamespace
+
+from pydantic import BaseModel
+
+from core.api_client import APIClient
+from core.call_context import TaggedThreadPoolExecutor, call_tags, current_tags
+
+
+class Reply(BaseModel):
+    public_response: str
+
+
+class EchoModels:
+    async def generate_content(self, model, contents, config):
+        usage = SimpleNamespace(prompt_token_count=3, candidates_token_count=2, total_token_count=5)
+        return SimpleNamespace(text=json.dumps({"public_response": contents}), usage_metadata=usage)
+
+
+def _client():
+    api = APIClient()
+    api._client = SimpleNamespace(aio=SimpleNamespace(models=EchoModels()))
+    api._default_model = "test-model"
+    return api
+
+
+def _messages(text):
+    return [{"role": "system", "content": "sys"}, {"role": "user", "content": text}]
+
+
+def test_call_tags_nest_and_reset():
+    with call_tags(game="g1", phase=1):
+        with call_tags(round="Discussion", agent=None):
+            assert current_tags() == {"game": "g1", "phase": 1, "round": "Discussion"}
+        assert current_tags() == {"game": "g1", "phase": 1}
+    assert current_tags() == {}
+
+
+def test_tags_follow_work_into_the_pool_and_onto_the_record():
+    api = _client()
+
+    def worker(name):
+        with call_tags(agent=name):
+            return api.create(Reply, _messages(name))
+
+    with call_tags(game="g1", round="Vote"), TaggedThreadPoolExecutor(max_workers=4) as executor:
+        list(executor.map(worker, ["Ann", "Bob", "Cat"]))
+
+    tags = sorted((r.tags for r in api._records), key=lambda t: t["agent"])
+    assert tags == [
+        {"game": "g1", "round": "Vote", "agent": "Ann"},
+        {"game": "g1", "round": "Vote", "agent": "Bob"},
+        {"game": "g1", "round": "Vote", "agent": "Cat"},
+    ]
+    assert api.summary()["by_round"]["Vote"]["calls"] == 3
+
+
+def test_caller_is_the_first_frame_outside_the_client():
+    api = _client()
+
+    api.create(Reply, _messages("hi"))
+
+    assert api._records[0].caller == "test_caller_is_the_first_frame_outside_the_client"
@@ -0,0 +1,30 @@
+import random
+
+from core.call_stats import ConcurrencyTracker, StreamingHistogram
+
+
+def test_histogram_percentiles_within_one_bucket():
+    rng = random.Random(3)
+    values = [rng.lognormvariate(7, 0.8) for _ in range(20_000)]
+    hist = StreamingHistogram()
+    for v in values:
+        hist.add(v)
+
+    ordered = sorted(values)
+    for pct in (50, 90, 99):
+        exact = ordered[int(pct / 100 * len(ordered)) - 1]
+        assert abs(hist.percentile(pct) - exact) / exact < StreamingHistogram.GROWTH - 1 + 0.01
+    assert len(hist.counts) < 300
+
+
+def test_concurrency_is_time_weighted():
+    tracker = ConcurrencyTracker()
+    tracker.enter(0.0)
+    tracker.enter(0.0)
+    tracker.exit(2.0)   # two in flight for 2s
+    tracker.exit(4.0)   # one in flight for 2s
+    summary = tracker.summary(8.0)  # idle for 4s
+
+    assert summary["peak"] == 2
+    assert summary["mean_in_flight"] == 0.75
+    assert summary["busy_fraction"] == 0.5
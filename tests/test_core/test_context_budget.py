@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+
+from agents.player import Debater
+from core.game_context.context_budget import CUT_MARKER, ContextBudget, fit_sections
+from core.game_context.user_content import UserContent
+from core.gameboard import GameBoard
+from core.sinks.game_sink import NoopGameSink
+
+NO_RESERVE = {}
+
+
+def test_sections_give_way_in_priority_order():
+    previous = [("old round " * 10, "old summary"), ("mid round " * 10, None), ("new round " * 10, "new summary")]
+    summaries = [["detailed phase 1 " * 5, "detailed phase 2 " * 5], ["brief 1 ", "brief 2 "]]
+
+    # Everything fits.
+    current, rounds, blocks = fit_sections(10_000, 0, "now", previous, summaries, NO_RESERVE)
+    assert (current, rounds, blocks) == ("now", [t for t, _ in previous], summaries[0])
+
+    # Room for the current round, the newest round whole, the oldest as a summary and brief phase summaries.
+    current, rounds, blocks = fit_sections(3 + 100 + 11 + 16, 0, "now", previous, summaries, NO_RESERVE)
+    assert rounds == ["old summary", "new round " * 10]
+    assert blocks == ["brief 1 ", "brief 2 "]
+
+    # Less still: the oldest phase summary goes before the newest.
+    current, rounds, blocks = fit_sections(3 + 100 + 11 + 8, 0, "now", previous, summaries, NO_RESERVE)
+    assert blocks == ["brief 2 "]
+
+
+def test_a_long_current_round_keeps_its_tail_and_leaves_the_reserve():
+    current = "\n".join(f"line {i}" for i in range(1000))
+    summaries = [["phase summary " * 5]]
+    text, rounds, blocks = fit_sections(1000, 0, current, [], summaries, {"phase_summaries": 0.2})
+
+    assert text.startswith(CUT_MARKER) and text.endswith("line 999")
+    assert blocks == summaries[0]
+    assert len(text) + len(blocks[0]) <= 1000
+
+
+def _board(budget):
+    board = GameBoard(NoopGameSink(), context_budget=budget)
+    board.phase_runner = SimpleNamespace(
+        removed_agent_names=lambda: [],
+        get_phase_progress_string=lambda: "Round 1 of 3",
+        simulation_engine=SimpleNamespace(agents=[]),
+    )
+    return board
+
+
+def _prompt_sizes(budget):
+    board = _board(budget)
+    players = [Debater(name, "persona", "budget-test-model") for name in ("Ann", "Bob", "Cat")]
+    board.initialize_agents(players)
+    sizes = []
+    for phase in range(1, 4):
+        board.new_phase()
+        for _ in range(4):
+            board.newRound()
+            for turn in range(10):
+                for player in players:
+                    sizes.append(len(UserContent.render(player, board, "Your turn.", None)))
+                    board.broadcast_public_action(player.name, f"{player.name} makes a long point {turn}. " * 8)
+            board.endRound(SimpleNamespace(round_summary=f"Phase {phase}: a round happened."))
+        for player in players:
+            player.phase_summaries_detailed[phase] = "A detailed account of the phase. " * 30
+            player.phase_summaries_brief[phase] = "The gist of the phase."
+    return sizes
+
+
+def test_budgeted_prompts_stay_flat_as_the_game_goes_on():
+    unbudgeted = _prompt_sizes(None)
+    budgeted = _prompt_sizes(ContextBudget(max_tokens=1500))
+    limit = 1500 * 4  # characters, at the uncalibrated 4 chars/token
+
+    assert max(unbudgeted) > 3 * limit
+    assert max(budgeted) <= limit
+    # Early turns are untouched; the budget only bites once the context would outgrow it.
+    assert budgeted[:10] == unbudgeted[:10]
+
+
+def test_model_ceiling_applies_below_the_level_ceiling():
+    budget = ContextBudget(max_tokens=12_000, model_max_tokens={"small-model": 4_000})
+    assert budget.tokens_for("small-model") == 4_000
+    assert budget.tokens_for("other-model") == 12_000
@@ -0,0 +1,130 @@
+import random
+import threading
+from types import SimpleNamespace
+
+from core.gameboard import GameBoard
+from core.sinks.game_sink import NoopGameSink
+
+PLAYERS = ["Ann", "Bob", "Cat", "Dan"]
+
+
+# Brute-force versions of the indexed read paths: the scans GameLog used to do.
+def _conversation(log, conversation_id):
+    return next((e for e in log.current_round.messageEntries if e.id == conversation_id), None)
+
+
+def _phase_rounds(log, phase):
+    return [r for r in log.completed_round_entries if r.phase_number == phase]
+
+
+def _last_public(log):
+    entries = [e for e in log.current_round.messageEntries if e.visibility_restriction is None]
+    return entries[-1] if entries else None
+
+
+def _last_player(log, reserved):
+    for entry in reversed(log.current_round.messageEntries):
+        if len(entry.messages) == 1 and entry.messages[0]["speaker"] not in reserved:
+            return entry
+    return None
+
+
+def _visible(log, name, after_id):
+    return [e for e in log.current_round.messageEntries
+            if e.id > after_id and (e.visibility_restriction is None or name in e.visibility_restriction)]
+
+
+def _since(log, message_id):
+    return [e for e in log.current_round.messageEntries if e.id > message_id and not log._is_sys_admin_message(e)]
+
+
+def _anchor(board, name):
+    # Newest first: what follows the cut-over if the round has been summarised, else the phase so far.
+    log = board.game_log
+    if log._current_round_summarisation:
+        rounds = [[e for e in log.current_round.messageEntries if e.id > log._current_round_summarisation_until]]
+    else:
+        rounds = [log.current_round.messageEntries] + [r.messageEntries for r in _phase_rounds(log, board.phase_number)][::-1]
+    others_since = False
+    for entries in rounds:
+        for entry in reversed(entries):
+            for message in reversed(entry.messages):
+                if message["speaker"] == name:
+                    return (message, others_since) if entry.visibility_restriction is None else (None, False)
+                others_since |= message["speaker"] not in board.RESERVED_NAMES
+    return None, False
+
+
+def _assert_indexes_match(board, rng):
+    log = board.game_log
+    assert log._current_round_most_recent_message_entry() is _last_public(log)
+    assert log._current_round_most_recent_player_entry(board.RESERVED_NAMES) is _last_player(log, board.RESERVED_NAMES)
+    for phase in range(board.phase_number + 1):
+        assert log.completed_phase_rounds(phase) == _phase_rounds(log, phase)
+    for conversation_id in range(log.message_id + 2):
+        assert log._get_conversation_entry(conversation_id) is _conversation(log, conversation_id)
+    after = rng.randint(0, log.message_id + 1)
+    assert log.messages_since(after) == _since(log, after)
+    for name in [*PLAYERS, "Host", board.SYS_ADMIN]:
+        assert log.visible_entries(name, after) == _visible(log, name, after)
+    for name in PLAYERS:
+        message, others_since = board.context_builder._recency_anchor(SimpleNamespace(name=name))
+        expected, expected_since = _anchor(board, name)
+        assert message is expected and others_since == expected_since
+
+
+def test_indexes_match_a_brute_force_scan():
+    rng = random.Random(11)
+    board = GameBoard(NoopGameSink())
+    board.phase_runner = SimpleNamespace(simulation_engine=SimpleNamespace(agents=[]))
+    for _ in range(3):
+        board.new_phase()
+        for _ in range(rng.randint(1, 3)):
+            board.newRound()
+            conversations = []
+            for step in range(25):
+                speaker = rng.choice(PLAYERS)
+                roll = rng.random()
+                if roll < 0.15:
+                    opener = rng.choice(["Host", speaker])
+                    conversations.append(board.log_new_restricted_conversation(["Host", speaker], opener, f"psst {step}"))
+                elif roll < 0.3 and conversations:
+                    board.log_message_to_conversation(rng.choice(conversations), speaker, f"reply {step}")
+                elif roll < 0.35:
+                    note = board.log_new_restricted_conversation([board.SYS_ADMIN, speaker], board.SYS_ADMIN, "note")
+                    board.close_private_conversation(note, silent=True)
+                elif roll < 0.5:
+                    board.host_broadcast(f"host {step}")
+                else:
+                    board.broadcast_public_action(speaker, f"{speaker} says {step}")
+                if step == 15:
+                    board.game_log.push_current_round_summarisation("summary", board.game_log.message_id - 4)
+                _assert_indexes_match(board, rng)
+            board.game_log.close_round()
+        _assert_indexes_match(board, rng)
+
+
+def test_a_message_appended_while_a_cut_is_built_lands_in_its_anchors():
+    board = GameBoard(NoopGameSink())
+    board.phase_runner = SimpleNamespace(simulation_engine=SimpleNamespace(agents=[]))
+    board.new_phase()
+    board.newRound()
+    for i in range(4):
+        board.broadcast_public_action("Ann", f"Ann says {i}")
+    log = board.game_log
+    add_anchor, other = log._add_anchor, []
+
+    def add_anchor_while_bob_talks(anchors, entry, index, message):
+        # While the cut's anchors are being built, another conversation's thread appends.
+        if not other:
+            other.append(threading.Thread(target=board.broadcast_public_action, args=("Bob", "Bob says hi")))
+            other[0].start()
+            other[0].join(0.2)
+        add_anchor(anchors, entry, index, message)
+
+    log._add_anchor = add_anchor_while_bob_talks
+    log.push_current_round_summarisation("summary", 2)
+    other[0].join()
+
+    message, _ = log.recency_anchor("Bob")
+    assert message is not None and message["message"] == "Bob says hi"
@@ -0,0 +1,35 @@
+import json
+
+from core.log_writer import LogWriter
+
+
+def test_entries_are_batched_per_file_and_flushed(tmp_path):
+    writer = LogWriter(batch_size=50)
+    a, b = tmp_path / "a.jsonl", tmp_path / "b.jsonl"
+
+    for i in range(120):
+        writer.write(str(a if i % 2 else b), {"i": i, "text": "é"})
+    writer.flush()
+
+    lines_a = [json.loads(line) for line in a.read_text(encoding="utf-8").splitlines()]
+    lines_b = [json.loads(line) for line in b.read_text(encoding="utf-8").splitlines()]
+    assert [e["i"] for e in lines_a] == list(range(1, 120, 2))
+    assert [e["i"] for e in lines_b] == list(range(0, 120, 2))
+    assert writer.stats()["written"] == 120
+    assert writer.stats()["batches"] < 120
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    writer = LogWriter(max_queue=1)
+    writer._ensure_thread = lambda: None  # no consumer, so the queue stays full
+
+    assert writer.write(str(tmp_path / "x.jsonl"), {"i": 0})
+    assert not writer.write(str(tmp_path / "x.jsonl"), {"i": 1})
+    assert writer.stats()["dropped"] == 1
+
+
+def test_none_path_and_closed_writer_are_ignored(tmp_path):
+    writer = LogWriter()
+    assert not writer.write(None, {"i": 0})
+    writer.close()
+    assert not writer.write(str(tmp_path / "x.jsonl"), {"i": 0})
@@ -0,0 +1,87 @@
+from pydantic import BaseModel
+
+from core.api_client import APIClient
+from core.prompt_cache import PromptCacheManager, PromptPrefix
+from core.synthetic_backend import CallProfile, LogNormal, SyntheticBackend
+
+
+class Reply(BaseModel):
+    public_response: str
+
+
+def _client(min_tokens=10):
+    backend = SyntheticBackend(default_profile=CallProfile(LogNormal(1, 1), LogNormal(20, 20)), seed=1)
+    api = APIClient()
+    api._client = backend
+    api._default_model = "test-model"
+    api.prompt_cache = PromptCacheManager(min_tokens=min_tokens)
+    return api, backend
+
+
+def _prompt(lessons="- Trust nobody.", summaries="Phase 1: Bob left."):
+    prefix = PromptPrefix(
+        key="g1/Alice",
+        system=f"You are Alice.\n\n=== LIFE LESSONS ===\n{lessons}\n\n" + "profile " * 40,
+        context=f"=== PHASE SUMMARIES ===\n\n{summaries}",
+    )
+    messages = [
+        {"role": "system", "content": prefix.system + "Respond in character."},
+        {"role": "user", "content": prefix.context + "\n\nIt's your turn."},
+    ]
+    return prefix, messages
+
+
+def test_prefix_is_cached_once_and_reused():
+    api, backend = _client()
+    prefix, messages = _prompt()
+
+    api.create(Reply, messages, prefix=prefix)
+    api.create(Reply, messages, prefix=prefix)
+
+    stats = api.summary()
+    assert stats["prompt_cache"]["created"] == 1 and stats["prompt_cache"]["reused"] == 1
+    assert len(backend.cached_contents) == 1
+    assert stats["by_model"]["test-model"]["cached_tokens"] > 0
+    assert [r.cached_tokens for r in api._records] == [backend.cached_contents[next(iter(backend.cached_contents))]] * 2
+
+
+def test_changed_prefix_replaces_the_old_handle():
+    api, backend = _client()
+    prefix, messages = _prompt()
+    api.create(Reply, messages, prefix=prefix)
+    first = set(backend.cached_contents)
+
+    prefix, messages = _prompt(summaries="Phase 1: Bob left.\nPhase 2: Carol left.")
+    api.create(Reply, messages, prefix=prefix)
+
+    assert api.prompt_cache.created == 2
+    assert len(backend.cached_contents) == 1 and not first & set(backend.cached_contents)
+
+    api.release_prompt_caches("g1/")
+    assert backend.cached_contents == {}
+
+
+def test_short_or_mismatched_prefixes_go_out_uncached():
+    api, backend = _client(min_tokens=10_000)
+    prefix, messages = _prompt()
+    api.create(Reply, messages, prefix=prefix)
+    assert api.prompt_cache.skipped == 1 and backend.cached_contents == {}
+
+    api.prompt_cache.min_tokens = 10
+    other, _ = _prompt(lessons="- Something else entirely.")
+    api.create(Reply, messages, prefix=other)  # the prompt doesn't start with this prefix
+    assert api.prompt_cache.created == 0
+    assert all(r.cached_tokens is None for r in api._records)
+
+
+def test_expired_handle_falls_back_to_the_full_prompt():
+    api, backend = _client()
+    prefix, messages = _prompt()
+    api.create(Reply, messages, prefix=prefix)
+    backend.cached_contents.clear()  # evicted provider-side
+
+    api.create(Reply, messages, prefix=prefix)
+
+    assert api._records[-1].cached_tokens is None
+    api.create(Reply, messages, prefix=prefix)
+    assert api.prompt_cache.created == 2 and api._records[-1].cached_tokens
@@ -0,0 +1,63 @@
+from types import SimpleNamespace
+
+from agents.player import Debater
+from core.game_context.system_prompt import CLASSIC, STABLE_FIRST, SystemPrompt
+from core.game_context.user_content import UserContent
+from core.gameboard import GameBoard
+from core.sinks.game_sink import NoopGameSink
+
+
+def _game(layout):
+    board = GameBoard(NoopGameSink(), prompt_layout=layout)
+    board.phase_runner = SimpleNamespace(
+        removed_agent_names=lambda: [],
+        get_phase_progress_string=lambda: "Round 2 of 3",
+        simulation_engine=SimpleNamespace(agents=[]),
+    )
+    players = [Debater(name, "persona", "layout-test-model") for name in ("Ann", "Bob")]
+    board.initialize_agents(players)
+    board.new_phase()
+    board.newRound()
+    board.broadcast_public_action("Bob", "An earlier round.")
+    board.endRound(SimpleNamespace(round_summary="A round happened."))
+    board.newRound()
+    board.broadcast_public_action("Bob", "This round.")
+    ann = players[0]
+    ann.game_strategy, ann.position_assessment = "Lie low.", "Safe for now."
+    ann.phase_summaries_detailed[0] = "What happened before."
+    return board, ann
+
+
+def test_stable_first_orders_prompt_from_most_to_least_stable():
+    board, ann = _game(STABLE_FIRST)
+    system = ann._system_prompt(board)
+    user = UserContent.render(ann, board, "Speak.", None)
+
+    assert system == SystemPrompt.stable_prefix(ann)
+    sections = ["=== PHASE SUMMARIES ===", "=== PAST ROUNDS ===", "=== CURRENT ROUND ===", "Current Strategy: Lie low.",
+                board.context_builder.get_dashboard_string(ann), "=== YOUR TURN ===", "(Speak.)"]
+    positions = [user.index(s) for s in sections]
+    assert positions == sorted(positions)
+
+
+def test_classic_layout_is_unchanged():
+    board, ann = _game(CLASSIC)
+    system = ann._system_prompt(board)
+    user = UserContent.render(ann, board, "Speak.", None)
+
+    assert system == SystemPrompt.player_system_prompt(ann)
+    assert "Current Strategy: Lie low." in system and "Current Strategy" not in user
+    assert user.startswith(board.context_builder.get_dashboard_string(ann))
+    assert "=== PAST 1 ROUNDS  ===" in user
+
+
+def test_only_stable_first_prompts_offer_a_cacheable_prefix():
+    board, ann = _game(CLASSIC)
+    assert ann._prompt_prefix(board) is None
+
+    board, ann = _game(STABLE_FIRST)
+    prefix = ann._prompt_prefix(board)
+    system, user = ann._system_prompt(board), UserContent.render(ann, board, "Speak.", None)
+    # Nothing is reordered: the cached head plus the remainder is the prompt as rendered.
+    assert user.startswith(prefix.context) and system == prefix.system
+    assert prefix.remainder(system, user) == user[len(prefix.context):].strip()
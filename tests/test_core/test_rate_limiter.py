@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+from core.api_client import RateLimiter
+
+
+def test_requests_beyond_rpm_wait_for_refill():
+    limiter = RateLimiter()
+    limiter.configure("m", rpm=600, tpm=10_000_000)  # 10 per second
+
+    async def run():
+        limiter._bucket("m").requests = 1
+        await limiter.acquire("m", 10)
+        start = time.monotonic()
+        await limiter.acquire("m", 10)
+        return time.monotonic() - start
+
+    waited = asyncio.run(run())
+
+    assert waited >= 0.08
+    stats = limiter.stats()["m"]
+    assert stats["waited_calls"] == 1
+    assert stats["queue_depth"] == 0
+
+
+def test_waiters_are_served_in_arrival_order():
+    limiter = RateLimiter()
+    limiter.configure("m", rpm=1200, tpm=10_000_000)
+    order = []
+
+    async def call(i):
+        await limiter.acquire("m", 1)
+        order.append(i)
+
+    async def run():
+        limiter._bucket("m").requests = 0
+        await asyncio.gather(*(call(i) for i in range(5)))
+
+    asyncio.run(run())
+
+    assert order == [0, 1, 2, 3, 4]
+    assert limiter.stats()["m"]["max_queue_depth"] == 5
+
+
+def test_token_debt_is_reconciled_after_the_call():
+    limiter = RateLimiter()
+    limiter.configure("m", rpm=1000, tpm=6000)
+
+    async def run():
+        await limiter.acquire("m", 100)
+
+    asyncio.run(run())
+    limiter.reconcile("m", estimated=100, actual=5000)
+
+    assert limiter._bucket("m").tokens == 1000
+
+
+def test_penalise_holds_the_queue():
+    limiter = RateLimiter()
+    limiter.penalise("m", 0.1)
+
+    async def run():
+        start = time.monotonic()
+        await limiter.acquire("m", 1)
+        return time.monotonic() - start
+
+    assert asyncio.run(run()) >= 0.09
@@ -0,0 +1,68 @@
+from types import SimpleNamespace
+
+from agents.player import Debater
+from core.game_context.dashboard import Dashboard
+from core.game_context.render_memo import dashboard_memo, system_prompt_memo
+from core.game_context.system_prompt import SystemPrompt
+from core.gameboard import GameBoard
+from core.sinks.game_sink import NoopGameSink
+
+
+def _game():
+    board = GameBoard(NoopGameSink())
+    progress = ["Round 1 of 3"]
+    board.phase_runner = SimpleNamespace(
+        removed_agent_names=lambda: [],
+        get_phase_progress_string=lambda: progress[0],
+        simulation_engine=SimpleNamespace(agents=[]),
+    )
+    players = [Debater(name, "persona", "memo-test-model") for name in ("Ann", "Bob")]
+    board.initialize_agents(players)
+    board.new_phase()
+    board.newRound()
+    return board, players[0], progress
+
+
+def _hits(memo, render):
+    before = memo.hits
+    text = render()
+    return text, memo.hits - before
+
+
+def test_system_prompt_is_reused_until_the_agent_changes():
+    board, ann, _ = _game()
+    render = lambda: SystemPrompt.render(ann)
+
+    first, _ = _hits(system_prompt_memo, render)
+    assert _hits(system_prompt_memo, render) == (first, 1)
+
+    # Nothing new in the turn fields: still a hit.
+    ann.process_turn_cognitive_fields(SimpleNamespace(position_assessment=ann.position_assessment))
+    assert _hits(system_prompt_memo, render) == (first, 1)
+
+    ann.process_turn_cognitive_fields(SimpleNamespace(position_assessment="Behind.", lifeLesson="Trust no one."))
+    text, hits = _hits(system_prompt_memo, render)
+    assert hits == 0 and text == SystemPrompt._render(ann, "classic")
+    assert "Behind." in text and "Trust no one." in text
+
+    # Set outside the turn fields, but keyed directly.
+    ann.optional_response_buffer = 2
+    text, hits = _hits(system_prompt_memo, render)
+    assert hits == 0 and "Optional Response Buffer: 2" in text
+
+
+def test_dashboard_is_reused_until_scores_or_the_phase_cursor_move():
+    board, ann, progress = _game()
+    render = lambda: Dashboard.render(ann, board)
+
+    first, _ = _hits(dashboard_memo, render)
+    assert _hits(dashboard_memo, render) == (first, 1)
+
+    board.append_agent_points("Bob", 3)
+    text, hits = _hits(dashboard_memo, render)
+    assert hits == 0 and "3 points behind" in text
+
+    progress[0] = "Round 2 of 3"
+    board.newRound()
+    text, hits = _hits(dashboard_memo, render)
+    assert hits == 0 and text == Dashboard._render(ann, board)
@@ -0,0 +1,90 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel
+
+from core.api_client import APIClient
+from core.response_cache import CacheMiss, ResponseCache
+
+
+class Reply(BaseModel):
+    public_response: str
+
+
+class CountingModels:
+    def __init__(self):
+        self.calls = 0
+
+    async def generate_content(self, model, contents, config):
+        self.calls += 1
+        return SimpleNamespace(text=json.dumps({"public_response": f"{contents} #{self.calls}"}), usage_metadata=None)
+
+
+def _api(cache, with_client=True):
+    models = CountingModels()
+    api = APIClient()
+    api._client = SimpleNamespace(aio=SimpleNamespace(models=models)) if with_client else None
+    api._default_model = "test-model"
+    api.set_cache(cache)
+    return api, models
+
+
+def _messages(text):
+    return [{"role": "system", "content": "sys"}, {"role": "user", "content": text}]
+
+
+def test_key_depends_on_schema_and_prompts():
+    class Other(BaseModel):
+        choice: str
+
+    base = ResponseCache.key("m", "sys", "user", Reply)
+    assert base == ResponseCache.key("m", "sys", "user", Reply)
+    assert base != ResponseCache.key("m", "sys", "user", Other)
+    assert base != ResponseCache.key("m", "sys", "other user", Reply)
+    assert base != ResponseCache.key("other-model", "sys", "user", Reply)
+
+
+def test_record_then_replay_is_identical_without_a_client(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    recorder, models = _api(ResponseCache(path, mode="record"))
+    first = recorder.create(Reply, _messages("hi"))
+    assert models.calls == 1
+
+    replayer, _ = _api(ResponseCache(path, mode="replay"), with_client=False)
+    again = replayer.create(Reply, _messages("hi"))
+
+    assert again.public_response == first.public_response
+
+
+def test_replay_miss_raises(tmp_path):
+    api, _ = _api(ResponseCache(str(tmp_path / "cache.sqlite"), mode="replay"), with_client=False)
+
+    with pytest.raises(CacheMiss):
+        api.create(Reply, _messages("never recorded"))
+
+
+def test_read_through_only_calls_api_on_miss(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), mode="read-through")
+    api, models = _api(cache)
+
+    a = api.create(Reply, _messages("hi"))
+    b = asyncio.run(api.acreate(Reply, _messages("hi")))
+
+    assert models.calls == 1
+    assert a.public_response == b.public_response
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction_keeps_store_under_max_bytes(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), mode="record", max_bytes=25)
+    cache.put("a", "x" * 10)
+    cache.put("b", "x" * 10)
+    cache.get("a")  # a is now the most recently used
+    cache.put("c", "x" * 10)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.stats()["evictions"] == 1
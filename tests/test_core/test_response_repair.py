@@ -0,0 +1,75 @@
+import json
+from types import SimpleNamespace
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from core.api_client import APIClient
+from core.response_repair import match_literal
+
+
+class Vote(BaseModel):
+    private_thoughts: str
+    vote: Literal["Lady Macbeth", "Bob"]
+    backups: list[Literal["Lady Macbeth", "Bob"]] = Field(default_factory=list)
+    public_response: str
+    lifeLesson: Optional[str] = None
+
+
+class ScriptedModels:
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    async def generate_content(self, model, contents, config):
+        self.requests.append((contents, config.response_schema))
+        usage = SimpleNamespace(prompt_token_count=10, candidates_token_count=5, total_token_count=15)
+        return SimpleNamespace(text=json.dumps(self.replies.pop(0)), usage_metadata=usage)
+
+
+def _client(*replies):
+    models = ScriptedModels(*replies)
+    api = APIClient()
+    api._client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    api._default_model = "test-model"
+    return api, models
+
+
+def _messages():
+    return [{"role": "system", "content": "sys"}, {"role": "user", "content": "vote"}]
+
+
+def test_match_literal_only_accepts_unambiguous_near_misses():
+    options = ("Lady Macbeth", "Bob", "bob ")
+    assert match_literal("  lady   macbeth.", options) == "Lady Macbeth"
+    assert match_literal("@Lady Macbeth", options) == "Lady Macbeth"
+    assert match_literal("BOB", options) is None  # two options collapse to "bob"
+    assert match_literal("Macbeth", options) is None
+
+
+def test_near_miss_literals_are_normalised_without_another_call():
+    api, models = _client({
+        "private_thoughts": "t", "vote": " lady macbeth ", "backups": ["BOB"], "public_response": "p",
+    })
+
+    result = api.create(Vote, _messages())
+
+    assert result.vote == "Lady Macbeth" and result.backups == ["Bob"]
+    assert len(models.requests) == 1
+    assert api.summary()["repairs"] == {"normalised": 1}
+
+
+def test_only_the_invalid_fields_are_requested_again():
+    api, models = _client(
+        {"private_thoughts": "keep me", "vote": "Banquo", "public_response": "p"},
+        {"vote": "Bob"},
+    )
+
+    result = api.create(Vote, _messages())
+
+    assert result.vote == "Bob" and result.private_thoughts == "keep me"
+    followup_contents, followup_schema = models.requests[1]
+    assert list(followup_schema.model_fields) == ["vote"]
+    assert "Banquo" in followup_contents
+    record = api._records[-1]
+    assert record.repair == "refetched" and record.total_tokens == 30
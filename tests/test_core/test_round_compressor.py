@@ -0,0 +1,120 @@
+import threading
+from types import SimpleNamespace
+
+from core.game_context.round_compressor import RoundCompressor
+from core.gameboard import GameBoard
+from core.sinks.game_sink import NoopGameSink
+
+BOB = SimpleNamespace(name="Bob")
+
+
+def _board(compressor):
+    board = GameBoard(NoopGameSink())
+    board.phase_runner = SimpleNamespace(simulation_engine=SimpleNamespace(agents=[]))
+    board.game_log.compressor = compressor
+    board.new_phase()
+    board.newRound()
+    return board
+
+
+def _summariser():
+    release, calls = threading.Event(), []
+
+    def summarise(context, game_text):
+        calls.append((context, game_text))
+        release.wait(5)
+        return f"summary {len(calls)}"
+    return summarise, release, calls
+
+
+def _say(board, first, last):
+    for i in range(first, last):
+        board.broadcast_public_action("Ann", f"message {i} " + "x" * 40)  # 55 characters as counted
+
+
+def test_long_round_is_summarised_without_waiting():
+    summarise, release, calls = _summariser()
+    compressor = RoundCompressor(summarise, threshold_tokens=100, keep_recent_tokens=25)  # 400 / 100 characters
+    board = _board(compressor)
+    _say(board, 0, 8)
+
+    # Submitted at the threshold: all but the newest 100 characters (entries 7 and 8).
+    assert compressor._pending[1] == 6
+    # Still summarising: agents read the whole round.
+    _say(board, 8, 9)
+    assert "message 0 " in board.context_builder.current_round_formatted(BOB)
+
+    release.set()
+    compressor._pending[0].result()
+    assert len(calls) == 1 and "Ann: message 5" in calls[0][1] and "message 6" not in calls[0][1]
+    _say(board, 9, 10)
+    text = board.context_builder.current_round_formatted(BOB)
+    assert text.startswith("Summary of earlier messages, part 1: summary 1")
+    assert "message 5 " not in text and "message 6 " in text and "message 9 " in text
+    assert compressor.stats() == {"compressions": 1, "entries_summarised": 6, "failures": 0}
+
+    # The next summary builds on the first.
+    _say(board, 10, 16)
+    compressor._pending[0].result()
+    _say(board, 16, 17)
+    assert calls[1][0] == "summary 1"
+    assert "part 2: summary 2" in board.context_builder.current_round_formatted(BOB)
+
+
+def test_cut_stops_short_of_an_open_private_conversation():
+    summarise, release, calls = _summariser()
+    release.set()
+    compressor = RoundCompressor(summarise, threshold_tokens=100, keep_recent_tokens=25)
+    board = _board(compressor)
+    _say(board, 0, 2)
+    conversation = board.log_new_restricted_conversation(["Host", "Bob"], "Host", "A secret")
+    _say(board, 2, 8)
+
+    compressor._pending[0].result()
+    assert len(calls) == 1 and "A secret" not in calls[0][1]
+    board.log_message_to_conversation(conversation, "Bob", "Still talking")
+    assert board.game_log.current_round_cut().until == conversation - 1
+
+
+def test_rounds_that_compress_themselves_and_stale_summaries_are_left_alone():
+    summarise, release, calls = _summariser()
+    compressor = RoundCompressor(summarise, threshold_tokens=100, keep_recent_tokens=25)
+    board = _board(compressor)
+    board.game_log.push_current_round_summarisation("The round's own summary.", 0)
+    _say(board, 0, 10)
+    assert calls == []
+
+    # A summary still running when the round ends is dropped.
+    board.newRound()
+    _say(board, 0, 8)
+    stale = compressor._pending[0]
+    board.newRound()
+    release.set()
+    stale.result()
+    _say(board, 0, 1)
+    assert board.game_log.current_round_cut() is None
+
+
+def test_parallel_conversations_apply_each_summary_once():
+    compressor = RoundCompressor(lambda context, game_text: "summary", threshold_tokens=100, keep_recent_tokens=25)
+    board = _board(compressor)
+    errors = []
+
+    def talk(name):
+        try:
+            for i in range(60):
+                board.broadcast_public_action(name, f"{name} {i} " + "x" * 40)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=talk, args=(name,)) for name in ("Ann", "Bob", "Cat", "Dan")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    stats = compressor.stats()
+    assert stats["compressions"] > 0 and stats["failures"] == 0
+    cut = board.game_log.current_round_cut()
+    assert cut.summary.count("part ") == stats["compressions"]
@@ -0,0 +1,79 @@
+import random
+from types import SimpleNamespace
+
+from core.gameboard import GameBoard
+from core.game_context.user_content import UserContent
+from core.sinks.game_sink import NoopGameSink
+
+PLAYERS = ["Ann", "Bob", "Cat", "Dan"]
+
+
+def _board():
+    board = GameBoard(NoopGameSink())
+    board.phase_runner = SimpleNamespace(simulation_engine=SimpleNamespace(agents=[]))
+    return board
+
+
+def _context(board, name):
+    agent = SimpleNamespace(name=name, phase_summaries_string=lambda: "")
+    dash = []
+    UserContent.append_game_context(dash, agent, board)
+    return "\n\n".join(dash) + board.context_builder.phase_rounds_string(agent)
+
+
+def _assert_matches_uncached(board):
+    cb = board.context_builder
+    for name in [*PLAYERS, "Host"]:
+        cached = _context(board, name)
+        cache, cb.render_cache = cb.render_cache, None
+        try:
+            assert cached == _context(board, name)
+        finally:
+            cb.render_cache = cache
+
+
+def test_cached_rendering_matches_a_full_render_at_every_step():
+    rng = random.Random(3)
+    board = _board()
+    for phase in range(2):
+        board.new_phase()
+        for _ in range(3):
+            board.newRound()
+            _assert_matches_uncached(board)
+            board.host_broadcast("Round begins.")
+            convo = None
+            for step in range(12):
+                speaker = rng.choice(PLAYERS)
+                roll = rng.random()
+                if roll < 0.15:
+                    convo = board.log_new_restricted_conversation(["Host", speaker], "Host", f"psst {step}")
+                elif roll < 0.3 and convo is not None:
+                    board.log_message_to_conversation(convo, speaker, f"reply {step}")
+                elif roll < 0.35 and convo is not None:
+                    board.close_private_conversation(convo, silent=True)
+                elif roll < 0.4:
+                    # A private system note, as private_system_message sends it.
+                    note = board.log_new_restricted_conversation([board.SYS_ADMIN, speaker], board.SYS_ADMIN, "note")
+                    board.close_private_conversation(note, silent=True)
+                else:
+                    board.broadcast_public_action(speaker, f"{speaker} says {step}")
+                _assert_matches_uncached(board)
+            if phase == 1:
+                # Compression cuts the current round over to a summary plus what came after it.
+                board.game_log.push_current_round_summarisation("Summary so far.", board.game_log.message_id - 3)
+                board.broadcast_public_action("Ann", "after the summary")
+                _assert_matches_uncached(board)
+            board.game_log.close_round()
+
+
+def test_each_entry_is_rendered_once_per_viewer():
+    board = _board()
+    board.new_phase()
+    board.newRound()
+    cache = board.context_builder.render_cache
+    for i in range(20):
+        board.broadcast_public_action(PLAYERS[i % 4], f"message {i}")
+        for name in PLAYERS:
+            _context(board, name)
+
+    assert cache.entries_rendered == 20 * len(PLAYERS)
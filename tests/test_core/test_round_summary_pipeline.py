@@ -0,0 +1,76 @@
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import agents.game_host as game_host
+from agents.game_host import GameMaster
+from core.gameboard import GameBoard
+from core.sinks.game_sink import CapturingGameSink
+
+
+class _SlowSummaries:
+    """Stands in for api_client: each summary waits for release, and sees what was asked."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.prompts = []
+
+    def create(self, response_model, messages, **_):
+        self.prompts.append(messages[-1]["content"])
+        self.release.wait(5)
+        return SimpleNamespace(round_summary=f"summary {len(self.prompts)}")
+
+
+def _board():
+    board = GameBoard(CapturingGameSink())
+    board.phase_runner = SimpleNamespace(simulation_engine=SimpleNamespace(agents=[]))
+    board.new_phase()
+    return board
+
+
+def test_next_round_starts_while_the_summary_is_written(monkeypatch):
+    client = _SlowSummaries()
+    monkeypatch.setattr(game_host, "api_client", client)
+    host, board = GameMaster("test-model"), _board()
+
+    rounds = []
+    for i in range(2):
+        board.newRound()
+        rounds.append(board.game_log.current_round)
+        board.broadcast_public_action("Ann", f"round {i + 1} talk")
+        board.endRound(host.summariseRound(board, wait=False))
+    board.newRound()
+    board.broadcast_public_action("Ann", "round 3 talk")
+
+    # Nothing has landed yet, and play went on regardless.
+    assert [r.summary for r in rounds] == [None, None]
+    assert board.game_sink.round_summaries == []
+
+    client.release.set()
+    assert "summary 1" in host._system_prompt(board)  # host reads wait for what's in flight
+    host.await_round_summaries()
+    assert [r.summary for r in rounds] == ["summary 1", "summary 2"]
+    # Each tagged with its own round, though both land during round 3.
+    assert board.game_sink.round_summaries == [{"round_number": 1, "summary": "summary 1"},
+                                               {"round_number": 2, "summary": "summary 2"}]
+    assert list(host.round_summaries) == ["summary 1", "summary 2"]
+    # Each summary was written from its own round's transcript, after the one before it.
+    assert "round 1 talk" in client.prompts[0] and "round 2 talk" in client.prompts[1]
+    assert "PAST SUMARRIES: summary 1" in client.prompts[1]
+    host.close()
+
+
+def test_waiting_on_summaries_from_the_summary_worker_raises_instead_of_hanging(monkeypatch):
+    client = _SlowSummaries()
+    client.release.set()
+    monkeypatch.setattr(game_host, "api_client", client)
+    host, board = GameMaster("test-model"), _board()
+    board.newRound()
+
+    future = host.summariseRound(board, wait=False)
+    inside = host._summary_executor.submit(host.await_round_summaries)
+    with pytest.raises(RuntimeError, match="wait on itself"):
+        inside.result(5)
+    future.result(5)
+    host.close()
@@ -0,0 +1,76 @@
+from typing import Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from models.schema_registry import SchemaRegistry
+
+
+def _fields(description="Say something", names=("Ann", "Bob")):
+    return {
+        "private_thoughts": (str, Field(description="Think")),
+        "vote": (Literal[names], Field(description="Pick one")),
+        "public_response": (str, Field(description=description)),
+        "lifeLesson": (Optional[str], Field(default=None, description="Lesson")),
+    }
+
+
+def test_same_spec_returns_the_same_class():
+    registry = SchemaRegistry()
+
+    first = registry.model("Vote", **_fields())
+    second = registry.model("Vote", **_fields())
+
+    assert first is second
+    assert registry.stats()["hits"] == 1 and registry.stats()["misses"] == 1
+
+
+def test_any_schema_relevant_change_builds_a_new_class():
+    registry = SchemaRegistry()
+    base = registry.model("Vote", **_fields())
+
+    variants = [
+        registry.model("Vote2", **_fields()),
+        registry.model("Vote", **_fields(description="Say something else")),
+        registry.model("Vote", **_fields(names=("Ann", "Cat"))),
+        registry.model("Vote", **dict(reversed(list(_fields().items())))),
+    ]
+
+    assert all(v is not base for v in variants)
+    assert len({id(v) for v in variants}) == len(variants)
+
+
+def test_json_schema_is_cached_but_returned_as_a_private_copy():
+    registry = SchemaRegistry()
+    model = registry.model("Vote", **_fields())
+
+    schema = model.model_json_schema()
+    schema["properties"].clear()  # the SDK rewrites the dict in place
+
+    assert model.model_json_schema() == model.model_json_schema()
+    assert "vote" in model.model_json_schema()["properties"]
+
+
+def test_foreign_base_and_field_order_survive():
+    class Base(BaseModel):
+        private_thoughts: str
+
+    registry = SchemaRegistry()
+    model = registry.model("Choice", __base__=Base, target=(str, Field(description="Who")))
+
+    assert issubclass(model, Base)
+    assert list(model.model_fields) == ["private_thoughts", "target"]
+    assert registry.model("Choice", __base__=Base, target=(str, Field(description="Who"))) is model
+
+
+def test_schema_lookups_from_many_threads_are_all_counted():
+    from concurrent.futures import ThreadPoolExecutor
+
+    from models.schema_registry import schema_registry
+
+    model = SchemaRegistry().model("Vote", **_fields())
+    before = schema_registry.schema_hits + schema_registry.schema_misses
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: model.model_json_schema(), range(400)))
+
+    assert schema_registry.schema_hits + schema_registry.schema_misses - before == 400
@@ -0,0 +1,149 @@
+import json
+from types import SimpleNamespace
+
+from pydantic import BaseModel
+
+from core.api_client import APIClient
+from core.stream_parser import FieldStreamParser
+
+
+class Turn(BaseModel):
+    private_thoughts: str
+    public_response: str
+
+
+def _feed_in_chunks(text, size):
+    parser = FieldStreamParser()
+    out = [parser.feed(text[i:i + size]) for i in range(0, len(text), size)]
+    return parser, "".join(out)
+
+
+def test_parser_yields_only_public_response_for_any_chunking():
+    message = 'She said "hi"\n\\ then left ☕ 😀'
+    text = json.dumps({"private_thoughts": "public_response is a trap", "public_response": message, "x": {"public_response": "nested"}})
+
+    for size in (1, 2, 3, 7, len(text)):
+        parser, streamed = _feed_in_chunks(text, size)
+        assert streamed == message
+        assert parser.done
+
+
+def test_parser_ignores_other_fields_and_nested_keys():
+    text = json.dumps({"inner": {"public_response": "no"}, "other": ["public_response", "no"]})
+
+    parser, streamed = _feed_in_chunks(text, 4)
+
+    assert streamed == ""
+    assert not parser.done
+
+
+class StreamingModels:
+    def __init__(self, text, chunk_size=5):
+        self.text = text
+        self.chunk_size = chunk_size
+
+    async def generate_content_stream(self, model, contents, config):
+        async def stream():
+            pieces = [self.text[i:i + self.chunk_size] for i in range(0, len(self.text), self.chunk_size)]
+            for i, piece in enumerate(pieces):
+                usage = None
+                if i == len(pieces) - 1:
+                    usage = SimpleNamespace(prompt_token_count=10, candidates_token_count=5, total_token_count=15)
+                yield SimpleNamespace(text=piece, usage_metadata=usage)
+        return stream()
+
+
+def test_create_streams_public_deltas_and_still_validates():
+    text = json.dumps({"private_thoughts": "plan", "public_response": "Hello everyone, I come in peace."})
+    api = APIClient()
+    api._client = SimpleNamespace(aio=SimpleNamespace(models=StreamingModels(text)))
+    api._default_model = "test-model"
+    deltas = []
+
+    result = api.create(Turn, [{"role": "system", "content": "s"}, {"role": "user", "content": "u"}],
+                        on_public_delta=deltas.append)
+
+    assert result.public_response == "Hello everyone, I come in peace."
+    assert len(deltas) > 1
+    assert "".join(deltas) == result.public_response
+    assert api.summary()["total_tokens"] == 15
+
+
+class FlakyStreamingModels(StreamingModels):
+    """Rate-limited halfway through the first stream, then streams in full."""
+
+    def __init__(self, text, chunk_size=5):
+        super().__init__(text, chunk_size)
+        self.attempts = 0
+
+    async def generate_content_stream(self, model, contents, config):
+        self.attempts += 1
+        full = await super().generate_content_stream(model, contents, config)
+        if self.attempts > 1:
+            return full
+
+        async def cut_short():
+            count = 0
+            async for chunk in full:
+                yield chunk
+                count += 1
+                if count == 12:
+                    raise RuntimeError("429 RESOURCE_EXHAUSTED")
+        return cut_short()
+
+
+def test_a_retried_stream_discards_its_draft_first():
+    text = json.dumps({"private_thoughts": "plan", "public_response": "Hello everyone, I come in peace."})
+    api = APIClient()
+    api._client = SimpleNamespace(aio=SimpleNamespace(models=FlakyStreamingModels(text)))
+    api._default_model = "test-model"
+    deltas = []
+
+    result = api.create(Turn, [{"role": "system", "content": "s"}, {"role": "user", "content": "u"}],
+                        on_public_delta=deltas.append)
+
+    reset = deltas.index(None)
+    assert reset > 0
+    assert "".join(deltas[reset + 1:]) == result.public_response
+
+
+class DraftSink:
+    streams_public_deltas = True
+
+    def __init__(self):
+        self.events = []
+
+    def on_public_action_delta(self, speaker, delta):
+        self.events.append(delta)
+
+    def on_public_action_stream_end(self, speaker):
+        self.events.append("<end>")
+
+
+def test_only_replies_marked_for_broadcast_are_streamed():
+    from agents.base_agent import BaseAgent
+
+    class Agent(BaseAgent):
+        def _system_prompt(self, gameBoard):
+            return "sys"
+
+    text = json.dumps({"private_thoughts": "plan", "public_response": "Just between us."})
+    api = APIClient()
+    models = StreamingModels(text)
+
+    async def generate_content(model, contents, config):
+        return SimpleNamespace(text=text, usage_metadata=None)
+
+    models.generate_content = generate_content
+    api._client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    api._default_model = "test-model"
+    sink = DraftSink()
+    board = SimpleNamespace(game_sink=sink)
+    agent = Agent("Ann", "test-model", client=api)
+
+    agent.get_response("u", Turn, board, system_content="private conversation")
+    assert sink.events == []
+
+    agent.get_response("u", Turn, board, system_content="s", stream_public=True)
+    assert sink.events[-1] == "<end>"
+    assert "".join(sink.events[:-1]) == "Just between us."
@@ -0,0 +1,98 @@
+import asyncio
+import json
+import random
+from types import SimpleNamespace
+
+import pytest
+from pydantic import BaseModel, Field
+from typing import Literal
+
+from core.api_client import APIClient, _is_rate_limit
+from core.synthetic_backend import CallProfile, LogNormal, SyntheticBackend
+
+
+class Vote(BaseModel):
+    public_response: str
+    target_name: Literal["Alice", "Bob"]
+    lessons: list[str] = Field(min_length=3)
+
+
+def _config():
+    return SimpleNamespace(response_schema=Vote, system_instruction="system prompt")
+
+
+def test_lognormal_is_pinned_by_median():
+    rng = random.Random(0)
+    dist = LogNormal(p50=100, p99=400)
+    samples = sorted(dist.sample(rng) for _ in range(4000))
+
+    assert 85 < samples[len(samples) // 2] < 115
+    assert samples[int(len(samples) * 0.99)] > 250
+
+
+def test_response_is_schema_valid_with_realistic_usage():
+    backend = SyntheticBackend(time_scale=0, seed=1)
+
+    response = asyncio.run(backend.aio.models.generate_content(model="m", contents="user prompt", config=_config()))
+
+    vote = Vote.model_validate_json(response.text)
+    assert vote.target_name in ("Alice", "Bob")
+    assert len(vote.lessons) == 3
+    assert response.usage_metadata.prompt_token_count > 0
+    usage = response.usage_metadata
+    # Thoughts count towards the total but not the candidates, as with the real API.
+    assert usage.total_token_count == (
+        usage.prompt_token_count + usage.candidates_token_count + (usage.thoughts_token_count or 0)
+    )
+
+
+def test_fault_injection_raises_rate_limits_and_timeouts():
+    limited = SyntheticBackend(rate_limit_rate=1.0, time_scale=0)
+    with pytest.raises(Exception) as exc:
+        limited.models.generate_content(model="m", contents="x", config=_config())
+    assert _is_rate_limit(exc.value)
+
+    timing_out = SyntheticBackend(timeout_rate=1.0, timeout_s=0, time_scale=0)
+    with pytest.raises(TimeoutError):
+        timing_out.models.generate_content(model="m", contents="x", config=_config())
+
+
+def test_profiles_from_api_logs(tmp_path):
+    path = tmp_path / "api_calls_1.jsonl"
+    rows = [{"model": "m", "response_model": "Vote", "duration_ms": ms, "completion_tokens": 50} for ms in range(1, 101)]
+    path.write_text("\n".join(json.dumps(r) for r in rows))
+
+    backend = SyntheticBackend.from_api_logs([str(path)])
+
+    profile = backend._profile("m", "Vote")
+    assert profile.latency_ms == LogNormal(50, 99)
+    assert profile.completion_tokens == LogNormal(50, 50)
+    assert backend._profile("other", "Other") is backend.default_profile
+
+
+def test_injects_into_api_client():
+    api = APIClient()
+    api._client = SyntheticBackend(default_profile=CallProfile(LogNormal(1, 1), LogNormal(10, 10)), seed=2)
+    api._default_model = "m"
+
+    vote = api.create(Vote, [{"role": "system", "content": "s"}, {"role": "user", "content": "u"}])
+
+    assert vote.target_name in ("Alice", "Bob")
+    assert api.summary()["total_tokens"] > 0
+
+
+def test_implicit_cache_serves_a_repeated_prefix():
+    backend = SyntheticBackend(time_scale=0, seed=1, implicit_cache_min_tokens=1024)
+    shared = "s" * 8192
+
+    def cached(contents, model="m"):
+        response = backend.models.generate_content(model=model, contents=contents, config=_config())
+        return response.usage_metadata.cached_content_token_count
+
+    assert cached(shared + "first turn") is None
+    # The shared leading blocks come back cached; the tail that differs does not.
+    assert cached(shared + "second turn") == 2048
+    assert cached("changed head " + shared) is None
+    assert cached(shared + "another model", model="other") is None
+    # Too short a match to count.
+    assert cached(shared[:4000] + "short") is None
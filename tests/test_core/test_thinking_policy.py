@@ -0,0 +1,70 @@
+import json
+from types import SimpleNamespace
+
+from pydantic import BaseModel
+
+from core.api_client import APIClient
+from core.call_context import call_tags
+from core.thinking_policy import ThinkingPolicy, thinking_scope
+
+
+class Reply(BaseModel):
+    public_response: str
+
+
+class RecordingModels:
+    def __init__(self):
+        self.configs = []
+
+    async def generate_content(self, model, contents, config):
+        self.configs.append(config)
+        usage = SimpleNamespace(prompt_token_count=10, candidates_token_count=5, total_token_count=15)
+        return SimpleNamespace(text=json.dumps({"public_response": "hi"}), usage_metadata=usage)
+
+
+def _client():
+    models = RecordingModels()
+    api = APIClient()
+    api._client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    api._default_model = "test-model"
+    return api, models
+
+
+def _messages():
+    return [{"role": "system", "content": "sys"}, {"role": "user", "content": "go"}]
+
+
+def test_category_comes_from_model_name_then_turn_then_round():
+    policy = ThinkingPolicy("standard")
+    assert policy.category("rps_choice", {"round": "DiscussionRound"}) == "choice"
+    assert policy.category("rps_choice_repair") == "choice"
+    assert policy.category("something_new", {"round": "PhaseSummary"}) == "summary"
+    assert policy.category("something_new", {"round": "Mystery"}) == "default"
+
+
+def test_policy_sets_budget_and_temperature_per_category():
+    api, models = _client()
+
+    with thinking_scope(ThinkingPolicy("standard")), call_tags(round="PhaseSummary"):
+        api.create(Reply, _messages())
+    with thinking_scope(ThinkingPolicy("standard")), call_tags(turn="rps_choice"):
+        api.create(Reply, _messages())
+    api.create(Reply, _messages())  # no policy: the model's defaults, as before
+
+    summary, choice, unscoped = models.configs
+    assert (summary.thinking_config.thinking_budget, summary.temperature) == (1024, 0.7)
+    assert (choice.thinking_config.thinking_budget, choice.temperature) == (0, 1)
+    assert (unscoped.thinking_config.thinking_budget, unscoped.temperature) == (None, 1)
+    assert [r.category for r in api._records] == ["summary", "choice", "default"]
+    assert set(api.summary()["by_category"]) == {"summary", "choice", "default"}
+
+
+def test_no_policy_unless_a_level_or_the_environment_asks(monkeypatch):
+    from core.bootstrap import _thinking_policy
+
+    monkeypatch.delenv("LLM_THINKING_POLICY", raising=False)
+    assert _thinking_policy(None) is None
+    assert _thinking_policy("beginner").name == "lean"
+
+    monkeypatch.setenv("LLM_THINKING_POLICY", "deep")
+    assert _thinking_policy(None).name == "deep"
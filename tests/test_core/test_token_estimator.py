@@ -0,0 +1,83 @@
+import json
+from types import SimpleNamespace
+
+from pydantic import BaseModel
+
+from agents.base_agent import BaseAgent
+from core.api_client import APIClient
+from core.budget import GameBudget, budget_scope
+from core.token_estimator import TokenEstimator
+
+
+class Reply(BaseModel):
+    public_response: str
+
+
+class ThreeCharTokens:
+    """Counts a prompt token for every three characters of system + user text."""
+
+    async def generate_content(self, model, contents, config):
+        prompt = (len(config.system_instruction or "") + len(contents)) // 3
+        usage = SimpleNamespace(prompt_token_count=prompt, candidates_token_count=5, total_token_count=prompt + 5)
+        return SimpleNamespace(text=json.dumps({"public_response": "ok"}), usage_metadata=usage)
+
+
+class Agent(BaseAgent):
+    def _system_prompt(self, gameBoard):
+        return "s" * 3000
+
+
+def _api():
+    api = APIClient()
+    api._client = SimpleNamespace(aio=SimpleNamespace(models=ThreeCharTokens()))
+    api._default_model = "m"
+    return api
+
+
+def test_estimates_converge_on_the_observed_ratio_and_are_recorded():
+    api = _api()
+    messages = [{"role": "system", "content": "s" * 3000}, {"role": "user", "content": "u" * 3000}]
+    assert api.token_estimator.estimate_messages(messages, "m") == 1500  # the 4 chars/token default
+
+    for _ in range(30):
+        api.create(Reply, messages)
+
+    # The 4 chars/token prior still carries a little weight after 180k observed characters.
+    assert 3.0 < api.token_estimator.chars_per_token("m") < 3.2
+    first, last = api._records[0], api._records[-1]
+    assert (first.prompt_chars, first.estimated_prompt_tokens, first.prompt_tokens) == (6000, 1500, 2000)
+    assert 1850 < last.estimated_prompt_tokens <= 2000
+    assert api.summary()["token_estimator"]["observed"] == 30
+
+
+def test_calibrates_from_logs_and_skips_records_without_chars(tmp_path):
+    log = tmp_path / "api_calls_x.jsonl"
+    rows = [{"model": "m", "prompt_chars": 20_000, "prompt_tokens": 10_000}] * 10 + [{"model": "m", "prompt_tokens": 9}]
+    log.write_text("\n".join(json.dumps(r) for r in rows) + "\n")
+
+    estimator = TokenEstimator()
+    assert estimator.calibrate_from_logs([str(log), str(tmp_path / "missing.jsonl")]) == 10
+    assert 2.0 < estimator.chars_per_token("m") < 2.5
+    assert estimator.chars_per_token("other") == TokenEstimator.DEFAULT_CHARS_PER_TOKEN
+
+
+def test_warns_once_per_agent_over_the_line(capsys):
+    estimator = TokenEstimator(warn_tokens=100)
+    assert not estimator.check_context("Ann", 100)
+    assert estimator.check_context("Ann", 101) and estimator.check_context("Ann", 500)
+    assert capsys.readouterr().out.count("Ann") == 1
+    assert estimator.stats()["over_warning"] == ["Ann"]
+
+
+def test_a_call_that_would_blow_the_budget_is_answered_heuristically():
+    api = _api()
+    agent = Agent("Ann", "m", client=api)
+    budget = GameBudget(max_tokens=1700)
+
+    with budget_scope(budget):
+        agent.get_response("u" * 10, Reply, None)   # ~750 tokens estimated, fits
+        response = agent.get_response("u" * 10, Reply, None)  # ~1,000 spent, and another ~770 won't fit
+
+    assert api.summary()["total_calls"] == 1
+    assert response.public_response == "..."
+    assert budget.heuristic_responses == 1
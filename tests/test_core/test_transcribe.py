@@ -0,0 +1,97 @@
+import asyncio
+import io
+import math
+import time
+import wave
+from array import array
+from types import SimpleNamespace
+
+from core.api_client import APIClient
+from core.audio_chunks import split_on_silence
+from core.loop_monitor import LoopLagMonitor
+
+RATE = 8000
+
+
+def _wav(*segments):
+    """segments: (seconds, loud) pairs, a 440 Hz tone when loud and silence otherwise."""
+    samples = array("h")
+    for seconds, loud in segments:
+        samples.extend(int(8000 * math.sin(2 * math.pi * 440 * i / RATE)) if loud else 0
+                       for i in range(int(seconds * RATE)))
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(RATE)
+        w.writeframes(samples.tobytes())
+    return out.getvalue()
+
+
+def _frames(clip):
+    with wave.open(io.BytesIO(clip)) as w:
+        return w.getnframes()
+
+
+def test_split_cuts_in_pauses_and_keeps_every_frame():
+    clip = _wav((20, True), (1, False), (20, True), (1, False), (20, True))
+    chunks = split_on_silence(clip, max_chunk_s=30)
+
+    assert len(chunks) == 3
+    assert sum(_frames(c) for c in chunks) == _frames(clip)
+    # Each cut lands inside a pause, not in the middle of the tone.
+    assert 20 * RATE <= _frames(chunks[0]) <= 21 * RATE
+
+
+def test_split_passes_short_and_non_wav_audio_through():
+    short = _wav((10, True))
+    assert split_on_silence(short, max_chunk_s=30) == [short]
+    assert split_on_silence(b"webm bytes") == [b"webm bytes"]
+
+
+def test_split_hard_cuts_when_there_is_no_pause():
+    clip = _wav((70, True))
+    chunks = split_on_silence(clip, max_chunk_s=30)
+    assert [_frames(c) for c in chunks] == [30 * RATE, 30 * RATE, 10 * RATE]
+
+
+class RecordingModels:
+    def __init__(self):
+        self.prompts = []
+
+    async def generate_content(self, model, contents, config=None):
+        part, prompt = contents
+        self.prompts.append(prompt)
+        # Later chunks answer first, so the stitching has to restore the order.
+        frames = _frames(part.inline_data.data)
+        await asyncio.sleep(0.05 if frames > 20 * RATE else 0.0)
+        return SimpleNamespace(text=f" chunk{frames // RATE} ")
+
+
+def test_atranscribe_stitches_chunks_in_order():
+    models = RecordingModels()
+    api = APIClient()
+    api._client = SimpleNamespace(aio=SimpleNamespace(models=models))
+    api._default_model = "test-model"
+    clip = _wav((25, True), (1, False), (10, True))
+
+    text = asyncio.run(api.atranscribe(clip, "audio/wav", hints=["Alice"]))
+
+    assert text == "chunk25 chunk10"
+    assert len(models.prompts) == 2
+    assert all("Alice" in p for p in models.prompts)
+
+
+def test_loop_lag_monitor_sees_a_blocked_loop():
+    async def run():
+        monitor = LoopLagMonitor(interval_s=0.01)
+        monitor.start()
+        await asyncio.sleep(0.03)
+        time.sleep(0.2)
+        await asyncio.sleep(0.03)
+        monitor.stop()
+        return monitor.stats()
+
+    stats = asyncio.run(run())
+    assert stats["samples"] >= 2
+    assert stats["max"] >= 150